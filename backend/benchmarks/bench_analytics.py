@@ -0,0 +1,96 @@
+"""
+Micro-benchmarks for the analytics layer on synthetic data:
+SalesForecaster.predict_next_weeks, AnalyticsEngine.generate_recommendations,
+DecisionEngine.evaluate_batch, RunwaySimulator.simulate (100k paths x 36 months),
+aggregate_by_period and load_and_preprocess_data (CSV and columnar storage).
+
+Run from backend/:  python benchmarks/bench_analytics.py [--sizes 1000,10000] [--baseline results/x.json]
+Each size is a product count; the order file has 20 orders per product.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from index import AnalyticsEngine  # noqa: E402
+from models.forecaster import SalesForecaster  # noqa: E402
+from models.runway import RunwaySimulator  # noqa: E402
+from services.decision_engine import DecisionEngine  # noqa: E402
+from utils.data_handler import aggregate_by_period, load_and_preprocess_data  # noqa: E402
+import results  # noqa: E402
+import synthetic_data  # noqa: E402
+
+
+def load_with(storage: str, path: str):
+    os.environ["DATA_STORAGE"] = storage
+    try:
+        return load_and_preprocess_data(path)
+    finally:
+        os.environ.pop("DATA_STORAGE", None)
+
+
+def run_size(size: int, repeat: int, work_dir: str):
+    paths = synthetic_data.generate(os.path.join(work_dir, str(size)), products=size, orders=size * 20)
+    orders_path = paths["sales_data_sample.csv"]
+    financials = pd.read_csv(paths["monthly_financials.csv"], parse_dates=["date"])
+    products = pd.read_csv(paths["product_sales.csv"])
+    inventory = pd.read_csv(paths["inventory.csv"])
+    orders = load_with("csv", orders_path)
+    weekly = aggregate_by_period(orders, "W")["sales"]
+    forecaster = SalesForecaster()
+    # Per-SKU rule inputs: monthly run rate, next month at the SKU's growth rate, totals and order value
+    names = products["product_name"].tolist()
+    last = products["revenue"].to_numpy(dtype=float) / 12
+    upcoming = last * (1 + products["growth_rate"].to_numpy(dtype=float))
+    avg_order = products["revenue"].to_numpy(dtype=float) / products["units_sold"].to_numpy(dtype=float)
+    engine = DecisionEngine()
+    simulator = RunwaySimulator(financials)
+    load_with("feather", orders_path)  # build the sidecar outside the timed runs
+
+    cases = {
+        "predict_next_weeks": lambda: forecaster.predict_next_weeks(weekly, weeks=4),
+        "generate_recommendations": lambda: AnalyticsEngine.generate_recommendations(financials, products, inventory),
+        "DecisionEngine.evaluate_batch": lambda: engine.evaluate_batch(names, last, upcoming, products["revenue"], avg_order),
+        "runway_simulation[bootstrap]": lambda: simulator.simulate(100_000, 36, "bootstrap"),
+        "runway_simulation[gbm]": lambda: simulator.simulate(100_000, 36, "gbm"),
+        "aggregate_by_period[ME]": lambda: aggregate_by_period(orders, "ME"),
+        "aggregate_by_period[W]": lambda: aggregate_by_period(orders, "W"),
+        "load_and_preprocess_data[csv]": lambda: load_with("csv", orders_path),
+        "load_and_preprocess_data[feather]": lambda: load_with("feather", orders_path),
+    }
+    out = {}
+    for name, fn in cases.items():
+        out[f"{name}@{size}"] = results.summarize(results.time_call(fn, repeat=repeat))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=None, help="results directory (default benchmarks/results)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    all_results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            for case, stats in run_size(size, args.repeat, work_dir).items():
+                all_results[case] = stats
+                print(f"{case:<48} p50 {stats['p50_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms")
+
+    path = results.save("analytics", all_results, {"sizes": sizes, "repeat": args.repeat}, args.out)
+    print(f"\nSaved {path}")
+    if args.baseline and results.compare(all_results, args.baseline, threshold=args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
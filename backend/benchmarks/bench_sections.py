@@ -0,0 +1,226 @@
+"""
+Compares the columnar dashboard section builders in index.py against the
+row-at-a-time iterrows() implementations they replaced.
+
+Both sides do the same work on every run: the columnar builders get fresh frame
+copies (so the per-version Catalog merge is rebuilt rather than served from dataset_cache)
+and a VelocityStore built from the same synthetic order lines the loop reads.
+
+Run from backend/:  python benchmarks/bench_sections.py [--sizes 1000,10000,100000]
+"""
+import argparse
+import os
+import sys
+import time
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from index import (  # noqa: E402
+    AnalyticsEngine, DataSnapshot, build_deal_sizes, build_forecast, build_inventory, build_products
+)
+from utils.aggregate_store import AggregateStore  # noqa: E402
+from utils.inventory_velocity import (  # noqa: E402
+    VelocityStore, VELOCITY_WINDOW, LEAD_TIME_DAYS, SERVICE_LEVEL_Z, MAX_DAYS_OF_COVER
+)
+
+
+def make_frames(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    names = [f"SKU-{i:06d}" for i in range(n)]
+    products = pd.DataFrame({
+        "product_name": names,
+        "units_sold": rng.integers(10, 5000, n),
+        "revenue": rng.uniform(1_000, 500_000, n).round(2),
+        "growth_rate": rng.uniform(-0.05, 0.5, n).round(3),
+    })
+    inventory = pd.DataFrame({
+        "product_name": names,
+        "stock": rng.integers(0, 300, n),
+        "reorder_threshold": rng.integers(20, 120, n),
+    })
+    dates = pd.date_range("2024-01-01", periods=12, freq="MS")
+    revenue = rng.uniform(100_000, 250_000, 12).round()
+    expenses = (revenue * rng.uniform(0.6, 1.0, 12)).round()
+    financials = pd.DataFrame({
+        "date": dates, "revenue": revenue, "expenses": expenses, "net_cash": revenue - expenses
+    })
+    # Two order lines per SKU over the last year
+    lines = 2 * n
+    orders = pd.DataFrame({
+        "date": pd.Timestamp("2024-12-31") - pd.to_timedelta(rng.integers(0, 365, lines), unit="D"),
+        "product_line": np.repeat(names, 2),
+        "units_sold": rng.integers(1, 60, lines),
+    })
+    return financials, products, inventory, orders
+
+
+class BenchSnapshot(DataSnapshot):
+    """DataSnapshot whose order-derived state comes from the synthetic orders, built on first use."""
+
+    def __init__(self, financials, products, inventory, orders):
+        super().__init__(financials, products, inventory)
+        self.orders = orders
+
+    @cached_property
+    def velocity(self):
+        return VelocityStore.from_frame(self.orders)
+
+    @cached_property
+    def order_series(self):
+        # No order series: the forecasts project growth rates, like the loop reference
+        return AggregateStore()
+
+
+def snapshot(financials, products, inventory, orders):
+    """Snapshot over fresh copies, so nothing is reused from an earlier run."""
+    return BenchSnapshot(financials.copy(), products.copy(), inventory.copy(), orders)
+
+
+# --- Reference row-at-a-time implementations ---
+
+def loop_recommendations(inventory):
+    recs = []
+    for _, row in inventory.iterrows():
+        if row['stock'] < row['reorder_threshold']:
+            recs.append({
+                "type": "inventory",
+                "title": f"Restock {row['product_name']}",
+                "description": f"Stock ({row['stock']}) is below threshold ({row['reorder_threshold']}). Reorder now.",
+                "confidence": 0.95,
+                "action": "Optimize Inventory"
+            })
+    return recs
+
+def loop_forecast(products):
+    results = []
+    for _, row in products.iterrows():
+        base = row['revenue'] / 12
+        results.append({
+            "product": row['product_name'],
+            "predictions": [round(base * (1 + row['growth_rate'])**(i+1), 2) for i in range(4)],
+            "velocity": float(row['growth_rate']),
+            "confidence": 0.9,
+            "historical": [round(base * (0.96 + 0.015 * i), 2) for i in range(3)]
+        })
+    return results
+
+def loop_products(products):
+    mix = []
+    colors = ['#6366f1', '#10b981', '#f43f5e', '#f59e0b', '#8b5cf6', '#0ea5e9', '#ec4899']
+    for i, (_, row) in enumerate(products.iterrows()):
+        mix.append({
+            "name": row['product_name'],
+            "value": float(row['revenue']),
+            "growth": float(row['growth_rate']),
+            "color": colors[i % len(colors)]
+        })
+    return sorted(mix, key=lambda x: x['value'], reverse=True)
+
+def loop_velocity(orders, window: int = VELOCITY_WINDOW):
+    """Per-product (units, squared daily units) over the window, one order line at a time."""
+    days = {}
+    as_of = None
+    for date, line, units in zip(orders['date'], orders['product_line'], orders['units_sold']):
+        key = (line, date.normalize())
+        days[key] = days.get(key, 0) + units
+        as_of = date.normalize() if as_of is None else max(as_of, date.normalize())
+    sums = {}
+    for (line, day), units in days.items():
+        if (as_of - day).days < window:
+            total, square = sums.get(line, (0.0, 0.0))
+            sums[line] = (total + units, square + units * units)
+    return sums
+
+def loop_inventory(inventory, products, orders):
+    merged = pd.merge(inventory, products, on='product_name', how='left')
+    sums = loop_velocity(orders)
+    results = []
+    for _, row in merged.iterrows():
+        total, square = sums.get(row['product_name'], (0.0, 0.0))
+        velocity = total / VELOCITY_WINDOW
+        std = max(square / VELOCITY_WINDOW - velocity ** 2, 0.0) ** 0.5
+        units_sold = row.get('units_sold', 1)
+        revenue = row.get('revenue', 0)
+        stock = int(row['stock'])
+        unit_price = round(revenue / units_sold, 2) if units_sold > 0 else 0
+        reorder_point = int(np.ceil(velocity * LEAD_TIME_DAYS + SERVICE_LEVEL_Z * std * LEAD_TIME_DAYS ** 0.5))
+        results.append({
+            "product": row['product_name'],
+            "stock_level": stock,
+            "reorder_threshold": int(row['reorder_threshold']),
+            "velocity": round(velocity, 2),
+            "days_remaining": min(int(stock / velocity), MAX_DAYS_OF_COVER) if velocity > 0 else MAX_DAYS_OF_COVER,
+            "reorder_point": reorder_point,
+            "reorder_due": reorder_point > 0 and stock <= reorder_point,
+            "unit_price": unit_price,
+            "value": round(stock * unit_price, 2),
+            "status": "Healthy" if stock > row['reorder_threshold'] else "Warning"
+        })
+    return results
+
+def loop_deal_sizes(products):
+    tiers = {"Small (<$50k)": 0, "Medium ($50k-$200k)": 0, "Large (>$200k)": 0}
+    for _, row in products.iterrows():
+        rev = float(row['revenue'])
+        if rev < 50000:
+            tiers["Small (<$50k)"] += int(row['units_sold'])
+        elif rev < 200000:
+            tiers["Medium ($50k-$200k)"] += int(row['units_sold'])
+        else:
+            tiers["Large (>$200k)"] += int(row['units_sold'])
+    return [{"name": k, "value": v} for k, v in tiers.items() if v > 0]
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, repeat: int = 3):
+    print(f"{'section':<18}{'rows':>8}{'iterrows (ms)':>16}{'columnar (ms)':>16}{'speedup':>10}")
+    for n in sizes:
+        frames = make_frames(n)
+        financials, products, inventory, orders = frames
+        cases = {
+            "recommendations": (
+                lambda: loop_recommendations(inventory),
+                lambda: AnalyticsEngine.generate_recommendations(financials.copy(), products.copy(), inventory.copy())
+            ),
+            "forecast": (
+                lambda: loop_forecast(products),
+                lambda: build_forecast(snapshot(*frames))
+            ),
+            "products": (
+                lambda: loop_products(products),
+                lambda: build_products(snapshot(*frames))
+            ),
+            "inventory": (
+                lambda: loop_inventory(inventory, products, orders),
+                lambda: build_inventory(snapshot(*frames))
+            ),
+            "deal-sizes": (
+                lambda: loop_deal_sizes(products),
+                lambda: build_deal_sizes(snapshot(*frames))
+            ),
+        }
+        for name, (loop_fn, vec_fn) in cases.items():
+            # The row loops are slow at 100k rows; one pass is enough to show the gap
+            t_loop = timed(loop_fn, 1 if n >= 100_000 else repeat)
+            t_vec = timed(vec_fn, repeat)
+            print(f"{name:<18}{n:>8}{t_loop * 1000:>16.1f}{t_vec * 1000:>16.1f}{t_loop / t_vec:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.repeat)
@@ -0,0 +1,129 @@
+"""
+In-process load test of every /api/* endpoint on synthetic data.
+
+The app runs in this process behind httpx's ASGI transport (no network, no server),
+serving a throwaway tenant generated by synthetic_data. Each endpoint gets --requests
+requests from --concurrency concurrent clients; the report has throughput and
+p50/p95/p99 latency per endpoint. Write endpoints run last, against the same tenant.
+/api/events is a long-lived stream and is not load-tested here.
+
+Run from backend/:  python benchmarks/load_test.py [--products 5000] [--requests 200] [--concurrency 16]
+                    [--cold] [--baseline results/load-....json]
+--cold adds a unique query parameter to every GET so the response cache never hits.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import results  # noqa: E402
+import synthetic_data  # noqa: E402
+
+TENANT = "loadtest"
+
+
+def endpoints(product: str):
+    """(method, path, json body) for every endpoint, reads first."""
+    restock = {"operations": [{"product": product, "delta": 1}]}
+    return [
+        ("GET", "/api/health", None),
+        ("GET", "/api/overview", None),
+        ("GET", "/api/overview?limit=10", None),
+        ("GET", "/api/financial-trends", None),
+        ("GET", "/api/forecast", None),
+        ("GET", f"/api/forecast?product={product}", None),
+        ("GET", "/api/forecast?limit=50&fields=product,predictions", None),
+        ("GET", "/api/products", None),
+        ("GET", "/api/products?limit=20", None),
+        ("GET", "/api/recommendations/top?k=10", None),
+        ("GET", "/api/inventory", None),
+        ("GET", "/api/inventory?status=Warning&limit=50", None),
+        ("GET", "/api/deal-sizes", None),
+        ("GET", "/api/stats", None),
+        ("GET", "/api/cube?group_by=territory,quarter,deal_size", None),
+        ("GET", "/api/cube?group_by=product_line&filter=year:2023&sort=-sales&limit=20", None),
+        ("GET", "/api/simulate/runway", None),
+        ("GET", "/api/simulate/runway?paths=100000&method=gbm&revenue_boost=0.02", None),
+        ("GET", "/api/batch", None),
+        ("GET", "/api/dashboard", None),
+        ("POST", "/api/campaign/apply", {"product": product}),
+        ("POST", "/api/inventory/optimize", {"product": product}),
+        ("POST", "/api/campaign/apply/bulk", {"operations": [{"product": product, "delta": 0.001}]}),
+        ("POST", "/api/inventory/optimize/bulk", restock),
+    ]
+
+
+async def hammer(client, method, path, body, n_requests: int, concurrency: int, cold: bool):
+    latencies, errors = [], 0
+    counter = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            url = path
+            if cold and method == "GET":
+                url += ("&" if "?" in path else "?") + f"_bust={i}"
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    stats = results.summarize(latencies)
+    stats["rps"] = round(len(latencies) / wall, 1) if wall > 0 else 0.0
+    stats["errors"] = errors
+    return stats
+
+
+async def run(args, index):
+    transport = httpx.ASGITransport(app=index.app)
+    report = {}
+    async with index.lifespan(index.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", headers={"X-Tenant": TENANT}) as client:
+            for method, path, body in endpoints(synthetic_data.product_names(1)[0]):
+                stats = await hammer(client, method, path, body, args.requests, args.concurrency, args.cold)
+                case = f"{method} {path}"
+                report[case] = stats
+                print(f"{case:<56} {stats['rps']:>9.1f} req/s  p50 {stats['p50_ms']:>8.2f}  "
+                      f"p95 {stats['p95_ms']:>8.2f}  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cold", action="store_true")
+    parser.add_argument("--out", default=None, help="results directory (default benchmarks/results)")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tenants_dir:
+        synthetic_data.generate(os.path.join(tenants_dir, TENANT), products=args.products, orders=args.orders)
+        # Must be set before index is imported: the tenant registry reads it at startup
+        os.environ["TENANTS_DIR"] = tenants_dir
+        import index
+        report = asyncio.run(run(args, index))
+
+    config = {k: getattr(args, k) for k in ("products", "orders", "requests", "concurrency", "cold")}
+    path = results.save("load", report, config, args.out)
+    print(f"\nSaved {path}")
+    if args.baseline and results.compare(report, args.baseline, metric="p95_ms", threshold=args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
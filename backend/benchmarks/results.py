@@ -0,0 +1,96 @@
+"""
+Timing helpers and result files shared by the benchmark scripts.
+
+Results are JSON files under benchmarks/results/ (or --out); pass one back as
+--baseline to flag regressions against it.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def time_call(fn, repeat: int = 5, warmup: int = 1):
+    """Runs fn() `warmup` + `repeat` times; returns the timed durations in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples_s):
+    """Latency summary in milliseconds."""
+    ms = np.asarray(samples_s, dtype=float) * 1000
+    if ms.size == 0:
+        return {"n": 0}
+    return {
+        "n": int(ms.size),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3)
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save(name: str, results: dict, config: dict, out_dir: str = None):
+    """Writes results plus run metadata to <out_dir>/<name>-<timestamp>.json and returns the path."""
+    out_dir = out_dir or RESULTS_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(out_dir, f"{name}-{stamp}.json")
+    payload = {
+        "benchmark": name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def compare(results: dict, baseline_path: str, metric: str = "p50_ms", threshold: float = 0.10):
+    """
+    Prints each case's `metric` against the baseline file and returns the cases that got
+    slower by more than `threshold` (a fraction).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\nvs {os.path.basename(baseline_path)} ({metric}, regression > {threshold:.0%}):")
+    for case, current in results.items():
+        before = baseline.get(case, {}).get(metric)
+        now = current.get(metric)
+        if before is None or now is None:
+            print(f"  {case:<48} {'new':>10}")
+            continue
+        change = (now - before) / before if before else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"  {case:<48} {before:>10.3f} -> {now:>10.3f}  {change:+7.1%}{flag}")
+        if change > threshold:
+            regressions.append(case)
+    return regressions
@@ -0,0 +1,136 @@
+"""
+Synthetic datasets shaped like the files the API serves, at any scale.
+
+Writes monthly_financials.csv, product_sales.csv, inventory.csv and an order file
+shaped like sales_data_sample.csv (same columns, product lines = product names).
+
+Run from backend/:  python benchmarks/synthetic_data.py OUT_DIR [--products 10000] [--months 36] [--orders 200000]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+ORDER_COLUMNS = [
+    "ORDERNUMBER", "QUANTITYORDERED", "PRICEEACH", "ORDERLINENUMBER", "SALES", "ORDERDATE", "STATUS",
+    "QTR_ID", "MONTH_ID", "YEAR_ID", "PRODUCTLINE", "MSRP", "PRODUCTCODE", "CUSTOMERNAME", "PHONE",
+    "ADDRESSLINE1", "ADDRESSLINE2", "CITY", "STATE", "POSTALCODE", "COUNTRY", "TERRITORY",
+    "CONTACTLASTNAME", "CONTACTFIRSTNAME", "DEALSIZE"
+]
+STATUSES = np.array(["Shipped", "Shipped", "Shipped", "Shipped", "Resolved", "In Process", "On Hold", "Cancelled", "Disputed"])
+COUNTRIES = np.array(["USA", "France", "Spain", "Australia", "UK", "Germany", "Japan"])
+TERRITORIES = np.array(["NA", "EMEA", "EMEA", "APAC", "EMEA", "EMEA", "Japan"])
+
+
+def product_names(n: int):
+    return [f"SKU-{i:06d}" for i in range(n)]
+
+
+def make_financials(months: int, rng, start: str = "2022-01"):
+    dates = pd.period_range(start, periods=months, freq="M")
+    trend = np.linspace(1.0, 1.6, months)
+    revenue = (150_000 * trend * rng.uniform(0.9, 1.1, months)).round()
+    expenses = (revenue * rng.uniform(0.65, 0.95, months)).round()
+    return pd.DataFrame({
+        "date": dates.strftime("%Y-%m"),
+        "revenue": revenue.astype(np.int64),
+        "expenses": expenses.astype(np.int64),
+        "net_cash": (revenue - expenses).astype(np.int64)
+    })
+
+
+def make_products(names, rng):
+    n = len(names)
+    units = rng.integers(10, 5_000, n)
+    return pd.DataFrame({
+        "product_name": names,
+        "units_sold": units,
+        "revenue": (units * rng.uniform(50, 800, n)).round().astype(np.int64),
+        "growth_rate": rng.uniform(-0.05, 0.5, n).round(2)
+    })
+
+
+def make_inventory(names, rng):
+    n = len(names)
+    return pd.DataFrame({
+        "product_name": names,
+        "stock": rng.integers(0, 300, n),
+        "reorder_threshold": rng.integers(5, 120, n)
+    })
+
+
+def make_orders(names, n_orders: int, rng, start: str = "2022-01-01", days: int = 3 * 365):
+    n_products = len(names)
+    # Popular products get most orders (Zipf-like), as in real catalogs
+    weights = 1.0 / np.arange(1, n_products + 1) ** 0.8
+    product = rng.choice(n_products, size=n_orders, p=weights / weights.sum())
+    msrp = rng.integers(30, 220, n_products)[product]
+    quantity = rng.integers(6, 70, n_orders)
+    price = np.round(msrp * rng.uniform(0.7, 1.3, n_orders), 2)
+    sales = np.round(quantity * price, 2)
+    dates = pd.Timestamp(start) + pd.to_timedelta(np.sort(rng.integers(0, days, n_orders)), unit="D")
+    country = rng.integers(0, len(COUNTRIES), n_orders)
+    names_arr = np.asarray(names, dtype=object)
+
+    return pd.DataFrame({
+        "ORDERNUMBER": 10100 + np.arange(n_orders) // 4,
+        "QUANTITYORDERED": quantity,
+        "PRICEEACH": price,
+        "ORDERLINENUMBER": np.arange(n_orders) % 4 + 1,
+        "SALES": sales,
+        "ORDERDATE": dates.month.astype(str) + "/" + dates.day.astype(str) + "/" + dates.year.astype(str) + " 0:00",
+        "STATUS": STATUSES[rng.integers(0, len(STATUSES), n_orders)],
+        "QTR_ID": dates.quarter,
+        "MONTH_ID": dates.month,
+        "YEAR_ID": dates.year,
+        "PRODUCTLINE": names_arr[product],
+        "MSRP": msrp,
+        "PRODUCTCODE": np.char.add("S", product.astype(str)),
+        "CUSTOMERNAME": np.char.add("Customer ", rng.integers(0, 500, n_orders).astype(str)),
+        "PHONE": "555-0100",
+        "ADDRESSLINE1": "1 Main St",
+        "ADDRESSLINE2": "",
+        "CITY": "City",
+        "STATE": "",
+        "POSTALCODE": "00000",
+        "COUNTRY": COUNTRIES[country],
+        "TERRITORY": TERRITORIES[country],
+        "CONTACTLASTNAME": "Doe",
+        "CONTACTFIRSTNAME": "Jan",
+        "DEALSIZE": np.select([sales < 3000, sales < 7000], ["Small", "Medium"], default="Large")
+    }, columns=ORDER_COLUMNS)
+
+
+def generate(out_dir: str, products: int = 1_000, months: int = 36, orders: int = 50_000, seed: int = 0):
+    """Writes the four CSVs into `out_dir` and returns their paths by name."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    names = product_names(products)
+    frames = {
+        "monthly_financials.csv": make_financials(months, rng),
+        "product_sales.csv": make_products(names, rng),
+        "inventory.csv": make_inventory(names, rng),
+        "sales_data_sample.csv": make_orders(names, orders, rng)
+    }
+    paths = {}
+    for filename, df in frames.items():
+        paths[filename] = os.path.join(out_dir, filename)
+        df.to_csv(paths[filename], index=False)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for name, path in generate(args.out_dir, args.products, args.months, args.orders, args.seed).items():
+        print(f"{name:<24} {os.path.getsize(path) / 2**20:8.2f} MB  {path}")
+
+
+if __name__ == "__main__":
+    main()
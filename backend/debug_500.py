@@ -2,8 +2,9 @@ import requests
 import traceback
 
 try:
-    response = requests.get("http://127.0.0.1:8000/dashboard")
+    response = requests.get("http://127.0.0.1:8000/api/dashboard")
     print(f"Status Code: {response.status_code}")
+    print(f"Server-Timing: {response.headers.get('server-timing')}")
     print("Response Body:")
     print(response.text)
 except Exception:
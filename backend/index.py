@@ -1,17 +1,83 @@
-from fastapi import FastAPI, HTTPException, Request, Body
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, Body, Query, Header
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
 import pandas as pd
 import numpy as np
-import traceback
-from datetime import datetime
+from functools import cached_property
+from contextlib import asynccontextmanager
 from typing import Optional, List
 from models.forecaster import SalesForecaster
+from models.runway import RunwaySimulator, METHODS as RUNWAY_METHODS
+from models.backtest import BacktestEngine
+from utils.dataset_cache import DatasetCache
+from utils.storage import get_storage
+from utils.versioned_cache import VersionedLRUCache
+from utils.work_pool import WorkPool, PoolSaturated
+from utils.shared_datasets import get_shared_snapshots
+from utils.tenants import TenantRegistry, TenantMiddleware, current_tenant
+from utils.catalog import Catalog
+from utils.responses import FastJSONResponse, ResponseCache, encoded_response
+from utils.live_updates import ChangeFeed, diff_rows, diff_items
+from utils.paging import MAX_PAGE_SIZE, InvalidQuery, Page, parse_fields, parse_date, prefix_mask, records
+from utils.rollup_cube import RollupCube, MEASURES as CUBE_MEASURES, SOURCE_COLUMNS as CUBE_COLUMNS, parse_filters
+from utils.inventory_velocity import VelocityStore, SOURCE_COLUMNS as VELOCITY_COLUMNS
+from utils.aggregate_store import AggregateStore, SOURCE_COLUMNS as AGGREGATE_COLUMNS
+from utils.data_handler import load_and_preprocess_data, read_order_chunks, stream_aggregate, file_marker, read_appended_rows
+from utils.profiling import ProfilingMiddleware, metrics, stage, timed
+
+FORECAST_HORIZON = 4
+# Order files at least this large are aggregated chunk by chunk instead of loaded whole
+STREAM_INGEST_BYTES = int(os.environ.get("STREAM_INGEST_BYTES", 256 * 1024 * 1024))
+# Upper bound on Monte Carlo paths per runway simulation request
+MAX_SIMULATION_PATHS = int(os.environ.get("MAX_SIMULATION_PATHS", 100_000))
+# How often the change watcher checks data versions while clients are subscribed
+LIVE_POLL_SECONDS = float(os.environ.get("LIVE_POLL_SECONDS", 1.0))
 
 forecaster = SalesForecaster()
+# Picks the best-backtesting forecast model per product line; winners cached by series content
+backtest = BacktestEngine(horizon=FORECAST_HORIZON)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Loaded frames for every tenant share one memory budget; each tenant also has its own cap
+dataset_cache = DatasetCache(
+    max_bytes=int(float(os.environ.get("DATASET_CACHE_MB", 1024)) * 2**20),
+    owner_max_bytes=int(float(os.environ.get("TENANT_CACHE_MB", 256)) * 2**20)
+)
+storage = get_storage()
+# The default tenant's data sits next to this file; others under TENANTS_DIR/<tenant>/.
+# Products and inventory are mutable (per-tenant table store); everything else is read-only CSV
+tenants = TenantRegistry(BASE_DIR, os.environ.get("TENANTS_DIR", os.path.join(BASE_DIR, "tenants")), storage)
+# With several worker processes, table snapshots and order-derived state are published once as memory-mapped files
+shared = get_shared_snapshots(BASE_DIR)
+forecast_cache = VersionedLRUCache(max_entries=int(os.environ.get("FORECAST_CACHE_SIZE", 512)))
+# Encoded GET bodies per data version, served with ETag/gzip
+response_cache = ResponseCache(max_entries=int(os.environ.get("RESPONSE_CACHE_SIZE", 256)))
+# Server-sent dashboard diffs
+change_feed = ChangeFeed()
+# Blocking pandas/file work runs here, off the event loop
+work_pool = WorkPool(
+    max_workers=int(os.environ.get("API_WORKER_THREADS", min(32, (os.cpu_count() or 1) + 4))),
+    max_queue=int(os.environ.get("API_MAX_QUEUE", 64))
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start computing the All Products forecast table in the background
+    await work_pool.run(refresh_forecast_cache)
+    change_feed.start(asyncio.get_running_loop())
+    watcher = asyncio.create_task(watch_for_changes())
+    yield
+    watcher.cancel()
+    backtest.close()
+
+app = FastAPI(title="Business Manager API", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Per-route latency histograms and Server-Timing; ?profile=1 answers with a cProfile report when PROFILING=1
+app.add_middleware(ProfilingMiddleware, metrics=metrics, allow_profile=os.environ.get("PROFILING", "0") == "1")
 
-app = FastAPI(title="Business Manager API")
+# Resolve the tenant (X-Tenant header or /t/<tenant>/ prefix) for every request
+app.add_middleware(TenantMiddleware, registry=tenants)
 
 # Enable CORS
 app.add_middleware(
@@ -20,57 +86,185 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Server-Timing"],
 )
 
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    return JSONResponse(status_code=503, headers={"Retry-After": "1"}, content={"message": f"Server busy: {exc}. Retry shortly."})
+
+@app.exception_handler(InvalidQuery)
+async def invalid_query_handler(request: Request, exc: InvalidQuery):
+    return JSONResponse(status_code=400, content={"message": str(exc)})
+
 # --- DATA LOADER ---
 
+def tenant():
+    """Tenant of the current request (the default tenant outside of one)."""
+    return current_tenant.get() or tenants.default
+
 def get_csv_path(filename: str):
-    return os.path.join(os.path.dirname(__file__), filename)
+    return tenant().path(filename)
 
-def load_financials():
-    path = get_csv_path("monthly_financials.csv")
-    if not os.path.exists(path): return pd.DataFrame()
+# Loaders return shared cached frames: copy before mutating.
+
+def _read_financials(path: str):
     df = pd.read_csv(path)
     df['date'] = pd.to_datetime(df['date'])
     return df.sort_values('date')
 
-def load_products():
-    path = get_csv_path("product_sales.csv")
+@timed("load.financials")
+def load_financials():
+    path = get_csv_path("monthly_financials.csv")
     if not os.path.exists(path): return pd.DataFrame()
-    return pd.read_csv(path)
+    return dataset_cache.get(path, lambda p: storage.read(p, _read_financials), owner=tenant().name)
+
+def load_table(table: str):
+    """Reads a mutable table (products, inventory) from the tenant's table store, cached per table version."""
+    current = tenant()
+    store = current.table_store
+    version = store.version(table)
+    if shared is not None and version is not None:
+        # Attach to the snapshot another worker already published for this version
+        loader = lambda _: shared.get(f"{current.name}/{table}", (store.name, store.epoch, version), lambda: store.read(table))
+    else:
+        loader = lambda _: store.read(table)
+    with stage(f"load.{table}"):
+        return dataset_cache.get(f"{current.name}:table:{table}", loader, signature=version, owner=current.name)
+
+def shared_state(key: str, version, state_cls, loader):
+    """
+    Wraps a DatasetCache loader of order-derived state. With worker processes, the first one
+    to need a version builds it and publishes its arrays; the others map them.
+    """
+    if shared is None:
+        return loader
+    return lambda path: shared.get_state(key, version, lambda: loader(path), state_cls)
+
+def _build_cube(path: str):
+    if os.path.exists(path) and os.path.getsize(path) >= STREAM_INGEST_BYTES:
+        # Peak memory bounded by the chunk size and the cube's cells rather than the export
+        return RollupCube.from_chunks(read_order_chunks(path, CUBE_COLUMNS))
+    return RollupCube.from_frame(load_and_preprocess_data(path, CUBE_COLUMNS))
+
+@timed("load.cube")
+def load_cube():
+    """Rollup cube over the tenant's order lines, rebuilt only when the order file changes."""
+    current = tenant()
+    path = get_csv_path("sales_data_sample.csv")
+    version = dataset_cache.version([path])
+    loader = lambda _: _build_cube(path)
+    return dataset_cache.get(f"{current.name}:cube", shared_state(f"{current.name}/cube", version, RollupCube, loader),
+                             signature=version, owner=current.name)
+
+def load_order_state(kind: str, state_cls, build, extend):
+    """
+    State derived from the tenant's order file, cached per order file version. When the file
+    only grew, extend(previous, rows, marker) folds in the appended rows instead of re-reading
+    the whole file; build(path) covers first loads and rewrites, and state_cls() a missing file.
+    """
+    current = tenant()
+    path = get_csv_path("sales_data_sample.csv")
+    key = f"{current.name}:{kind}"
+    version = dataset_cache.version([path])
+
+    def loader(_):
+        if not os.path.exists(path):
+            return state_cls()
+        previous = dataset_cache.peek(key)
+        if previous is not None and previous.source is not None:
+            appended = read_appended_rows(path, previous.source)
+            if appended is not None:
+                return extend(previous, *appended)
+        marker = file_marker(path)
+        state = build(path)
+        # Written to while being read: the marker may not match what was loaded, so reload in full next time
+        state.source = marker if file_marker(path) == marker else None
+        return state
+
+    return dataset_cache.get(key, shared_state(f"{current.name}/{kind}", version, state_cls, loader),
+                             signature=version, owner=current.name)
+
+def _build_velocity(path: str):
+    if os.path.getsize(path) >= STREAM_INGEST_BYTES:
+        # Folded in one chunk at a time instead of parsing the whole export
+        return VelocityStore.from_chunks(read_order_chunks(path, VELOCITY_COLUMNS))
+    return VelocityStore.from_frame(load_and_preprocess_data(path, VELOCITY_COLUMNS))
+
+@timed("load.velocity")
+def load_velocity():
+    """Order-driven inventory velocity (VelocityStore), refreshed incrementally as orders are appended."""
+    return load_order_state(
+        "velocity", VelocityStore, _build_velocity,
+        lambda previous, rows, marker: previous.append(rows, marker)
+    )
+
+def _build_aggregates(path: str):
+    if os.path.getsize(path) >= STREAM_INGEST_BYTES:
+        # Peak memory bounded by the chunk size rather than the export
+        return AggregateStore.from_period_sums(stream_aggregate(path)[1])
+    return AggregateStore.from_frame(load_and_preprocess_data(path, AGGREGATE_COLUMNS))
+
+@timed("load.order_series")
+def load_order_series():
+    """Monthly sales per product line (AggregateStore) behind the forecasts, refreshed incrementally as orders are appended."""
+    return load_order_state(
+        "order_series", AggregateStore, _build_aggregates,
+        lambda previous, rows, marker: previous.append(rows, marker)
+    )
+
+def load_products():
+    return load_table("products")
 
 def load_inventory():
-    path = get_csv_path("inventory.csv")
-    if not os.path.exists(path): return pd.DataFrame()
-    return pd.read_csv(path)
+    return load_table("inventory")
 
 # --- AI & SIMULATION ENGINE ---
 
+def top_k(values, k: int, largest: bool = True):
+    """
+    Positions of the k largest (or smallest) values, best first, with ties in position order:
+    the same rows as the first k of a stable sort, found with a partial selection in O(n + k log k).
+    """
+    v = np.asarray(values, dtype=float)
+    v = -v if largest else v
+    if k >= len(v):
+        return np.argsort(v, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    kth = np.partition(v, k - 1)[k - 1]
+    strict = np.flatnonzero(v < kth)
+    ties = np.flatnonzero(v == kth)[:k - len(strict)]
+    chosen = np.concatenate([strict, ties])
+    return chosen[np.lexsort((chosen, v[chosen]))]
+
+def low_stock_rows(inventory: pd.DataFrame, limit: Optional[int] = None):
+    """
+    (product_name, stock, reorder_threshold) tuples for rows below threshold, in file order.
+    With `limit`, only the `limit` most at-risk rows (lowest stock/threshold) are returned, riskiest first.
+    """
+    if inventory.empty:
+        return []
+    low = inventory[inventory['stock'] < inventory['reorder_threshold']]
+    if limit is not None:
+        ratio = low['stock'].to_numpy(dtype=float) / low['reorder_threshold'].to_numpy(dtype=float)
+        low = low.iloc[top_k(ratio, limit, largest=False)]
+    return list(zip(low['product_name'].tolist(), low['stock'].tolist(), low['reorder_threshold'].tolist()))
+
 class AnalyticsEngine:
     @staticmethod
     def forecast_trend(series: pd.Series, periods: int = 4):
-        predictions = forecaster.predict_next_weeks(series, weeks=periods)
-        
-        # Calculate velocity and confidence (keeping original logic for now)
-        if len(series) < 2:
-            return predictions, 0.0, 1.0
-            
-        y = series.values
-        x = np.arange(len(y))
-        coeffs = np.polyfit(x, y, 1)
-        slope = coeffs[0]
-        velocity = float(round(slope / (y.mean() if y.mean() != 0 else 1), 4))
-        
-        y_pred = slope * x + coeffs[1]
-        ss_res = np.sum((y - y_pred) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 1.0
-        confidence = float(round(max(0.0, min(1.0, r_squared)), 2))
-        
-        return predictions, velocity, confidence
+        # One closed-form fit yields predictions, velocity and confidence together
+        return forecaster.forecast(series, weeks=periods)
 
     @staticmethod
-    def generate_recommendations(financials, products, inventory):
+    @timed("compute.recommendations")
+    def generate_recommendations(financials, products, inventory, limit: Optional[int] = None,
+                                 catalog: Optional[Catalog] = None):
+        """
+        `limit` caps the restock recommendations to the most at-risk products. With the
+        data version's `catalog`, the top growth product is read from its growth index.
+        """
         recs = []
         
         # Rule 1: Risk alert if expenses trending higher than revenue
@@ -86,18 +280,17 @@ class AnalyticsEngine:
             })
             
         # Rule 2: Inventory optimization
-        for _, row in inventory.iterrows():
-            if row['stock'] < row['reorder_threshold']:
-                recs.append({
-                    "type": "inventory",
-                    "title": f"Restock {row['product_name']}",
-                    "description": f"Stock ({row['stock']}) is below threshold ({row['reorder_threshold']}). Reorder now.",
-                    "confidence": 0.95,
-                    "action": "Optimize Inventory"
-                })
+        recs.extend({
+            "type": "inventory",
+            "title": f"Restock {name}",
+            "description": f"Stock ({stock}) is below threshold ({threshold}). Reorder now.",
+            "confidence": 0.95,
+            "action": "Optimize Inventory"
+        } for name, stock, threshold in low_stock_rows(inventory, limit))
                 
         # Rule 3: Growth Opportunity
-        top_growth = products.sort_values('growth_rate', ascending=False).iloc[0]
+        growth_order = catalog.growth_order if catalog is not None else top_k(products['growth_rate'], 1)
+        top_growth = products.iloc[growth_order[0]]
         recs.append({
             "type": "marketing",
             "title": f"Scale {top_growth['product_name']}",
@@ -108,19 +301,80 @@ class AnalyticsEngine:
         
         return recs
 
-# --- ENDPOINTS ---
+    @staticmethod
+    def top_candidates(products, inventory, k: int = 5, catalog: Optional[Catalog] = None):
+        """
+        Top-k growth candidates, restock risks and revenue contributors. Growth and revenue
+        come from the `catalog`'s rank indexes when given, else from a partial selection
+        rather than sorting the whole catalog.
+        """
+        result = {"growth": [], "restock": [], "revenue": []}
+        if not products.empty:
+            names = products['product_name'].to_numpy()
+            growth = products['growth_rate'].to_numpy(dtype=float)
+            revenue = products['revenue'].to_numpy(dtype=float)
+            if catalog is not None:
+                by_growth, by_revenue = catalog.growth_order[:k], catalog.revenue_order[:k]
+            else:
+                by_growth, by_revenue = top_k(growth, k), top_k(revenue, k)
+            result["growth"] = [{"product": names[i], "growth": float(growth[i])} for i in by_growth]
+            result["revenue"] = [{"product": names[i], "revenue": float(revenue[i])} for i in by_revenue]
+        result["restock"] = [
+            {"product": name, "stock": stock, "reorder_threshold": threshold}
+            for name, stock, threshold in low_stock_rows(inventory, k)
+        ]
+        return result
 
-@app.get("/api/health")
-async def health():
-    return {"status": "ok", "app": "Revenue Analysis AI Platform"}
+# --- DASHBOARD SECTIONS ---
 
-@app.get("/api/overview")
-async def get_overview():
-    financials = load_financials()
+class DataSnapshot:
+    """
+    One consistent view of the datasets for a single request.
+    Shared aggregates are computed lazily and at most once, so a batched
+    request does not repeat work across sections.
+    """
+    def __init__(self, financials=None, products=None, inventory=None):
+        self.financials = load_financials() if financials is None else financials
+        self.products = load_products() if products is None else products
+        self.inventory = load_inventory() if inventory is None else inventory
+
+    @cached_property
+    def last_month(self):
+        return self.financials.iloc[-1]
+
+    @cached_property
+    def revenue_tail(self):
+        return self.financials['revenue'].tail(3)
+
+    @cached_property
+    def catalog(self):
+        # Indexed products/inventory, shared across requests for the same data version
+        name = tenant().name
+        return dataset_cache.derived(f"{name}:catalog", (self.products, self.inventory),
+                                     lambda: Catalog(self.products, self.inventory), owner=name)
+
+    def inventory_rates(self, inventory: pd.DataFrame, kind: str):
+        """Order-driven velocity/cover/reorder point for every row of `inventory`, cached per frame and velocity store."""
+        name, velocity = tenant().name, self.velocity
+        return dataset_cache.derived(f"{name}:inventory_rates:{kind}", (velocity, inventory),
+                                     lambda: velocity.for_inventory(inventory), owner=name)
+
+    @cached_property
+    def velocity(self):
+        return load_velocity()
+
+    @cached_property
+    def order_series(self):
+        return load_order_series()
+
+@timed("compute.overview")
+def build_overview(snap: DataSnapshot, limit: Optional[int] = None):
+    """`limit` caps restock recommendations and inventory alerts to the most at-risk products."""
+    financials = snap.financials
     if financials.empty:
         return {"total_revenue": 0, "net_cash": 0, "risk_level": "Low", "recommendations": [], "alerts": []}
     
-    last_month = financials.iloc[-1]
+    last_month = snap.last_month
     total_revenue = float(financials['revenue'].sum())
     net_cash = float(last_month['net_cash'])
     
@@ -131,7 +385,8 @@ async def get_overview():
     elif last_month['expenses'] > last_month['revenue'] * 0.8:
         risk = "Medium"
 
-    recommendations = AnalyticsEngine.generate_recommendations(financials, load_products(), load_inventory())
+    recommendations = AnalyticsEngine.generate_recommendations(financials, snap.products, snap.inventory, limit,
+                                                               catalog=snap.catalog)
 
     # Build alerts from recommendations and financial data
     alerts = []
@@ -145,18 +400,15 @@ async def get_overview():
             "risk": "high" if risk == "High" else "low"
         })
     # Inventory alerts
-    inventory = load_inventory()
-    for _, row in inventory.iterrows():
-        if row['stock'] < row['reorder_threshold']:
-            alerts.append({
-                "type": "Inventory",
-                "time": "Now",
-                "title": f"{row['product_name']} Low Stock",
-                "description": f"Stock ({row['stock']} units) is below reorder threshold ({row['reorder_threshold']}). Restock immediately.",
-                "risk": "high"
-            })
+    alerts.extend({
+        "type": "Inventory",
+        "time": "Now",
+        "title": f"{name} Low Stock",
+        "description": f"Stock ({stock} units) is below reorder threshold ({threshold}). Restock immediately.",
+        "risk": "high"
+    } for name, stock, threshold in low_stock_rows(snap.inventory, limit))
     # Revenue momentum alert
-    rev_recent = financials['revenue'].tail(3)
+    rev_recent = snap.revenue_tail
     if len(rev_recent) >= 3 and float(rev_recent.iloc[-1]) > float(rev_recent.iloc[0]) * 1.1:
         alerts.append({
             "type": "Revenue",
@@ -186,149 +438,209 @@ async def get_overview():
         "summary": summary
     }
 
-@app.get("/api/financial-trends")
-async def get_trends():
-    financials = load_financials()
-    if financials.empty: return []
-    
-    data = []
-    for _, row in financials.iterrows():
-        data.append({
-            "month": row['date'].strftime('%b %Y'),
-            "revenue": float(row['revenue']),
-            "expenses": float(row['expenses']),
-            "net": float(row['net_cash'])
-        })
-    return data
+TREND_FIELDS = ["month", "revenue", "expenses", "net"]
 
-@app.get("/api/forecast")
-async def get_forecast(product: Optional[str] = None):
-    financials = load_financials()
-    products = load_products()
+@timed("compute.trends")
+def list_trends(snap: DataSnapshot, start=None, end=None, cursor=None, limit=None, fields=None):
+    """Monthly trend rows dated within [start, end], paged. Returns (rows, Page)."""
+    financials = snap.financials
+    if financials.empty: return [], Page(0)
+
+    dates = financials['date']
+    mask = np.ones(len(financials), dtype=bool)
+    if start is not None:
+        mask &= (dates >= start).to_numpy()
+    if end is not None:
+        mask &= (dates <= end).to_numpy()
+    positions = np.flatnonzero(mask)
+    page = Page(len(positions), cursor, limit)
+    rows = financials.iloc[positions[page.start:page.stop]]
+
+    return records({
+        "month": rows['date'].dt.strftime('%b %Y').to_numpy(),
+        "revenue": rows['revenue'].to_numpy(dtype=float),
+        "expenses": rows['expenses'].to_numpy(dtype=float),
+        "net": rows['net_cash'].to_numpy(dtype=float)
+    }, fields), page
+
+def build_trends(snap: DataSnapshot):
+    return list_trends(snap)[0]
+
+@timed("compute.forecast")
+def build_forecast(snap: DataSnapshot, product: Optional[str] = None, horizon: int = 4):
+    financials = snap.financials
+    products = snap.products
     
+    store = snap.order_series
+
     if product and product != "All Products":
-        # Simulate product-specific forecast using growth_rate
-        p_data = products[products['product_name'] == product]
-        if p_data.empty: return []
+        if product in store:
+            predictions, velocity, confidence, history, models = order_forecasts(store, [product], horizon, 4)
+            return [{
+                "product": product,
+                "predictions": predictions[0].tolist(),
+                "velocity": float(velocity[0]),
+                "confidence": float(confidence[0]),
+                "historical": history[0].tolist(),
+                "model": models[0]
+            }]
+
+        # No order history: project from the product's growth rate
+        row = snap.catalog.product(product)
+        if row is None: return []
         
-        row = p_data.iloc[0]
         base_rev = float(row['revenue'] / 12) # Approximate monthly
         growth = float(row['growth_rate'])
         
         # More realistic historical data for visualization
         history = [round(base_rev * (0.95 + 0.02 * i), 2) for i in range(4)]
-        predictions = [round(base_rev * (1 + growth)**(i+1), 2) for i in range(4)]
+        predictions = [round(base_rev * (1 + growth)**(i+1), 2) for i in range(horizon)]
         
         return [{
             "product": product,
             "predictions": predictions,
             "velocity": growth,
             "confidence": 0.92,
-            "historical": history
+            "historical": history,
+            "model": "growth_rate"
         }]
     else:
         # Full dashboard forecast
-        predictions, velocity, confidence = AnalyticsEngine.forecast_trend(financials['revenue'])
+        predictions, velocity, confidence = AnalyticsEngine.forecast_trend(financials['revenue'], periods=horizon)
+        if products.empty: return []
         
         # Detailed forecast for each product (for the table)
-        results = []
-        for _, row in products.iterrows():
-            base = row['revenue'] / 12
-            # Use growth rate for prediction
-            p_preds = [round(base * (1 + row['growth_rate'])**(i+1), 2) for i in range(4)]
-            # Use a slightly jittered history for visual appeal
-            h_data = [round(base * (0.96 + 0.015 * i), 2) for i in range(3)]
-            
-            results.append({
-                "product": row['product_name'],
-                "predictions": p_preds,
-                "velocity": float(row['growth_rate']),
-                "confidence": 0.9,
-                "historical": h_data
-            })
-        return results
+        names = products['product_name'].tolist()
+        base = products['revenue'].to_numpy(dtype=float)[:, None] / 12
+        growth = products['growth_rate'].to_numpy(dtype=float)
+        # Products without order history: base * (1 + g)^step for steps 1..horizon
+        p_preds = np.round(base * (1 + growth[:, None]) ** np.arange(1, horizon + 1), 2)
+        # Use a slightly jittered history for visual appeal
+        h_data = np.round(base * (0.96 + 0.015 * np.arange(3)), 2)
+        velocities = growth.copy()
+        confidences = np.full(len(names), 0.9)
+        models = np.full(len(names), "growth_rate", dtype=object)
 
-@app.get("/api/products")
-async def get_products():
-    products = load_products()
-    if products.empty: return []
-    
-    mix = []
-    colors = ['#6366f1', '#10b981', '#f43f5e', '#f59e0b', '#8b5cf6', '#0ea5e9', '#ec4899']
-    for i, (_, row) in enumerate(products.iterrows()):
-        mix.append({
-            "name": row['product_name'],
-            "value": float(row['revenue']),
-            "growth": float(row['growth_rate']),
-            "color": colors[i % len(colors)]
-        })
-    return sorted(mix, key=lambda x: x['value'], reverse=True)
+        # Product lines with orders: their monthly order sales, each with its selected model
+        known = [i for i, name in enumerate(names) if name in store]
+        if known:
+            p_preds[known], velocities[known], confidences[known], h_data[known], models[known] = \
+                order_forecasts(store, [names[i] for i in known], horizon, 3)
 
-@app.get("/api/inventory")
-async def get_inventory():
-    inventory = load_inventory()
-    sales = load_products()
-    
-    if inventory.empty: return []
+        return [{
+            "product": name,
+            "predictions": preds,
+            "velocity": g,
+            "confidence": c,
+            "historical": hist,
+            "model": model
+        } for name, preds, g, c, hist, model in zip(names, p_preds.tolist(), velocities.tolist(), confidences.tolist(),
+                                                     h_data.tolist(), models.tolist())]
+
+def order_forecasts(store: AggregateStore, names: list, horizon: int, history_periods: int):
+    """
+    Forecasts of the monthly order sales of product lines in `store`, each predicted with the
+    model that backtested best on its history. Returns (predictions, velocity, confidence,
+    historical, models) arrays aligned with `names`.
+    """
+    _, rows, matrix = store.matrix()
+    history = matrix[[rows[name] for name in names]]
+    with stage("compute.model_selection"):
+        # NaN before a line's first order: each line is backtested on its own span
+        selection = backtest.select(pd.DataFrame(history, index=names))
+    models = np.array([selection[name]["model"] for name in names], dtype=object)
+    # Linear trend, velocity and confidence come straight from the store's running fit statistics
+    predictions, velocity, confidence = store.trend(names, horizon)
+    other = models != "linear"
+    if other.any():
+        predictions[other] = forecaster.predict_batch(history[other], horizon, models=models[other])[0]
+    return predictions, velocity, confidence, np.round(np.nan_to_num(history[:, -history_periods:]), 2), models
+
+PRODUCT_FIELDS = ["name", "value", "growth", "color"]
+
+@timed("compute.products")
+def list_products(snap: DataSnapshot, prefix=None, cursor=None, limit=None, offset=0, fields=None):
+    """
+    Revenue mix, largest first, for products whose name starts with `prefix`.
+    Pages are cut with a partial top-k, so a page never sorts the whole catalog. Returns (rows, Page).
+    """
+    products = snap.products
+    if products.empty: return [], Page(0)
     
-    # Merge with sales data to get revenue/units for pricing
-    # If sales data is missing, we'll default to some estimates
-    if not sales.empty:
-        merged = pd.merge(inventory, sales, on='product_name', how='left')
+    colors = np.array(['#6366f1', '#10b981', '#f43f5e', '#f59e0b', '#8b5cf6', '#0ea5e9', '#ec4899'])
+    names = products['product_name'].to_numpy()
+    revenue = products['revenue'].to_numpy(dtype=float)
+    candidates = np.flatnonzero(prefix_mask(names, prefix))
+    page = Page(len(candidates), cursor, limit, offset)
+    order = candidates[top_k(revenue[candidates], page.stop)[page.start:]]
+    return records({
+        "name": names[order],
+        "value": revenue[order],
+        "growth": products['growth_rate'].to_numpy(dtype=float)[order],
+        # Colors follow file order, before sorting by value
+        "color": colors[order % len(colors)]
+    }, fields), page
+
+def build_products(snap: DataSnapshot, limit: Optional[int] = None, offset: int = 0):
+    return list_products(snap, limit=limit, offset=offset)[0]
+
+# status compares stock with the configured reorder_threshold, the floor the alerts and restock
+# recommendations use; reorder_due compares it with the demand-based reorder_point from order history
+INVENTORY_FIELDS = ["product", "stock_level", "reorder_threshold", "velocity", "days_remaining", "reorder_point", "reorder_due",
+                    "unit_price", "value", "status"]
+
+@timed("compute.inventory")
+def list_inventory(snap: DataSnapshot, status=None, prefix=None, cursor=None, limit=None, fields=None):
+    """Inventory rows filtered by status and product-name prefix, in file order, paged. Returns (rows, Page)."""
+    if snap.inventory.empty: return [], Page(0)
+
+    # Merged view with unit_price/total_value/status precomputed per data version
+    catalog = snap.catalog
+    view = catalog.inventory_view
+    if status:
+        positions = catalog.status_index.get(status, np.array([], dtype=np.int64))
     else:
-        merged = inventory
-        merged['revenue'] = 0
-        merged['units_sold'] = 1
-
-    results = []
-    for _, row in merged.iterrows():
-        # Simulate velocity and days remaining
-        velocity = float(np.random.uniform(2.0, 5.0))
-        
-        # Calculate unit price based on sales data (revenue / units_sold)
-        # Handle cases where units_sold might be 0 or missing
-        units_sold = row.get('units_sold', 1)
-        revenue = row.get('revenue', 0)
-        stock = int(row['stock'])
-        
-        unit_price = round(revenue / units_sold, 2) if units_sold > 0 else 0
-        total_value = round(stock * unit_price, 2)
-        
-        days_remaining = int(stock / (velocity + 0.1))
-        
-        results.append({
-            "product": row['product_name'],
-            "stock_level": stock,
-            "reorder_threshold": int(row['reorder_threshold']),
-            "velocity": round(velocity, 2),
-            "days_remaining": days_remaining,
-            "unit_price": unit_price,
-            "value": total_value,
-            "status": "Healthy" if stock > row['reorder_threshold'] else "Warning"
-        })
-    return results
+        positions = np.arange(len(view))
+    positions = positions[prefix_mask(view['product_name'].to_numpy()[positions], prefix)]
+    page = Page(len(positions), cursor, limit)
+    selected = positions[page.start:page.stop]
+    rows = view.iloc[selected]
+    # Velocity/cover/reorder point for the whole view, computed once per view and order data version
+    rates = snap.inventory_rates(view, "view")
 
-@app.get("/api/deal-sizes")
-async def get_deal_sizes():
-    products = load_products()
+    return records({
+        "product": rows['product_name'].to_numpy(),
+        "stock_level": rows['stock'].to_numpy(dtype=np.int64),
+        "reorder_threshold": rows['reorder_threshold'].to_numpy(dtype=np.int64),
+        "velocity": rates["velocity"][selected],
+        "days_remaining": rates["days_remaining"][selected],
+        "reorder_point": rates["reorder_point"][selected],
+        "reorder_due": rates["reorder_due"][selected],
+        "unit_price": rows['unit_price'].to_numpy(),
+        "value": rows['total_value'].to_numpy(),
+        "status": rows['status'].to_numpy()
+    }, fields), page
+
+def build_inventory(snap: DataSnapshot):
+    return list_inventory(snap)[0]
+
+@timed("compute.deal_sizes")
+def build_deal_sizes(snap: DataSnapshot):
+    products = snap.products
     if products.empty:
         return []
     # Classify products into deal-size tiers based on average order value
-    tiers = {"Small (<$50k)": 0, "Medium ($50k-$200k)": 0, "Large (>$200k)": 0}
-    for _, row in products.iterrows():
-        rev = float(row['revenue'])
-        if rev < 50000:
-            tiers["Small (<$50k)"] += int(row['units_sold'])
-        elif rev < 200000:
-            tiers["Medium ($50k-$200k)"] += int(row['units_sold'])
-        else:
-            tiers["Large (>$200k)"] += int(row['units_sold'])
-    return [{"name": k, "value": v} for k, v in tiers.items() if v > 0]
+    names = ["Small (<$50k)", "Medium ($50k-$200k)", "Large (>$200k)"]
+    rev = products['revenue'].to_numpy(dtype=float)
+    tier = np.select([rev < 50000, rev < 200000], [0, 1], default=2)
+    units = products['units_sold'].to_numpy(dtype=np.int64)
+    totals = np.bincount(tier, weights=units, minlength=len(names)).astype(np.int64)
+    return [{"name": k, "value": int(v)} for k, v in zip(names, totals) if v > 0]
 
-@app.get("/api/stats")
-async def get_stats():
-    financials = load_financials()
-    products = load_products()
+@timed("compute.stats")
+def build_stats(snap: DataSnapshot):
+    financials = snap.financials
+    products = snap.products
     if financials.empty:
         return {
             "avg_deal_value": 0, "profit_margin": 0, "total_revenue": 0, 
@@ -337,7 +649,7 @@ async def get_stats():
         }
     
     # Current Stats (last month)
-    last_month = financials.iloc[-1]
+    last_month = snap.last_month
     total_rev = float(last_month['revenue'])
     total_exp = float(last_month['expenses'])
     total_units = int(products['units_sold'].sum()) if not products.empty else 1
@@ -379,91 +691,464 @@ async def get_stats():
         "ar_trend": ar_trend
     }
 
+@timed("compute.legacy_inventory")
+def build_legacy_inventory(snap: DataSnapshot):
+    inventory = snap.inventory
+    if inventory.empty: return []
+    stock = inventory['stock'].to_numpy(dtype=np.int64)
+    rates = snap.inventory_rates(inventory, "table")
+    return records({
+        "product": inventory['product_name'].to_numpy(),
+        "stock_level": stock,
+        "velocity": rates["velocity"],
+        "days_remaining": rates["days_remaining"],
+        "status": np.where(stock > inventory['reorder_threshold'].to_numpy(), "Healthy", "Warning")
+    })
+
+# --- FORECAST CACHE ---
+
+def forecast_data_version():
+    return (dataset_cache.version([get_csv_path("monthly_financials.csv")]), tenant().table_store.version("products"),
+            dataset_cache.version([get_csv_path("sales_data_sample.csv")]))
+
+def cached_forecast(product: Optional[str] = None, horizon: int = 4, snap: DataSnapshot = None):
+    """build_forecast served from forecast_cache, keyed by (tenant, product, horizon) and tagged with the data version."""
+    key = (tenant().name, product or "All Products", horizon)
+    compute = lambda: build_forecast(snap or DataSnapshot(), product, horizon)
+    return forecast_cache.get(key, forecast_data_version(), compute)
+
+FORECAST_FIELDS = ["product", "predictions", "velocity", "confidence", "historical", "model"]
+
+def list_forecast(product: Optional[str] = None, horizon: int = 4, prefix=None, cursor=None, limit=None, fields=None):
+    """Page of the cached forecast table, filtered by product-name prefix. Returns (rows, Page)."""
+    rows = cached_forecast(product, horizon)
+    if prefix:
+        keep = prefix_mask([r["product"] for r in rows], prefix)
+        rows = [r for r, k in zip(rows, keep) if k]
+    page = Page(len(rows), cursor, limit)
+    rows = rows[page.start:page.stop]
+    if fields is not None:
+        rows = [{f: r[f] for f in fields} for r in rows]
+    return rows, page
+
+def refresh_forecast_cache(changed_products=()):
+    """
+    Recomputes forecasts after data changes. Entries for `changed_products` (and the
+    All Products table) are rebuilt inline so the writer reads its own update; the current
+    tenant's other cached entries are refreshed in the background. Only keys already in the
+    cache are warmed, besides All Products, so the work is bounded by the cache size rather
+    than the catalog, and other products are computed on their first request.
+    """
+    name = tenant().name
+    version = forecast_data_version()
+    snap = DataSnapshot()
+    keys = {("All Products", FORECAST_HORIZON)}
+    keys.update((product, FORECAST_HORIZON) for product in changed_products)
+    keys.update((product, horizon) for owner, product, horizon in forecast_cache.keys() if owner == name)
+
+    inline = {"All Products", *changed_products} if changed_products else set()
+    background = []
+    for product, horizon in keys:
+        if product in inline:
+            forecast_cache.put((name, product, horizon), version, build_forecast(snap, product, horizon))
+        else:
+            compute = lambda product=product, horizon=horizon: build_forecast(DataSnapshot(), product, horizon)
+            background.append(((name, product, horizon), compute))
+    forecast_cache.warm(background, version)
+
+@timed("data_version")
+def data_version(forecasts: bool = False):
+    """Version of the datasets a GET response is built from; with `forecasts`, of the forecast cache too."""
+    version = (
+        dataset_cache.version([get_csv_path("monthly_financials.csv")]),
+        tenant().table_store.version("products"),
+        tenant().table_store.version("inventory"),
+        dataset_cache.version([get_csv_path("sales_data_sample.csv")])
+    )
+    return version + (forecast_cache.generation,) if forecasts else version
+
+# --- LIVE UPDATES ---
+
+def live_view():
+    """The parts of the dashboard that change with the data, as diffed for live clients."""
+    snap = DataSnapshot()
+    overview = build_overview(snap)
+    return {
+        "inventory": build_inventory(snap),
+        "products": build_products(snap),
+        "forecast": build_forecast(snap, None, FORECAST_HORIZON),
+        "recommendations": overview["recommendations"],
+        "alerts": overview["alerts"],
+        "summary": overview["summary"],
+        "stats": build_stats(snap)
+    }
+
+def diff_live_views(old: dict, new: dict):
+    """Incremental update between two live_view() results, or None when nothing changed."""
+    diff = {
+        "inventory": diff_rows(old["inventory"], new["inventory"], "product"),
+        "products": diff_rows(old["products"], new["products"], "name"),
+        "forecast": diff_rows(old["forecast"], new["forecast"], "product"),
+        "recommendations": diff_items(old["recommendations"], new["recommendations"]),
+        "alerts": diff_items(old["alerts"], new["alerts"])
+    }
+    diff = {name: part for name, part in diff.items() if any(part.values())}
+    for name in ("summary", "stats"):
+        if old[name] != new[name]:
+            diff[name] = new[name]
+    return diff or None
+
+async def watch_for_changes():
+    """
+    Publishes a "diff" event whenever a tenant's data version moves, once per server rather
+    than once per open dashboard. Only tenants with subscribers are checked.
+    Writers call change_feed.notify() to skip the poll interval.
+    """
+    last = {}  # tenant -> (version, live view)
+    while True:
+        active = change_feed.active_channels()
+        for name in [n for n in last if n not in active]:
+            del last[name]
+        for name in active:
+            token = current_tenant.set(tenants.get(name))
+            try:
+                version = await work_pool.run(data_version)
+                previous = last.get(name)
+                if previous is None or version != previous[0]:
+                    view = await work_pool.run(live_view)
+                    diff = diff_live_views(previous[1], view) if previous is not None else None
+                    if diff:
+                        change_feed.publish(name, "diff", diff)
+                    last[name] = (version, view)
+            except PoolSaturated:
+                pass
+            except Exception as e:
+                print(f"Change watcher error for tenant {name}: {e}")
+            finally:
+                current_tenant.reset(token)
+        await change_feed.wait(LIVE_POLL_SECONDS)
+
+# Section name -> builder, keyed by the standalone endpoint path
+DASHBOARD_SECTIONS = {
+    "overview": build_overview,
+    "financial-trends": build_trends,
+    "forecast": build_forecast,
+    "products": build_products,
+    "inventory": build_inventory,
+    "deal-sizes": build_deal_sizes,
+    "stats": build_stats,
+}
+
+def build_sections(snap: DataSnapshot, sections: List[str], product: Optional[str] = None):
+    payload = {}
+    for name in sections:
+        if name == "forecast":
+            payload[name] = cached_forecast(product, snap=snap)
+        else:
+            payload[name] = DASHBOARD_SECTIONS[name](snap)
+    return payload
+
+# --- ENDPOINTS ---
+
+async def cached_json(request: Request, compute, forecasts: bool = False):
+    """
+    Serves compute() through response_cache, keyed by path and query and tagged with data_version(),
+    so an unchanged dashboard is neither rebuilt nor re-serialized and revalidates with a 304.
+    """
+    key = (tenant().name, request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = await work_pool.run(lambda: response_cache.get(key, data_version(forecasts), compute))
+    return encoded_response(request, entry)
+
+@app.get("/api/health")
+async def health():
+    current = tenant()
+    return {"status": "ok", "app": "Revenue Analysis AI Platform", "tenant": current.name, "tenants": len(tenants.names()), "storage": storage.name, "table_store": current.table_store.name, "cache": dataset_cache.stats(), "tenant_cache": dataset_cache.owner_stats(current.name), "forecast_cache": forecast_cache.stats(), "response_cache": response_cache.stats(), "work_pool": work_pool.stats(), "live": change_feed.stats(), "shared": shared.stats() if shared else None, "pid": os.getpid()}
+
+@app.get("/api/metrics")
+async def get_metrics(format: Optional[str] = None):
+    """
+    Request latency by route and stage timings, in the Prometheus text format
+    (format=json for a readable summary). Counters are per worker process.
+    """
+    if format == "json":
+        return metrics.summary()
+    gauges = {
+        "api_work_pool_in_flight": ("Calls running or queued on the work pool.", work_pool.in_flight),
+        "api_work_pool_rejected": ("Calls rejected with 503 since start.", work_pool.rejected),
+        "api_dataset_cache_bytes": ("Bytes of parsed datasets held in memory.", dataset_cache.bytes),
+        "api_response_cache_entries": ("Encoded responses held in the response cache.", response_cache.stats()["entries"]),
+        "api_live_subscribers": ("Connected server-sent event clients.", change_feed.stats()["subscribers"]),
+    }
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/events")
+async def live_events(request: Request, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-sent events. Clients load the dashboard once, then apply "diff" events
+    (changed inventory/product/forecast rows, added/removed recommendations and alerts,
+    new stats and summary). A "reset" event means the client must refetch.
+    """
+    return StreamingResponse(
+        change_feed.stream(request, tenant().name, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/overview")
+async def get_overview(request: Request, limit: Optional[int] = Query(None, ge=1)):
+    return await cached_json(request, lambda: build_overview(DataSnapshot(), limit))
+
+def paged(result):
+    """(rows, Page) -> (rows, headers) carrying the total and next-page cursor."""
+    rows, page = result
+    return rows, page.headers()
+
+@app.get("/api/financial-trends")
+async def get_trends(request: Request, start: Optional[str] = None, end: Optional[str] = None, cursor: Optional[str] = None,
+                     limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), fields: Optional[str] = None):
+    """Monthly trends, optionally limited to a date range (e.g. start=2024-01&end=2024-06)."""
+    start_at, end_at = parse_date(start, "start"), parse_date(end, "end")
+    selected = parse_fields(fields, TREND_FIELDS)
+    return await cached_json(request, lambda: paged(list_trends(DataSnapshot(), start_at, end_at, cursor, limit, selected)))
+
+@app.get("/api/forecast")
+async def get_forecast(request: Request, product: Optional[str] = None, horizon: int = Query(FORECAST_HORIZON, ge=1, le=52),
+                       prefix: Optional[str] = None, cursor: Optional[str] = None,
+                       limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), fields: Optional[str] = None):
+    selected = parse_fields(fields, FORECAST_FIELDS)
+    return await cached_json(request, lambda: paged(list_forecast(product, horizon, prefix, cursor, limit, selected)), forecasts=True)
+
+@app.get("/api/products")
+async def get_products(request: Request, prefix: Optional[str] = None, cursor: Optional[str] = None,
+                       limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), offset: int = Query(0, ge=0),
+                       fields: Optional[str] = None):
+    selected = parse_fields(fields, PRODUCT_FIELDS)
+    return await cached_json(request, lambda: paged(list_products(DataSnapshot(), prefix, cursor, limit, offset, selected)))
+
+@app.get("/api/recommendations/top")
+async def get_top_candidates(request: Request, k: int = Query(5, ge=1, le=1000)):
+    """Top-k growth candidates, restock risks and revenue contributors."""
+    return await cached_json(request, lambda: _top_candidates(k))
+
+def _top_candidates(k: int):
+    snap = DataSnapshot()
+    return AnalyticsEngine.top_candidates(snap.products, snap.inventory, k, catalog=snap.catalog)
+
+@app.get("/api/inventory")
+async def get_inventory(request: Request, status: Optional[str] = None, prefix: Optional[str] = None, cursor: Optional[str] = None,
+                        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), fields: Optional[str] = None):
+    """
+    Inventory with optional server-side filters (status=Healthy|Warning, product-name prefix),
+    cursor paging (limit, then follow X-Next-Cursor) and field projection (fields=product,status).
+    status is stock against the configured reorder_threshold; reorder_due is stock against the
+    reorder_point implied by recent demand and lead time.
+    """
+    selected = parse_fields(fields, INVENTORY_FIELDS)
+    return await cached_json(request, lambda: paged(list_inventory(DataSnapshot(), status, prefix, cursor, limit, selected)))
+
+@app.get("/api/deal-sizes")
+async def get_deal_sizes(request: Request):
+    return await cached_json(request, lambda: build_deal_sizes(DataSnapshot()))
+
+@app.get("/api/stats")
+async def get_stats(request: Request):
+    return await cached_json(request, lambda: build_stats(DataSnapshot()))
+
+@app.get("/api/cube")
+async def query_cube(request: Request, group_by: Optional[str] = None, filter: List[str] = Query([]),
+                     measures: Optional[str] = None, sort: Optional[str] = None,
+                     limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Slice/dice/drill-down over the order lines, answered from the pre-aggregated rollup cube.
+    e.g. group_by=territory,quarter,deal_size&filter=year:2004,2005&filter=status:Shipped&sort=-sales
+    Dimensions are listed by /api/cube/dimensions; measures are sales, units and order_lines.
+    """
+    dims = [d.strip() for d in group_by.split(",") if d.strip()] if group_by else []
+    selected = [m.strip() for m in measures.split(",") if m.strip()] if measures else list(CUBE_MEASURES)
+    filters = parse_filters(filter)
+    return await cached_json(request, lambda: load_cube().query(dims, filters, selected, sort, limit))
+
+@app.get("/api/cube/dimensions")
+async def get_cube_dimensions(request: Request):
+    return await cached_json(request, lambda: {"dimensions": load_cube().dimensions(), "measures": list(CUBE_MEASURES)})
+
+@app.get("/api/simulate/runway")
+async def simulate_runway(request: Request, paths: int = Query(10_000, ge=1, le=MAX_SIMULATION_PATHS),
+                          months: int = Query(36, ge=1, le=120), method: str = "bootstrap", seed: int = 0,
+                          starting_cash: Optional[float] = None,
+                          revenue_boost: float = Query(0.0, gt=-1), expense_boost: float = Query(0.0, gt=-1),
+                          revenue_shock: float = Query(0.0, ge=-1), expense_shock: float = Query(0.0, ge=-1)):
+    """
+    Monte Carlo cash runway from the monthly financials: runway percentiles, probability of
+    running out of cash by each month and cash percentile bands. What-if overrides:
+    revenue_boost/expense_boost add monthly growth (a campaign: revenue_boost=0.02),
+    revenue_shock/expense_shock change the level once, starting_cash sets cash on hand.
+    The same seed gives the same draws, so scenarios compare like for like.
+    """
+    if method not in RUNWAY_METHODS:
+        raise InvalidQuery(f"Unknown method '{method}'. Available: {', '.join(RUNWAY_METHODS)}")
+    scenario = dict(starting_cash=starting_cash, revenue_boost=revenue_boost, expense_boost=expense_boost,
+                    revenue_shock=revenue_shock, expense_shock=expense_shock)
+    return await cached_json(request, lambda: RunwaySimulator(load_financials()).simulate(paths, months, method, seed, **scenario))
+
+@app.get("/api/batch")
+async def get_batch(request: Request, sections: Optional[str] = None, product: Optional[str] = None):
+    """
+    Computes several dashboard sections from one snapshot in a single request.
+    `sections` is a comma-separated subset of DASHBOARD_SECTIONS (default: all);
+    each section has exactly the payload of its standalone endpoint.
+    """
+    if sections:
+        requested = [s.strip() for s in sections.split(",") if s.strip()]
+    else:
+        requested = list(DASHBOARD_SECTIONS)
+    unknown = [s for s in requested if s not in DASHBOARD_SECTIONS]
+    if unknown:
+        return JSONResponse(status_code=400, content={"message": f"Unknown sections: {', '.join(unknown)}"})
+    return await cached_json(request, lambda: build_sections(DataSnapshot(), requested, product), forecasts="forecast" in requested)
+
 @app.post("/api/campaign/apply")
 async def apply_campaign(data: dict = Body(...)):
+    return await work_pool.run(_apply_campaign, data)
+
+def _apply_campaign(data: dict):
     product_name = data.get("product", "General")
     
-    # Load and update products database to persist growth boost
-    products = load_products()
-    if products.empty:
+    if load_products().empty:
         return JSONResponse(status_code=404, content={"message": "Product database empty"})
 
-    if product_name in products['product_name'].values:
-        # Apply a permanent 5% boost to growth rate (e.g. 0.12 becomes 0.17)
-        mask = products['product_name'] == product_name
-        current_growth = products.loc[mask, 'growth_rate'].iloc[0]
-        new_growth = round(current_growth + 0.05, 3)
-        products.loc[mask, 'growth_rate'] = new_growth
-        
-        # Save back to CSV
-        try:
-            path = get_csv_path("product_sales.csv")
-            products.to_csv(path, index=False)
-            
-            return {
-                "status": "success",
-                "message": f"Strategy applied to {product_name}. Multi-week growth adjusted from {int(current_growth*100)}% to {int(new_growth*100)}%.",
-                "impact": {
-                    "rev_increase": 0.05,
-                    "confidence_boost": 0.03
-                }
-            }
-        except Exception as e:
-            return JSONResponse(status_code=500, content={"message": f"Failed to persist strategy: {str(e)}"})
-    else:
+    # Apply a permanent 5% boost to growth rate (e.g. 0.12 becomes 0.17), persisted atomically
+    try:
+        result = tenant().table_store.add_to_column("products", "growth_rate", [(product_name, 0.05)], ndigits=3)[0]
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": f"Failed to persist strategy: {str(e)}"})
+    if result is None:
         return JSONResponse(status_code=404, content={"message": f"Product '{product_name}' not found"})
 
+    current_growth, new_growth = result
+    refresh_forecast_cache([product_name])
+    change_feed.notify()
+    return {
+        "status": "success",
+        "message": f"Strategy applied to {product_name}. Multi-week growth adjusted from {int(current_growth*100)}% to {int(new_growth*100)}%.",
+        "impact": {
+            "rev_increase": 0.05,
+            "confidence_boost": 0.03
+        }
+    }
+
 @app.post("/api/inventory/optimize")
 async def optimize_inventory(data: dict = Body(...)):
+    return await work_pool.run(_optimize_inventory, data)
+
+def _optimize_inventory(data: dict):
     product_name = data.get("product")
     if not product_name:
         return JSONResponse(status_code=400, content={"message": "Product name required"})
 
-    inventory = load_inventory()
-    if inventory.empty:
+    if load_inventory().empty:
         return JSONResponse(status_code=404, content={"message": "Inventory database empty"})
 
-    if product_name in inventory['product_name'].values:
-        # Increase stock by 25 units
-        inventory.loc[inventory['product_name'] == product_name, 'stock'] += 25
-        
-        # Save back to CSV
-        try:
-            path = get_csv_path("inventory.csv")
-            inventory.to_csv(path, index=False)
-            
-            new_stock = int(inventory.loc[inventory['product_name'] == product_name, 'stock'].iloc[0])
-            
-            return {
-                "status": "success",
-                "message": f"Restocked {product_name}. New level: {new_stock} (+25 units).",
-                "new_stock": new_stock
-            }
-        except Exception as e:
-            return JSONResponse(status_code=500, content={"message": f"Failed to save inventory: {str(e)}"})
-    else:
+    # Increase stock by 25 units, persisted atomically
+    try:
+        result = tenant().table_store.add_to_column("inventory", "stock", [(product_name, 25)])[0]
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": f"Failed to save inventory: {str(e)}"})
+    if result is None:
         # If product not found, we can't restock it
         return JSONResponse(status_code=404, content={"message": f"Product {product_name} not found in inventory"})
 
+    new_stock = int(result[1])
+    change_feed.notify()
+    return {
+        "status": "success",
+        "message": f"Restocked {product_name}. New level: {new_stock} (+25 units).",
+        "new_stock": new_stock
+    }
+
+def _bulk_add(table: str, column: str, data: dict, default_delta, ndigits: int = None):
+    """
+    Applies a list of {"product", "delta"} operations to one column in a single
+    table_store transaction. Returns (per-item results, names of changed products).
+    """
+    operations = data.get("operations")
+    if not isinstance(operations, list) or not operations:
+        return JSONResponse(status_code=400, content={"message": "operations must be a non-empty list"}), None
+
+    results = [None] * len(operations)
+    ops, positions = [], []
+    for i, op in enumerate(operations):
+        product = op.get("product") if isinstance(op, dict) else None
+        delta = op.get("delta", default_delta) if isinstance(op, dict) else None
+        if not isinstance(product, str) or not product or isinstance(delta, bool) or not isinstance(delta, (int, float)):
+            results[i] = {"product": product, "status": "invalid", "message": "product (string) and numeric delta required"}
+            continue
+        ops.append((product, delta))
+        positions.append(i)
+
+    try:
+        applied = tenant().table_store.add_to_column(table, column, ops, ndigits=ndigits) if ops else []
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": f"Failed to persist {table} changes: {str(e)}"}), None
+
+    changed = []
+    for i, (product, delta), outcome in zip(positions, ops, applied):
+        if outcome is None:
+            results[i] = {"product": product, "status": "not_found"}
+        else:
+            results[i] = {"product": product, "status": "success", "old": outcome[0], "new": outcome[1]}
+            changed.append(product)
+    if changed:
+        change_feed.notify()
+    return results, changed
+
+def _bulk_response(results, noun: str):
+    applied = sum(r["status"] == "success" for r in results)
+    return {
+        "status": "success" if applied == len(results) else ("partial" if applied else "failed"),
+        "message": f"{noun} {applied} of {len(results)} products.",
+        "applied": applied,
+        "results": results
+    }
+
+@app.post("/api/campaign/apply/bulk")
+async def apply_campaign_bulk(data: dict = Body(...)):
+    """Body: {"operations": [{"product": str, "delta": growth boost, default 0.05}, ...]}"""
+    return await work_pool.run(_apply_campaign_bulk, data)
+
+def _apply_campaign_bulk(data: dict):
+    results, changed = _bulk_add("products", "growth_rate", data, 0.05, ndigits=3)
+    if changed is None:
+        return results
+    if changed:
+        # One cache refresh for the whole batch
+        refresh_forecast_cache(changed)
+    return _bulk_response(results, "Strategy applied to")
+
+@app.post("/api/inventory/optimize/bulk")
+async def optimize_inventory_bulk(data: dict = Body(...)):
+    """Body: {"operations": [{"product": str, "delta": units, default 25}, ...]}"""
+    return await work_pool.run(_optimize_inventory_bulk, data)
+
+def _optimize_inventory_bulk(data: dict):
+    results, changed = _bulk_add("inventory", "stock", data, 25)
+    if changed is None:
+        return results
+    return _bulk_response(results, "Restocked")
+
 # Legacy endpoint for compatibility during migration
 @app.get("/api/dashboard")
-async def get_legacy_dashboard(product: str = None):
+async def get_legacy_dashboard(request: Request, product: str = None):
+    return await cached_json(request, lambda: _legacy_dashboard(product), forecasts=True)
+
+def _legacy_dashboard(product: str = None):
     # This just aggregates everything like it was before
-    overview = await get_overview()
-    trends = await get_trends()
-    forecast = await get_forecast(product)
-    products = await get_products()
-    inventory_data = load_inventory()
-    
-    inv_health = []
-    for _, row in inventory_data.iterrows():
-        inv_health.append({
-            "product": row['product_name'],
-            "stock_level": int(row['stock']),
-            "velocity": 4.5, # Dummy for now
-            "days_remaining": int(row['stock'] / 5),
-            "status": "Healthy" if row['stock'] > row['reorder_threshold'] else "Warning"
-        })
+    snap = DataSnapshot()
+    overview = build_overview(snap)
+    trends = build_trends(snap)
+    forecast = cached_forecast(product, snap=snap)
+    products = build_products(snap)
+    inv_health = build_legacy_inventory(snap)
 
     return {
         "recommendations": overview["recommendations"],
@@ -478,6 +1163,25 @@ async def get_legacy_dashboard(product: str = None):
         }
     }
 
+def publish_shared_datasets():
+    """
+    Loader step for multi-worker mode: parses the default tenant's datasets once (building
+    the columnar sidecars, publishing table snapshots and the order-derived state) so workers
+    start by attaching.
+    """
+    load_financials()
+    for table in ("products", "inventory"):
+        load_table(table)
+    load_velocity()
+    load_order_series()
+    load_cube()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.environ.get("API_WORKERS", 1))
+    if workers > 1:
+        # Workers are separate processes: they need the import string, and share data via `shared`
+        publish_shared_datasets()
+        uvicorn.run("index:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
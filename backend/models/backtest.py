@@ -0,0 +1,216 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from models.forecaster import SalesForecaster
+
+# --- CANDIDATE MODELS ---
+# Each model maps a (n_series, n_periods) training matrix to (n_series, horizon) predictions,
+# vectorized across series; loops only run over time.
+
+def linear_trend(train: np.ndarray, horizon: int):
+    return SalesForecaster().predict_batch(train, weeks=horizon)[0]
+
+def seasonal_naive(train: np.ndarray, horizon: int, season: int = 12):
+    n_periods = train.shape[1]
+    if n_periods < season:
+        # Not a full season yet: repeat the last value
+        return np.repeat(train[:, -1:], horizon, axis=1)
+    idx = n_periods - season + (np.arange(horizon) % season)
+    return train[:, idx]
+
+def exponential_smoothing(train: np.ndarray, horizon: int, alpha: float = 0.3):
+    level = train[:, 0].copy()
+    for t in range(1, train.shape[1]):
+        level = alpha * train[:, t] + (1 - alpha) * level
+    return np.repeat(level[:, None], horizon, axis=1)
+
+def damped_trend(train: np.ndarray, horizon: int, alpha: float = 0.3, beta: float = 0.1, phi: float = 0.9):
+    level = train[:, 0].copy()
+    trend = train[:, 1] - train[:, 0] if train.shape[1] > 1 else np.zeros(len(train))
+    for t in range(1, train.shape[1]):
+        prev_level = level
+        level = alpha * train[:, t] + (1 - alpha) * (prev_level + phi * trend)
+        trend = beta * (level - prev_level) + (1 - beta) * phi * trend
+    # Damped horizon multipliers: phi + phi^2 + ... + phi^h
+    damping = np.cumsum(phi ** np.arange(1, horizon + 1))
+    return np.maximum(0.0, level[:, None] + damping[None, :] * trend[:, None])
+
+MODELS = {
+    "linear": linear_trend,
+    "seasonal_naive": seasonal_naive,
+    "exponential_smoothing": exponential_smoothing,
+    "damped_trend": damped_trend,
+}
+
+def rolling_origin_mae(history: np.ndarray, model: str, horizon: int, min_train: int):
+    """
+    Mean absolute error per series of `model` over every forecast origin from `min_train`
+    to the last period that still leaves `horizon` actuals.
+    """
+    fit = MODELS[model]
+    n_periods = history.shape[1]
+    errors = np.zeros(len(history))
+    origins = range(min_train, n_periods - horizon + 1)
+    for origin in origins:
+        predictions = fit(history[:, :origin], horizon)
+        errors += np.abs(predictions - history[:, origin:origin + horizon]).mean(axis=1)
+    return errors / max(len(origins), 1)
+
+# --- PROCESS POOL WORKERS ---
+
+# Segment the worker last attached to: name -> (SharedMemory, read-only view)
+_attached = {}
+
+def _shared_history(name: str, shape, dtype):
+    """Maps the parent's history matrix read-only, without copying it; reused across tasks of one select()."""
+    entry = _attached.get(name)
+    if entry is None:
+        # A new select() run: release the previous run's mapping
+        for shm, _ in _attached.values():
+            shm.close()
+        _attached.clear()
+        shm = shared_memory.SharedMemory(name=name)
+        history = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        history.flags.writeable = False
+        entry = _attached[name] = (shm, history)
+    return entry[1]
+
+def _score_task(shm_name: str, shape, dtype, model: str, start: int, stop: int, horizon: int, min_train: int):
+    history = _shared_history(shm_name, shape, dtype)
+    return model, start, rolling_origin_mae(history[start:stop], model, horizon, min_train)
+
+# --- ENGINE ---
+
+# Workers are started from a clean server process, not forked from the API process with its
+# threads, locks and open SQLite connections
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class BacktestEngine:
+    """
+    Rolling-origin backtest of every model in MODELS across many series, spread over a
+    process pool that shares the input matrix through shared memory. The winning model per
+    series is cached by the series' content (up to `max_winners` series, least recently used
+    dropped first), so unchanged series are not re-scored. The pool is started on first use
+    and reused until close().
+    """
+
+    def __init__(self, horizon: int = 4, min_train: int = 6, max_workers: int = None, chunk_rows: int = 2000,
+                 max_winners: int = 100_000):
+        self.horizon = horizon
+        self.min_train = min_train
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self.max_winners = max_winners
+        self._winners = OrderedDict()  # series fingerprint -> (model, {model: mae})
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _fingerprint(self, row: np.ndarray):
+        key = hashlib.blake2b(np.ascontiguousarray(row).tobytes(), digest_size=16)
+        key.update(f"{self.horizon}:{self.min_train}".encode())
+        return key.hexdigest()
+
+    def _score_serial(self, history: np.ndarray):
+        return {m: rolling_origin_mae(history, m, self.horizon, self.min_train) for m in MODELS}
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context(POOL_START_METHOD))
+            return self._pool
+
+    def close(self):
+        """Shuts the worker pool down; a later parallel select() starts a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    def _score_parallel(self, history: np.ndarray):
+        shm = shared_memory.SharedMemory(create=True, size=max(history.nbytes, 1))
+        try:
+            shared = np.ndarray(history.shape, dtype=history.dtype, buffer=shm.buf)
+            shared[:] = history
+            scores = {m: np.zeros(len(history)) for m in MODELS}
+            pool = self._executor()
+            futures = [
+                pool.submit(_score_task, shm.name, history.shape, history.dtype, m, start,
+                            min(start + self.chunk_rows, len(history)), self.horizon, self.min_train)
+                for m in MODELS
+                for start in range(0, len(history), self.chunk_rows)
+            ]
+            for future in futures:
+                model, start, errors = future.result()
+                scores[model][start:start + len(errors)] = errors
+            return scores
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _remember(self, key: str, winner):
+        with self._lock:
+            self._winners[key] = winner
+            self._winners.move_to_end(key)
+            while len(self._winners) > self.max_winners:
+                self._winners.popitem(last=False)
+
+    def select(self, matrix: pd.DataFrame):
+        """
+        Picks the lowest-MAE model for every row of `matrix` (index = series name,
+        columns = aligned periods). Leading NaN cells mark periods before a series existed:
+        each series is scored on its observed span only.
+        Returns:
+            dict of series name -> {"model": str, "mae": {model: float}}
+        """
+        if matrix.empty:
+            return {}
+        history = matrix.to_numpy(dtype=float)
+        observed = ~np.isnan(history)
+        first = np.where(observed.any(axis=1), observed.argmax(axis=1), history.shape[1])
+        found = [None] * len(history)
+        for start in np.unique(first):
+            rows = np.flatnonzero(first == start)
+            for row, winner in zip(rows, self._select_span(history[rows, start:])):
+                found[row] = winner
+        return {name: {"model": model, "mae": mae} for name, (model, mae) in zip(matrix.index, found)}
+
+    def _select_span(self, history: np.ndarray):
+        """(model, {model: mae}) per row of a matrix whose rows all start at their first observation."""
+        keys = [self._fingerprint(row) for row in history]
+        found = [None] * len(keys)
+        with self._lock:
+            for i, key in enumerate(keys):
+                winner = self._winners.get(key)
+                if winner is not None:
+                    self._winners.move_to_end(key)
+                    found[i] = winner
+        todo = [i for i, winner in enumerate(found) if winner is None]
+
+        if todo and history.shape[1] >= self.min_train + self.horizon:
+            pending = np.ascontiguousarray(history[todo])
+            # Pool start-up only pays off once there are enough series to split
+            if self.max_workers > 1 and len(pending) * len(MODELS) > self.chunk_rows:
+                scores = self._score_parallel(pending)
+            else:
+                scores = self._score_serial(pending)
+            names = list(MODELS)
+            table = np.column_stack([scores[m] for m in names])
+            for row, i in enumerate(todo):
+                winner = names[int(np.argmin(table[row]))]
+                found[i] = (winner, {m: round(float(table[row, j]), 2) for j, m in enumerate(names)})
+                self._remember(keys[i], found[i])
+        elif todo:
+            # Too short to backtest: keep the default linear trend
+            for i in todo:
+                found[i] = ("linear", {})
+                self._remember(keys[i], found[i])
+        return found
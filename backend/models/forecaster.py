@@ -1,11 +1,101 @@
 import pandas as pd
 import numpy as np
 
+from utils.profiling import timed
+
 class SalesForecaster:
     def __init__(self):
         # We don't need a formal model object if we use numpy functions directly
         pass
 
+    @timed("forecast.predict_batch")
+    def predict_batch(self, history, weeks: int = 4, mask=None, models=None):
+        """
+        Fits a linear trend to every row of a 2D history matrix at once (closed-form least squares).
+        Args:
+            history: array-like of shape (n_series, n_periods), one row per product line or SKU,
+                with periods aligned across rows. NaN cells are treated as missing.
+            weeks: Number of steps to forecast past the last column.
+            mask: Optional boolean array of the same shape; False marks missing cells
+                (e.g. ragged histories that start later). Defaults to the non-NaN cells.
+            models: Optional model name per row, as picked by BacktestEngine.select. Rows whose
+                model is not "linear" take their predictions from that model, run from the row's
+                first observed period (later missing cells as 0); velocity and confidence always
+                describe the linear trend.
+        Returns:
+            (predictions, velocity, confidence): arrays of shape (n_series, weeks), (n_series,)
+            and (n_series,). Predictions are rounded to cents and floored at zero; series with
+            fewer than two observations repeat their last observed value with velocity 0 and
+            confidence 1.
+        """
+        y = np.atleast_2d(np.asarray(history, dtype=float))
+        mask = ~np.isnan(y) if mask is None else (np.asarray(mask, dtype=bool) & ~np.isnan(y))
+        w = mask.astype(float)
+        y = np.where(mask, y, 0.0)
+        n_periods = y.shape[1]
+        x = np.arange(n_periods, dtype=float)
+
+        n = w.sum(axis=1)
+        safe_n = np.where(n > 0, n, 1)
+        x_mean = (w @ x) / safe_n
+        y_mean = y.sum(axis=1) / safe_n
+
+        # Centered sums keep the fit stable for large levels
+        dx = (x[None, :] - x_mean[:, None]) * w
+        dy = (y - y_mean[:, None]) * w
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx != 0)
+        intercept = y_mean - slope * x_mean
+
+        future_x = np.arange(n_periods, n_periods + weeks, dtype=float)
+        predictions = np.maximum(0.0, np.round(slope[:, None] * future_x + intercept[:, None], 2))
+
+        velocity = np.round(slope / np.where(y_mean != 0, y_mean, 1), 4)
+
+        residual = (y - (slope[:, None] * x + intercept[:, None])) * w
+        ss_res = (residual * residual).sum(axis=1)
+        ss_tot = (dy * dy).sum(axis=1)
+        r_squared = 1 - np.divide(ss_res, ss_tot, out=np.zeros_like(ss_res), where=ss_tot != 0)
+        confidence = np.round(np.clip(r_squared, 0.0, 1.0), 2)
+
+        if models is not None:
+            # Imported here: the candidate models build on this module
+            from models.backtest import MODELS
+            models = np.asarray(models)
+            first = np.argmax(mask, axis=1)
+            for model in np.unique(models):
+                if model == "linear":
+                    continue
+                selected = models == model
+                # Series that started later are modelled without zeros for the periods before them
+                for start in np.unique(first[selected]):
+                    rows = np.flatnonzero(selected & (first == start))
+                    predictions[rows] = np.maximum(0.0, np.round(MODELS[model](y[rows, start:], weeks), 2))
+
+        # Not enough data to forecast: flat prediction based on last seen
+        short = n < 2
+        if short.any():
+            last_val = np.zeros(len(y))
+            if n_periods:
+                last_idx = n_periods - 1 - np.argmax(mask[:, ::-1], axis=1)
+                last_val = np.where(n > 0, y[np.arange(len(y)), last_idx], 0.0)
+            predictions[short] = last_val[short, None]
+            velocity[short] = 0.0
+            confidence[short] = 1.0
+
+        return predictions, velocity, confidence
+
+    def forecast(self, historical_data: pd.Series, weeks: int = 4, model: str = None):
+        """
+        Single-series wrapper around predict_batch; `model` as picked by BacktestEngine (default linear).
+        Returns:
+            (predictions, velocity, confidence) as (list of floats, float, float).
+        """
+        models = None if model is None else [model]
+        predictions, velocity, confidence = self.predict_batch(np.asarray(historical_data, dtype=float)[None, :], weeks, models=models)
+        return predictions[0].tolist(), float(velocity[0]), float(confidence[0])
+
     def predict_next_weeks(self, historical_data: pd.Series, weeks: int = 4):
         """
         Uses a simple linear regression (via numpy) to forecast future values based on history.
@@ -15,23 +105,4 @@ class SalesForecaster:
         Returns:
             list of predicted values (floats).
         """
-        if len(historical_data) < 2:
-            # Not enough data to forecast, return flat prediction based on last seen
-            last_val = historical_data.iloc[-1] if not historical_data.empty else 0
-            return [float(last_val)] * weeks
-
-        # Prepare simple time features (ordinal index)
-        x = np.arange(len(historical_data))
-        y = historical_data.values
-
-        # Perform linear regression: y = mx + c
-        # polyfit(x, y, 1) returns [m, c]
-        coeffs = np.polyfit(x, y, 1)
-        m, c = coeffs
-
-        # Predict future steps: x_future = len(history) to len(history) + weeks
-        future_x = np.arange(len(historical_data), len(historical_data) + weeks)
-        predictions = m * future_x + c
-        
-        # Ensure non-negative predictions
-        return [max(0.0, float(round(p, 2))) for p in predictions]
+        return self.forecast(historical_data, weeks)[0]
@@ -1,46 +1,122 @@
-class DecisionEngine:
-    def generate_recommendations(self, product_line: str, predictions: list, history: list, total_sales: float, avg_order_value: float):
-        """
-        Generates actionable recommendations based on sales forecasts and historical data.
-        """
-        try:
-            recommendations = []
-            
-            last_val = history[-1] if history else 0
-            next_val = predictions[0] if predictions else 0
-            
-            # 1. Inventory / Stock Logic
-            if last_val > 0 and next_val > last_val * 1.1:
-                growth_pct = int(((next_val / last_val) - 1) * 100)
-                recommendations.append({
+import numpy as np
+
+# Rule codes, in the order recommendations are listed for one entity
+INVENTORY, PRICING, MARKETING = 0, 1, 2
+RULES = ("inventory", "pricing", "marketing")
+
+
+class RuleBatch:
+    """
+    Columnar result of DecisionEngine.evaluate_batch: one entry per fired rule, ordered by
+    entity then rule. Only `to_dicts` builds the recommendation dicts, and only for these rows.
+    """
+
+    def __init__(self, names, entity: np.ndarray, rule: np.ndarray, value: np.ndarray, size: int):
+        self.names = list(names)  # entity names, indexed by `entity` position
+        self.entity = entity  # entity position per fired rule
+        self.rule = rule      # rule code per fired rule (INVENTORY, PRICING, MARKETING)
+        self.value = value    # growth % (inventory), avg order value (pricing), total sales (marketing)
+        self.size = size      # number of entities evaluated
+
+    def __len__(self):
+        return len(self.entity)
+
+    def counts(self):
+        """Fired rules per rule type."""
+        totals = np.bincount(self.rule, minlength=len(RULES))
+        return {name: int(n) for name, n in zip(RULES, totals)}
+
+    def fired(self, rule: str):
+        """Boolean mask over the evaluated entities for one rule type."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.entity[self.rule == RULES.index(rule)]] = True
+        return mask
+
+    def to_dicts(self, limit: int = None):
+        """Recommendation dicts for the first `limit` fired rules (all by default)."""
+        rows = slice(None, limit)
+        out = []
+        for i, code, value in zip(self.entity[rows].tolist(), self.rule[rows].tolist(), self.value[rows].tolist()):
+            name = self.names[i]
+            if code == INVENTORY:
+                out.append({
                     "type": "inventory",
-                    "title": f"Increase {product_line} Stock",
-                    "description": f"Projected sales growth of {growth_pct}%. Current momentum suggests restocking within 2 weeks.",
+                    "title": f"Increase {name} Stock",
+                    "description": f"Projected sales growth of {int(value)}%. Current momentum suggests restocking within 2 weeks.",
                     "confidence": 0.89,
                     "action": "Review Inventory"
                 })
-                
-            # 2. Pricing Logic
-            if avg_order_value > 3000:
-                recommendations.append({
+            elif code == PRICING:
+                out.append({
                     "type": "pricing",
-                    "title": f"Premium {product_line} Strategy",
-                    "description": f"High-value transactions detected (${int(avg_order_value)} avg). Consider bundling or premium tier pricing.",
+                    "title": f"Premium {name} Strategy",
+                    "description": f"High-value transactions detected (${int(value)} avg). Consider bundling or premium tier pricing.",
                     "confidence": 0.85,
                     "action": "Adjust Pricing"
                 })
-                
-            # 3. Marketing Logic
-            if total_sales > 50000:
-                recommendations.append({
+            else:
+                out.append({
                     "type": "marketing",
-                    "title": f"Expand {product_line} Market",
-                    "description": f"Strong sales performance. Allocate 15% more budget to digital campaigns.",
+                    "title": f"Expand {name} Market",
+                    "description": "Strong sales performance. Allocate 15% more budget to digital campaigns.",
                     "confidence": 0.78,
                     "action": "Launch Campaign"
                 })
-                
-            return recommendations
+        return out
+
+
+class DecisionEngine:
+    def __init__(self, growth_threshold: float = 0.10, premium_order_value: float = 3000, market_sales: float = 50000):
+        """
+        Args:
+            growth_threshold: Restock when the next prediction beats the last value by more than this fraction.
+            premium_order_value: Suggest premium pricing above this average order value.
+            market_sales: Suggest a marketing push above these total sales.
+        """
+        self.growth_threshold = growth_threshold
+        self.premium_order_value = premium_order_value
+        self.market_sales = market_sales
+
+    def evaluate_batch(self, names, last_values, next_values, total_sales, avg_order_values):
+        """
+        Evaluates the inventory/pricing/marketing rules for N entities (product lines or SKUs) at once.
+        Args:
+            names: N entity names, used only when fired rules are turned into dicts.
+            last_values: Last observed sales per entity.
+            next_values: Next predicted sales per entity.
+            total_sales: Total sales per entity.
+            avg_order_values: Average order value per entity.
+        Returns:
+            RuleBatch with only the rules that fired. NaN inputs never fire a rule.
+        """
+        last = np.asarray(last_values, dtype=float)
+        nxt = np.asarray(next_values, dtype=float)
+        total = np.asarray(total_sales, dtype=float)
+        aov = np.asarray(avg_order_values, dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            restock = (last > 0) & (nxt > last * (1 + self.growth_threshold))
+            growth = np.trunc((nxt / last - 1) * 100)
+        premium = aov > self.premium_order_value
+        expand = total > self.market_sales
+
+        # Gather fired rules per type, then interleave them entity by entity
+        hits = [np.flatnonzero(mask) for mask in (restock, premium, expand)]
+        entity = np.concatenate(hits)
+        rule = np.repeat(np.arange(len(RULES), dtype=np.int8), [len(h) for h in hits])
+        value = np.concatenate([growth[hits[INVENTORY]], aov[hits[PRICING]], total[hits[MARKETING]]])
+        order = np.lexsort((rule, entity))
+        return RuleBatch(names, entity[order], rule[order], value[order], len(last))
+
+    def generate_recommendations(self, product_line: str, predictions: list, history: list, total_sales: float, avg_order_value: float):
+        """
+        Generates actionable recommendations based on sales forecasts and historical data.
+        """
+        try:
+            last_val = history[-1] if len(history) else 0
+            next_val = predictions[0] if len(predictions) else 0
+            batch = self.evaluate_batch([product_line], [last_val], [next_val], [total_sales], [avg_order_value])
+            return batch.to_dicts()
         except Exception as e:
             print(f"Error generating recommendations for {product_line}: {e}")
             return []
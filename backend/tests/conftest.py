@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other as `utils.x`, `models.x`, as when the API runs from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.forecaster import SalesForecaster
+from utils.aggregate_store import AggregateStore
+from utils.data_handler import aggregate_by_period
+
+
+def orders(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"),
+        "product_line": rng.choice(["Cars", "Planes", "Ships"], n),
+        "sales": rng.uniform(100, 5000, n).round(2),
+        "units_sold": rng.integers(1, 50, n),
+    })
+
+
+def expected_aggregate(df, period, end):
+    # A line's series runs on with zeros up to the latest period of any line
+    frame = aggregate_by_period(df.sort_values("date"), period)[["sales", "units_sold"]]
+    full = pd.date_range(frame.index[0], end, freq=period)
+    return frame.reindex(full, fill_value=0)
+
+
+@pytest.mark.parametrize("period", ["ME", "W"])
+def test_shuffled_appends_match_full_aggregation(period):
+    df = orders()
+    # "Ships" starts late, so appends move its origin back and the overall range both ways
+    df = df[(df["product_line"] != "Ships") | (df["date"] > "2023-09-01")]
+    store = AggregateStore(period)
+    shuffled = df.sample(frac=1, random_state=1)
+    for start in range(0, len(shuffled), 450):
+        store = store.append(shuffled.iloc[start:start + 450])
+
+    end = store.labels[-1]
+    pd.testing.assert_frame_equal(store.aggregate(), expected_aggregate(df, period, end), check_freq=False, check_names=False)
+    for line, rows in df.groupby("product_line"):
+        pd.testing.assert_frame_equal(store.aggregate(line), expected_aggregate(rows, period, end),
+                                      check_freq=False, check_names=False)
+    assert store.rows == len(df)
+
+
+def test_running_fit_matches_batch_forecaster():
+    df = orders()
+    df = df[(df["product_line"] != "Planes") | (df["date"] > "2024-01-15")]
+    store = AggregateStore.from_frame(df.iloc[:1000]).append(df.iloc[1000:])
+    names, rows, matrix = store.matrix()
+
+    predictions, velocity, confidence = store.trend(names, 4)
+    expected = SalesForecaster().predict_batch(matrix, 4)
+
+    np.testing.assert_allclose(predictions, expected[0], atol=0.011)
+    np.testing.assert_allclose(velocity, expected[1], atol=1e-4)
+    np.testing.assert_allclose(confidence, expected[2], atol=0.01)
+    assert np.isnan(matrix[rows["Planes"], 0])
+
+
+def test_append_leaves_the_previous_store_unchanged():
+    df = orders()
+    base = AggregateStore.from_frame(df.iloc[:2000])
+    before = base.aggregate()
+    new_rows = df.iloc[2000:2001]
+
+    # Two loaders extending the same cached store at once
+    with ThreadPoolExecutor(2) as pool:
+        extended = list(pool.map(lambda _: base.append(new_rows), range(2)))
+
+    pd.testing.assert_frame_equal(base.aggregate(), before)
+    full = AggregateStore.from_frame(df.iloc[:2001]).aggregate()
+    for store in extended:
+        pd.testing.assert_frame_equal(store.aggregate(), full)
+
+
+def test_short_series_repeat_last_value():
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-05", "2024-03-05", "2024-03-20"]),
+        "product_line": ["Cars", "Cars", "Trains"],
+        "sales": [100.0, 300.0, 50.0],
+        "units_sold": [1, 3, 2],
+    })
+    predictions, velocity, confidence = AggregateStore.from_frame(df).trend(["Trains"], 3)
+
+    assert predictions.tolist() == [[50.0, 50.0, 50.0]]
+    assert velocity.tolist() == [0.0] and confidence.tolist() == [1.0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from models.backtest import MODELS, BacktestEngine
+from models.forecaster import SalesForecaster
+
+
+def series(n=60, periods=24, seed=0):
+    rng = np.random.default_rng(seed)
+    trend = np.arange(periods) * rng.uniform(-5, 20, (n, 1))
+    season = 50 * np.sin(np.arange(periods) * np.pi / 6) * rng.uniform(0, 2, (n, 1))
+    values = np.maximum(0, 500 + trend + season + rng.normal(0, 30, (n, periods)))
+    return pd.DataFrame(values, index=[f"line-{i}" for i in range(n)])
+
+
+def test_parallel_selection_matches_serial_and_reuses_pool():
+    matrix = series()
+    serial = BacktestEngine(max_workers=1).select(matrix)
+    engine = BacktestEngine(max_workers=2, chunk_rows=16)
+    try:
+        assert engine.select(matrix) == serial
+        pool = engine._pool
+        assert pool is not None
+        # New series are scored on the same pool
+        assert engine.select(series(seed=1)) == BacktestEngine(max_workers=1).select(series(seed=1))
+        assert engine._pool is pool
+    finally:
+        engine.close()
+
+
+def test_winner_cache_is_bounded():
+    engine = BacktestEngine(max_workers=1, max_winners=10)
+    matrix = series(n=25)
+    selection = engine.select(matrix)
+    assert len(selection) == 25
+    assert len(engine._winners) == 10
+
+
+def test_predict_batch_uses_selected_models():
+    matrix = series(n=8)
+    history = matrix.to_numpy()
+    models = ["linear", "seasonal_naive", "exponential_smoothing", "damped_trend"] * 2
+    predictions, velocity, confidence = SalesForecaster().predict_batch(history, 4, models=models)
+    linear, linear_velocity, linear_confidence = SalesForecaster().predict_batch(history, 4)
+    for row, model in enumerate(models):
+        expected = linear[row] if model == "linear" else np.maximum(0, np.round(MODELS[model](history[row:row + 1], 4)[0], 2))
+        np.testing.assert_array_equal(predictions[row], expected)
+    np.testing.assert_array_equal(velocity, linear_velocity)
+    np.testing.assert_array_equal(confidence, linear_confidence)
+
+
+def test_late_series_are_scored_and_predicted_on_their_observed_span():
+    matrix = series(n=6, periods=24)
+    late = matrix.copy()
+    late.iloc[:3, :14] = np.nan
+    engine = BacktestEngine(max_workers=1)
+
+    selection = engine.select(late)
+    trimmed = BacktestEngine(max_workers=1).select(matrix.iloc[:3, 14:])
+    for name in matrix.index[:3]:
+        assert selection[name] == trimmed[name]
+
+    history = late.to_numpy()
+    predictions, _, _ = SalesForecaster().predict_batch(history, 4, models=["seasonal_naive"] * 6)
+    # 10 observed periods, less than a season: the last value is repeated, not a pre-launch zero from a year back
+    np.testing.assert_array_equal(predictions[:3], np.round(MODELS["seasonal_naive"](history[:3, 14:], 4), 2))
+    assert (predictions[:3] > 0).all()
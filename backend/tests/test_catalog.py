@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from utils.catalog import Catalog
+
+
+def test_rank_indexes_match_a_stable_descending_sort():
+    rng = np.random.default_rng(1)
+    products = pd.DataFrame({
+        "product_name": [f"P{i}" for i in range(200)],
+        "growth_rate": rng.choice([0.05, 0.1, 0.2, 0.35], 200),  # many ties
+        "revenue": rng.integers(0, 10_000, 200).astype(float),
+        "units_sold": rng.integers(1, 100, 200),
+    })
+    inventory = pd.DataFrame({"product_name": ["P0", "P1"], "stock": [3, 40], "reorder_threshold": [5, 5]})
+    catalog = Catalog(products, inventory)
+
+    for column, order in (("growth_rate", catalog.growth_order), ("revenue", catalog.revenue_order)):
+        expected = products.sort_values(column, ascending=False, kind="stable").index.to_numpy()
+        np.testing.assert_array_equal(order, expected)
+
+
+def test_rank_indexes_of_an_empty_catalog():
+    catalog = Catalog(pd.DataFrame(), pd.DataFrame())
+    assert len(catalog.growth_order) == 0 and len(catalog.revenue_order) == 0
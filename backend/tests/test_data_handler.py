@@ -0,0 +1,41 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.aggregate_store import AggregateStore
+from utils.data_handler import aggregate_by_period, load_and_preprocess_data, stream_aggregate
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sales_data_sample.csv")
+
+
+@pytest.fixture
+def orders_csv(tmp_path):
+    # A copy, so columnar sidecars are written to the temp directory
+    path = str(tmp_path / "sales_data_sample.csv")
+    shutil.copy(SAMPLE, path)
+    return path
+
+
+@pytest.mark.parametrize("period", ["ME", "W", "D", "QE"])
+def test_stream_aggregate_matches_in_memory(orders_csv, period):
+    df = load_and_preprocess_data(orders_csv)
+    totals, by_product = stream_aggregate(orders_csv, period, chunksize=500)
+
+    expected = aggregate_by_period(df, period)[["sales", "units_sold"]]
+    pd.testing.assert_frame_equal(totals, expected, check_freq=False, check_names=False)
+    assert sorted(by_product) == sorted(df["product_line"].unique())
+    for line, frame in by_product.items():
+        by_line = aggregate_by_period(df[df["product_line"] == line], period)[["sales", "units_sold"]]
+        pd.testing.assert_frame_equal(frame, by_line, check_freq=False, check_names=False)
+
+
+def test_store_from_streamed_sums_matches_full_load(orders_csv):
+    streamed = AggregateStore.from_period_sums(stream_aggregate(orders_csv, chunksize=700)[1])
+    loaded = AggregateStore.from_frame(load_and_preprocess_data(orders_csv))
+    for line in loaded.names:
+        pd.testing.assert_frame_equal(streamed.aggregate(line), loaded.aggregate(line), check_freq=False)
+    for streamed_part, loaded_part in zip(streamed.trend(loaded.names), loaded.trend(loaded.names)):
+        np.testing.assert_allclose(streamed_part, loaded_part)
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+
+from utils.dataset_cache import DatasetCache
+
+
+def write(path, rows):
+    pd.DataFrame({"x": range(rows)}).to_csv(path, index=False)
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    path = str(tmp_path / "data.csv")
+    write(path, 3)
+    cache = DatasetCache()
+    loads = []
+
+    def loader(p):
+        loads.append(p)
+        return pd.read_csv(p)
+
+    assert len(cache.get(path, loader)) == 3
+    assert len(cache.get(path, loader)) == 3
+    assert len(loads) == 1
+
+    write(path, 5)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert len(cache.get(path, loader)) == 5
+    assert len(loads) == 2
+
+
+def test_evicts_owner_over_budget(tmp_path):
+    cache = DatasetCache(owner_max_bytes=1)
+    frame = pd.DataFrame({"x": range(100)})
+    cache.get("a", lambda _: frame, signature=1, owner="t")
+    cache.get("b", lambda _: frame, signature=1, owner="t")
+    assert cache.peek("a") is None
+    assert cache.peek("b") is frame
+    assert cache.evictions == 1
+
+
+def test_derived_values_follow_source_identity_and_budget():
+    cache = DatasetCache()
+    frame = pd.DataFrame({"x": range(100)})
+    builds = []
+
+    def build():
+        builds.append(1)
+        return frame.assign(y=frame["x"] * 2)
+
+    first = cache.derived("t:view", (frame,), build, owner="t")
+    assert cache.derived("t:view", (frame,), build, owner="t") is first
+    assert len(builds) == 1
+    assert cache.owner_stats("t")["bytes"] >= first.memory_usage(deep=True).sum()
+
+    other = frame.copy()
+    assert cache.derived("t:view", (other,), build, owner="t") is not first
+    assert len(builds) == 2
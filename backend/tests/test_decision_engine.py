@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from services.decision_engine import DecisionEngine
+
+
+def scalar_rules(product_line, last_val, next_val, total_sales, avg_order_value):
+    """The per-entity rules as written before evaluate_batch, kept as the reference."""
+    recommendations = []
+    if last_val > 0 and next_val > last_val * 1.1:
+        growth_pct = int(((next_val / last_val) - 1) * 100)
+        recommendations.append({
+            "type": "inventory",
+            "title": f"Increase {product_line} Stock",
+            "description": f"Projected sales growth of {growth_pct}%. Current momentum suggests restocking within 2 weeks.",
+            "confidence": 0.89,
+            "action": "Review Inventory"
+        })
+    if avg_order_value > 3000:
+        recommendations.append({
+            "type": "pricing",
+            "title": f"Premium {product_line} Strategy",
+            "description": f"High-value transactions detected (${int(avg_order_value)} avg). Consider bundling or premium tier pricing.",
+            "confidence": 0.85,
+            "action": "Adjust Pricing"
+        })
+    if total_sales > 50000:
+        recommendations.append({
+            "type": "marketing",
+            "title": f"Expand {product_line} Market",
+            "description": "Strong sales performance. Allocate 15% more budget to digital campaigns.",
+            "confidence": 0.78,
+            "action": "Launch Campaign"
+        })
+    return recommendations
+
+
+def test_batch_matches_scalar_rules():
+    rng = np.random.default_rng(3)
+    n = 200
+    # Non-range index: names must be taken by position, not by label
+    names = pd.Series([f"line{i}" for i in range(n)], index=rng.permutation(n) + 1000)
+    last = rng.uniform(0, 5000, n)
+    last[::17] = 0
+    nxt = last * rng.uniform(0.8, 1.4, n)
+    total = rng.uniform(0, 100000, n)
+    aov = rng.uniform(1000, 5000, n)
+    engine = DecisionEngine()
+
+    batch = engine.evaluate_batch(names, last, nxt, total, aov).to_dicts()
+    expected = [rec for i in range(n) for rec in scalar_rules(names.iloc[i], last[i], nxt[i], total[i], aov[i])]
+    assert batch == expected
+    assert {rec["type"] for rec in batch} == {"inventory", "pricing", "marketing"}
+
+    single = [
+        rec
+        for i in range(n)
+        for rec in engine.generate_recommendations(names.iloc[i], [nxt[i]], [last[i]], total[i], aov[i])
+    ]
+    assert single == expected
+
+
+def test_rule_thresholds_and_values():
+    engine = DecisionEngine()
+    # Exactly 10% growth, 3000 AOV and 50000 sales don't fire; growth % and AOV are truncated
+    assert engine.generate_recommendations("A", [110], [100], 50000, 3000) == []
+    recs = engine.generate_recommendations("B", [157.9], [100], 50000.5, 3000.99)
+    assert [r["description"] for r in recs] == [
+        "Projected sales growth of 57%. Current momentum suggests restocking within 2 weeks.",
+        "High-value transactions detected ($3000 avg). Consider bundling or premium tier pricing.",
+        "Strong sales performance. Allocate 15% more budget to digital campaigns.",
+    ]
+    assert engine.generate_recommendations("C", [500], [], 0, 0) == []
+
+
+def test_to_dicts_limit_keeps_entity_order():
+    engine = DecisionEngine()
+    batch = engine.evaluate_batch(["a", "b"], [100, 100], [200, 50], [60000, 60000], [4000, 100])
+
+    assert [(r["type"], r["title"]) for r in batch.to_dicts(limit=3)] == [
+        ("inventory", "Increase a Stock"),
+        ("pricing", "Premium a Strategy"),
+        ("marketing", "Expand a Market"),
+    ]
+    assert batch.counts() == {"inventory": 1, "pricing": 1, "marketing": 2}
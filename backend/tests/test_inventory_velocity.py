@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from utils.data_handler import read_order_chunks
+from utils.inventory_velocity import SOURCE_COLUMNS, WINDOWS, VelocityStore
+
+
+def orders(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 500, n), unit="D"),
+        "product_line": rng.choice(["Cars", "Planes", "Ships", "Trains"], n),
+        "units_sold": rng.integers(1, 50, n),
+    })
+
+
+def test_incremental_appends_match_full_build():
+    df = orders().sort_values("date", kind="stable")
+    full = VelocityStore.from_frame(df)
+    # Chunks in date order move the window end forward, so days roll out of every window
+    store = VelocityStore()
+    for start in range(0, len(df), 350):
+        store = store.append(df.iloc[start:start + 350])
+
+    names = ["Ships", "Cars", "Unknown", "Trains", "Planes"]
+    stock = [10, 5000, 3, 0, 40]
+    for window in WINDOWS:
+        expected = full.metrics(names, stock, window=window)
+        actual = store.metrics(names, stock, window=window)
+        for key, values in expected.items():
+            np.testing.assert_allclose(actual[key], values, err_msg=f"{key} over {window} days")
+    assert store.rows == full.rows
+    assert store.as_of == full.as_of
+
+
+def test_reorder_due_compares_stock_with_reorder_point():
+    df = orders()
+    store = VelocityStore.from_frame(df)
+    metrics = store.metrics(["Cars", "Cars", "Unknown"], [0, 10**6, 0])
+
+    assert metrics["reorder_point"][0] > 0
+    assert metrics["reorder_due"].tolist() == [True, False, False]
+    assert metrics["days_remaining"][2] == 999
+
+
+def test_chunked_build_matches_full_build(tmp_path):
+    df = orders(seed=3)
+    path = str(tmp_path / "orders.csv")
+    df.rename(columns={"date": "ORDERDATE", "product_line": "PRODUCTLINE", "units_sold": "QUANTITYORDERED"}).to_csv(path, index=False)
+    full = VelocityStore.from_frame(df)
+    # File order is not date order: later chunks also hold days before the window end
+    chunked = VelocityStore.from_chunks(read_order_chunks(path, SOURCE_COLUMNS, chunksize=450))
+    assert chunked.rows == full.rows and chunked.as_of == full.as_of
+
+    names = ["Trains", "Cars", "Planes", "Ships"]
+    for window in WINDOWS:
+        expected = full.metrics(names, [0, 20, 300, 5000], window=window)
+        actual = chunked.metrics(names, [0, 20, 300, 5000], window=window)
+        for key, values in expected.items():
+            np.testing.assert_allclose(actual[key], values, err_msg=f"{key} over {window} days")
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from models.runway import RunwaySimulator
+
+
+def test_empty_financials_simulate_flat_runway():
+    result = RunwaySimulator(pd.DataFrame()).simulate(paths=100, months=12)
+
+    assert result["starting_cash"] == 0
+    assert result["history_months"] == 0
+    assert result["probability_cash_out"] == 0
+    assert result["cash_bands"]["p50"] == [0.0] * 12
+
+
+def test_default_starting_cash_is_last_month_net_cash():
+    financials = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=4, freq="MS"),
+        "revenue": [1000.0, 1100.0, 1200.0, 1300.0],
+        "expenses": [900.0, 950.0, 1000.0, 1050.0],
+        "net_cash": [5000.0, 5150.0, 5350.0, 5600.0],
+    })
+
+    result = RunwaySimulator(financials).simulate(paths=100, months=6)
+
+    assert result["starting_cash"] == 5600.0
+    assert result["history_months"] == 4
@@ -0,0 +1,95 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.aggregate_store import AggregateStore
+from utils.inventory_velocity import VelocityStore
+from utils.rollup_cube import RollupCube
+from utils.storage import HAS_ARROW
+from utils.shared_datasets import SharedSnapshots
+
+pytestmark = pytest.mark.skipif(not HAS_ARROW, reason="pyarrow not installed")
+
+
+def frame(version):
+    return pd.DataFrame({"version": [version] * 100, "name": [f"p{i}" for i in range(100)]})
+
+
+def test_concurrent_publishes_of_one_version_leave_one_snapshot(tmp_path):
+    shared = SharedSnapshots(str(tmp_path))
+    version = ("db", "epoch", 3)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: shared.publish("t/products", version, frame(3)), range(16)))
+
+    assert os.listdir(tmp_path / "t" / "products") == [os.path.basename(shared.path("t/products", version))]
+    assert shared.attach("t/products", version)["version"].eq(3).all()
+
+
+def test_late_publish_of_older_version_keeps_newer_snapshot(tmp_path):
+    shared = SharedSnapshots(str(tmp_path))
+    shared.publish("t/products", ("db", "epoch", 4), frame(4))
+    # A slow worker finishes publishing the version it read before the write
+    shared.publish("t/products", ("db", "epoch", 3), frame(3))
+
+    assert shared.attach("t/products", ("db", "epoch", 4))["version"].eq(4).all()
+
+    shared.publish("t/products", ("db", "epoch", 5), frame(5))
+    assert len(os.listdir(tmp_path / "t" / "products")) == 1
+
+
+def test_attached_frames_are_arrow_backed_without_copies(tmp_path):
+    import pyarrow as pa
+
+    shared = SharedSnapshots(str(tmp_path))
+    df = pd.DataFrame({"stock": range(200_000), "product_name": [f"p{i}" for i in range(200_000)]})
+    shared.publish("t/inventory", 1, df)
+
+    before = pa.total_allocated_bytes()
+    attached = shared.attach("t/inventory", 1)
+    assert pa.total_allocated_bytes() - before < 64 * 1024
+    assert isinstance(attached["stock"].dtype, pd.ArrowDtype)
+    assert attached["stock"].to_numpy().tolist() == df["stock"].tolist()
+
+
+def orders(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 500, n), unit="D"),
+        "product_line": rng.choice(["Cars", "Planes", "Ships"], n),
+        "sales": rng.uniform(100, 5000, n).round(2),
+        "units_sold": rng.integers(1, 50, n),
+        "TERRITORY": rng.choice(["EMEA", "APAC", "NA"], n),
+        "QTR_ID": rng.integers(1, 5, n),
+    })
+
+
+def test_order_state_round_trips_and_extends_read_only(tmp_path):
+    shared = SharedSnapshots(str(tmp_path))
+    df = orders()
+    version = ((1, 2),)
+
+    velocity = VelocityStore.from_frame(df.iloc[:2000], source=(10, "abc"))
+    attached = shared.get_state("t/velocity", version, lambda: velocity, VelocityStore)
+    assert attached.source == [10, "abc"]
+    assert not attached.keys.flags.writeable
+    names, stock = ["Ships", "Cars", "Trains"], [5, 500, 1]
+    for key, values in velocity.metrics(names, stock).items():
+        np.testing.assert_array_equal(attached.metrics(names, stock)[key], values)
+    # Appends build new arrays, never writing into the mapped ones
+    for key, values in velocity.append(df.iloc[2000:]).metrics(names, stock).items():
+        np.testing.assert_array_equal(attached.append(df.iloc[2000:]).metrics(names, stock)[key], values)
+
+    series = AggregateStore.from_frame(df.iloc[:2000])
+    attached = shared.get_state("t/order_series", version, lambda: series, AggregateStore)
+    pd.testing.assert_frame_equal(attached.aggregate("Cars"), series.aggregate("Cars"))
+    pd.testing.assert_frame_equal(attached.append(df.iloc[2000:]).aggregate(), series.append(df.iloc[2000:]).aggregate())
+
+    cube = RollupCube.from_frame(df)
+    attached = shared.get_state("t/cube", version, lambda: cube, RollupCube)
+    for group_by, filters, sort in [(["territory", "quarter"], None, "-quarter"), (["product_line"], {"territory": ["NA"]}, "-sales")]:
+        assert attached.query(group_by, filters, sort=sort) == cube.query(group_by, filters, sort=sort)
+    assert shared.stats()["published"] == 3
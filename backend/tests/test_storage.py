@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from utils.storage import HAS_ARROW, ColumnarStorage
+
+pytestmark = pytest.mark.skipif(not HAS_ARROW, reason="pyarrow not installed")
+
+
+def test_concurrent_cold_imports_share_one_sidecar(tmp_path, capsys):
+    csv_path = str(tmp_path / "orders.csv")
+    pd.DataFrame({"a": range(1000), "b": [f"x{i}" for i in range(1000)]}).to_csv(csv_path, index=False)
+    storage = ColumnarStorage("feather")
+
+    with ThreadPoolExecutor(8) as pool:
+        lengths = list(pool.map(lambda _: len(storage.read(csv_path)), range(16)))
+
+    assert lengths == [1000] * 16
+    assert "Could not write" not in capsys.readouterr().out
+    assert sorted(os.listdir(tmp_path)) == ["orders.csv", "orders.feather"]
+
+
+@pytest.mark.parametrize("fmt", ["feather", "parquet"])
+def test_sidecar_rebuilt_when_csv_mtime_or_size_differs(tmp_path, fmt):
+    csv_path = str(tmp_path / "orders.csv")
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(csv_path, index=False)
+    storage = ColumnarStorage(fmt)
+    assert storage.read(csv_path)["a"].tolist() == [1, 2, 3]
+    assert not storage.is_stale(csv_path)
+
+    # Replaced by an older copy: the mtime goes back, which a "CSV newer" check misses
+    st = os.stat(csv_path)
+    pd.DataFrame({"a": [7, 8]}).to_csv(csv_path, index=False)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns - 10_000_000_000))
+    assert storage.is_stale(csv_path)
+    assert storage.read(csv_path)["a"].tolist() == [7, 8]
+
+    # Same mtime, different size
+    st = os.stat(csv_path)
+    pd.DataFrame({"a": [7, 8, 9]}).to_csv(csv_path, index=False)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert storage.read(csv_path)["a"].tolist() == [7, 8, 9]
+    assert not storage.is_stale(csv_path)
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils.storage import CsvStorage
+from utils.table_store import SqliteTableStore
+from utils.tenants import TenantRegistry
+
+
+def write_tables(directory, stock):
+    os.makedirs(directory, exist_ok=True)
+    pd.DataFrame({"product_name": ["A", "B"], "stock": stock, "reorder_threshold": [5, 5]}).to_csv(
+        os.path.join(directory, "inventory.csv"), index=False)
+
+
+def test_tenants_get_separate_databases(tmp_path, monkeypatch):
+    default_dir, tenants_dir = tmp_path / "default", tmp_path / "tenants"
+    write_tables(default_dir, [10, 20])
+    write_tables(tenants_dir / "acme", [1, 2])
+    monkeypatch.setenv("TABLE_STORE", "sqlite")
+    monkeypatch.setenv("TABLE_STORE_DB", str(tmp_path / "shared.db"))
+    registry = TenantRegistry(str(default_dir), str(tenants_dir), CsvStorage())
+
+    default_store = registry.default.table_store
+    acme_store = registry.get("acme").table_store
+    assert default_store.db_path == str(tmp_path / "shared.db")
+    assert acme_store.db_path == str(tenants_dir / "acme" / "business.db")
+
+    acme_store.add_to_column("inventory", "stock", [("A", 5)])
+    assert default_store.read("inventory")["stock"].tolist() == [10, 20]
+    assert acme_store.read("inventory")["stock"].tolist() == [6, 2]
+
+
+def test_changed_csv_is_reported_and_reimported_on_request(tmp_path, capsys):
+    write_tables(tmp_path, [10, 20])
+    db_path = str(tmp_path / "business.db")
+    store = SqliteTableStore(db_path, str(tmp_path))
+    store.add_to_column("inventory", "stock", [("A", 1)])
+    version = store.version("inventory")
+
+    write_tables(tmp_path, [7, 8])
+    st = os.stat(tmp_path / "inventory.csv")
+    os.utime(tmp_path / "inventory.csv", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    kept = SqliteTableStore(db_path, str(tmp_path))
+    assert "changed after it was imported" in capsys.readouterr().out
+    assert kept.read("inventory")["stock"].tolist() == [11, 20]
+
+    reseeded = SqliteTableStore(db_path, str(tmp_path), reseed=True)
+    assert reseeded.read("inventory")["stock"].tolist() == [7, 8]
+    assert reseeded.version("inventory") > version
+    # Re-imported once: the next open sees the CSV as unchanged
+    SqliteTableStore(db_path, str(tmp_path))
+    assert "changed after" not in capsys.readouterr().out
+
+
+def test_connections_are_pooled_across_threads(tmp_path):
+    write_tables(tmp_path, [10, 20])
+    store = SqliteTableStore(str(tmp_path / "business.db"), str(tmp_path), idle_connections=2)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: store.add_to_column("inventory", "stock", [("A", 1)]), range(64)))
+    assert len(store._idle) <= 2
+    assert store.read("inventory")["stock"].tolist() == [74, 20]
+
+    store.close()
+    assert store._idle == []
+    # Still usable after closing, without keeping connections open
+    store.add_to_column("inventory", "stock", [("B", 1)])
+    assert store.read("inventory")["stock"].tolist() == [74, 21]
+    assert store._idle == []
+
+
+def test_cold_tenants_table_stores_are_closed(tmp_path, monkeypatch):
+    default_dir, tenants_dir = tmp_path / "default", tmp_path / "tenants"
+    write_tables(default_dir, [10, 20])
+    for name in ("a", "b", "c"):
+        write_tables(tenants_dir / name, [1, 2])
+    monkeypatch.setenv("TABLE_STORE", "sqlite")
+    monkeypatch.delenv("TABLE_STORE_DB", raising=False)
+    registry = TenantRegistry(str(default_dir), str(tenants_dir), CsvStorage(), max_open_stores=2)
+
+    registry.default.table_store.read("inventory")
+    a = registry.get("a").table_store
+    a.add_to_column("inventory", "stock", [("A", 5)])
+    registry.get("b").table_store.read("inventory")
+    registry.get("a").table_store.read("inventory")
+    registry.get("c").table_store.read("inventory")
+    # "b" was least recently used; the default tenant is never closed
+    assert registry.open_stores() == ["a", "c"]
+    assert registry.get("b")._table_store is None
+    assert registry.default._table_store is not None
+
+    registry.get("b").table_store.read("inventory")
+    assert registry.open_stores() == ["c", "b"]
+    assert a._closed and a._idle == []
+    assert registry.get("a").table_store.read("inventory")["stock"].tolist() == [6, 2]
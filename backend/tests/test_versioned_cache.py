@@ -0,0 +1,39 @@
+from utils.versioned_cache import VersionedLRUCache
+
+
+def drain(cache):
+    # One refresh worker: once this runs, everything scheduled before it has finished
+    cache._executor.submit(lambda: None).result()
+
+
+def test_stale_hit_served_then_refreshed():
+    cache = VersionedLRUCache(max_entries=4)
+    assert cache.get("a", 1, lambda: "v1") == "v1"
+    assert cache.get("a", 2, lambda: "v2") == "v1"
+    drain(cache)
+    assert cache.get("a", 2, lambda: "v3") == "v2"
+    assert cache.stats() == {"entries": 1, "hits": 1, "stale_hits": 1, "misses": 1}
+
+
+def test_warm_keeps_recency_and_never_evicts():
+    cache = VersionedLRUCache(max_entries=3)
+    for key in "abc":
+        cache.put(key, 1, key)
+    cache.get("a", 1, lambda: None)  # order is now b, c, a
+
+    cache.warm([("b", lambda: "b2"), ("d", lambda: "d2")], 2)
+    drain(cache)
+    # "b" refreshed in place, "d" was the least recently used entry and went first
+    assert cache.keys() == ["b", "c", "a"]
+    assert cache.get("b", 2, lambda: None) == "b2"
+
+
+def test_warm_fills_free_slots_as_least_recent():
+    cache = VersionedLRUCache(max_entries=3)
+    cache.put("a", 1, "a")
+    cache.warm([("w", lambda: "w")], 1)
+    drain(cache)
+    assert cache.keys() == ["w", "a"]
+    cache.put("b", 1, "b")
+    cache.put("c", 1, "c")
+    assert cache.keys() == ["a", "b", "c"]
@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+
+MEASURES = ['sales', 'units_sold']
+# Columns read from the order file
+SOURCE_COLUMNS = ['date', 'product_line', 'sales', 'units_sold']
+
+
+class AggregateStore:
+    """
+    Incremental replacement for re-running aggregate_by_period over the whole history.
+    Per-period sums are kept per product line in one (lines, periods) array per measure over
+    the overall period range, together with the least-squares sufficient statistics of every
+    line's series (Σy, Σxy, Σy²; n, Σx and Σx² follow from the series length). A line's series
+    runs from its first order's period to the latest period of any line, with periods without
+    orders as 0, so slope, intercept, velocity and the R² confidence are read back in O(1)
+    per line without rescanning history.
+
+    append() costs O(new rows + touched cells) plus one copy of the arrays, and returns a new
+    store: readers of the old one are unaffected, and two loaders extending the same store
+    each get their own result instead of counting the new rows twice.
+    """
+
+    def __init__(self, period: str = 'ME'):
+        self.period = period
+        self.labels = pd.DatetimeIndex([], name='date')  # period labels, one per column
+        self.names = []                                   # product line per row
+        self.rows_of = {}                                 # product line -> row
+        self.first = np.zeros(0, dtype=np.int64)          # column of each line's first order
+        self.values = {m: np.zeros((0, 0)) for m in MEASURES}
+        self.sy = {m: np.zeros(0) for m in MEASURES}
+        self.sxy = {m: np.zeros(0) for m in MEASURES}
+        self.syy = {m: np.zeros(0) for m in MEASURES}
+        self.rows = 0
+        self.source = None  # file_marker of the order file this store reflects
+        self._matrices = {}  # measure -> matrix(); the store never changes once built
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, period: str = 'ME', source=None):
+        return cls(period).append(df, source)
+
+    @classmethod
+    def from_period_sums(cls, by_product: dict, period: str = 'ME', source=None):
+        """
+        Builds the store from per-line period sums, as returned by data_handler.stream_aggregate,
+        so large exports never need to be loaded whole. `rows` stays 0: sums carry no row count.
+        """
+        if not by_product:
+            return cls(period)
+        cells = pd.concat(by_product, names=['product_line', 'date'])[MEASURES]
+        return cls(period)._fold(cells, 0, source)
+
+    def append(self, df: pd.DataFrame, source=None):
+        """New store with the order rows in `df` (load_and_preprocess_data layout) folded in."""
+        df = df.dropna(subset=['date']) if not df.empty else df
+        if df.empty:
+            return self._fold(None, 0, source)
+        df = df.assign(product_line=df['product_line'].fillna('Unknown').astype(str))
+        cells = df.groupby(['product_line', pd.Grouper(key='date', freq=self.period)])[MEASURES].sum()
+        return self._fold(cells, len(df), source)
+
+    def _fold(self, cells, rows: int, source):
+        store = AggregateStore(self.period)
+        store.source = source
+        store.rows = self.rows + rows
+        if cells is None or cells.empty:
+            # Nothing new: share this store's arrays
+            store.labels, store.names, store.rows_of, store.first = self.labels, self.names, self.rows_of, self.first
+            store.values, store.sy, store.sxy, store.syy = self.values, self.sy, self.sxy, self.syy
+            store._matrices = self._matrices
+            return store
+
+        lines = cells.index.get_level_values(0)
+        dates = cells.index.get_level_values(1)
+        start, end = dates.min(), dates.max()
+        if len(self.labels):
+            start, end = min(start, self.labels[0]), max(end, self.labels[-1])
+        labels = pd.date_range(start, end, freq=self.period, name='date')
+        left = labels.get_loc(self.labels[0]) if len(self.labels) else 0
+        old_lines, periods = len(self.names), len(self.labels)
+
+        names = self.names + [name for name in pd.unique(lines) if name not in self.rows_of]
+        rows_of = {name: i for i, name in enumerate(names)} if len(names) > old_lines else self.rows_of
+        row = pd.Index(names).get_indexer(lines)
+        column = labels.get_indexer(dates)
+
+        # Each line's origin moves back to its earliest order; existing points shift right by k
+        first = np.full(len(names), len(labels), dtype=np.int64)
+        first[:old_lines] = self.first + left
+        shift = first.copy()
+        np.minimum.at(first, row, column)
+        shift = np.where(np.arange(len(names)) < old_lines, shift - first, 0)
+
+        x = (column - first[row]).astype(float)
+        for m in MEASURES:
+            values = np.zeros((len(names), len(labels)))
+            values[:old_lines, left:left + periods] = self.values[m]
+            sy, sxy, syy = (np.zeros(len(names)) for _ in range(3))
+            sy[:old_lines], sxy[:old_lines], syy[:old_lines] = self.sy[m], self.sxy[m], self.syy[m]
+            sxy += shift * sy
+
+            delta = cells[m].to_numpy(dtype=float)
+            before = values[row, column]
+            after = before + delta
+            values[row, column] = after
+            sy += np.bincount(row, weights=delta, minlength=len(names))
+            sxy += np.bincount(row, weights=x * delta, minlength=len(names))
+            syy += np.bincount(row, weights=after * after - before * before, minlength=len(names))
+            store.values[m], store.sy[m], store.sxy[m], store.syy[m] = values, sy, sxy, syy
+
+        store.labels, store.names, store.rows_of, store.first = labels, names, rows_of, first
+        return store
+
+    def __contains__(self, product_line: str):
+        return product_line in self.rows_of
+
+    def aggregate(self, product_line: str = None):
+        """
+        One line's per-period sums from its first order (all lines summed when `product_line`
+        is omitted), in the aggregate_by_period layout.
+        """
+        if product_line and product_line != "All Products":
+            row = self.rows_of.get(product_line)
+            if row is None:
+                return pd.DataFrame(columns=MEASURES)
+            span = slice(self.first[row], None)
+            frame = pd.DataFrame({m: self.values[m][row, span] for m in MEASURES}, index=self.labels[span])
+        elif len(self.labels):
+            frame = pd.DataFrame({m: self.values[m].sum(axis=0) for m in MEASURES}, index=self.labels)
+        else:
+            return pd.DataFrame(columns=MEASURES)
+        frame['units_sold'] = frame['units_sold'].round().astype('int64')
+        return frame
+
+    def trend(self, names: list, periods: int = 4, measure: str = 'sales'):
+        """
+        Linear-trend forecasts of `measure` for the product lines `names`, from the running
+        fit statistics: (predictions, velocity, confidence) laid out like
+        SalesForecaster.predict_batch over matrix(), which they match.
+        """
+        rows = np.array([self.rows_of[name] for name in names], dtype=np.int64)
+        n = (len(self.labels) - self.first[rows]).astype(float)
+        sy, sxy, syy = self.sy[measure][rows], self.sxy[measure][rows], self.syy[measure][rows]
+        # x runs 0..n-1 over each series
+        sx = n * (n - 1) / 2
+        sxx = (n - 1) * n * (2 * n - 1) / 6
+        safe_n = np.where(n > 0, n, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = n * sxx - sx * sx
+            slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, 0.0)
+        mean = sy / safe_n
+        intercept = mean - slope * sx / safe_n
+
+        future = n[:, None] + np.arange(periods)
+        predictions = np.maximum(0.0, np.round(slope[:, None] * future + intercept[:, None], 2))
+        velocity = np.round(slope / np.where(mean != 0, mean, 1), 4)
+
+        ss_tot = syy - sy * mean
+        ss_reg = slope * (sxy - sx * mean)
+        # Cancellation leaves a tiny residue for constant series; an exact fit has R² 1
+        flat = ss_tot <= 1e-12 * np.maximum(syy, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(flat, 1.0, ss_reg / ss_tot)
+        confidence = np.round(np.clip(r_squared, 0.0, 1.0), 2)
+
+        # Not enough data to fit: flat at the last value
+        short = n < 2
+        if short.any():
+            last = self.values[measure][rows[short], -1] if len(self.labels) else 0.0
+            predictions[short] = np.round(last, 2)[:, None]
+            velocity[short] = 0.0
+            confidence[short] = 1.0
+        return predictions, velocity, confidence
+
+    def matrix(self, measure: str = 'sales'):
+        """
+        Every product line's history aligned over the overall period range, for batch forecasting:
+        (names, {name: row}, array of shape (lines, periods)). Periods before a line's first order
+        are NaN. Built once per store.
+        """
+        cached = self._matrices.get(measure)
+        if cached is None:
+            out = self.values[measure].copy()
+            out[np.arange(out.shape[1]) < self.first[:, None]] = np.nan
+            out.flags.writeable = False
+            cached = self._matrices[measure] = (self.names, self.rows_of, out)
+        return cached
+
+    def to_shared(self):
+        """(arrays, JSON metadata) for SharedSnapshots.publish_state."""
+        arrays = {"first": self.first}
+        for m in MEASURES:
+            arrays[f"values.{m}"], arrays[f"sy.{m}"] = self.values[m], self.sy[m]
+            arrays[f"sxy.{m}"], arrays[f"syy.{m}"] = self.sxy[m], self.syy[m]
+        start = self.labels[0].isoformat() if len(self.labels) else None
+        meta = {"period": self.period, "start": start, "periods": len(self.labels), "names": self.names,
+                "rows": self.rows, "source": self.source}
+        return arrays, meta
+
+    @classmethod
+    def from_shared(cls, arrays: dict, meta: dict):
+        """Store over arrays published by another process (read-only; append() never writes to them)."""
+        store = cls(meta["period"])
+        if meta["periods"]:
+            store.labels = pd.date_range(meta["start"], periods=meta["periods"], freq=store.period, name='date')
+        store.names = meta["names"]
+        store.rows_of = {name: i for i, name in enumerate(store.names)}
+        store.first = arrays["first"]
+        for m in MEASURES:
+            store.values[m], store.sy[m] = arrays[f"values.{m}"], arrays[f"sy.{m}"]
+            store.sxy[m], store.syy[m] = arrays[f"sxy.{m}"], arrays[f"syy.{m}"]
+        store.rows, store.source = meta["rows"], meta["source"]
+        return store
+
+    @property
+    def nbytes(self):
+        arrays = [self.first] + [a for d in (self.values, self.sy, self.sxy, self.syy) for a in d.values()]
+        # ~100 bytes per name and lookup entry
+        return sum(a.nbytes for a in arrays) + 100 * len(self.names)
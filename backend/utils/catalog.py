@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+
+class Catalog:
+    """
+    Indexed, read-only view of the products and inventory tables for one data version.
+    Built once per version (the API caches it in its DatasetCache) and shared by every request,
+    it gives O(1) product lookups, the inventory+sales merge with pricing precomputed, and
+    secondary indexes on stock status and on the growth and revenue rankings.
+    """
+
+    def __init__(self, products: pd.DataFrame, inventory: pd.DataFrame):
+        self.products = products
+        self.inventory = inventory
+
+        # Primary index: product_name -> row position (first occurrence wins, like a boolean scan + iloc[0])
+        self._product_pos = {}
+        if not products.empty:
+            for pos, name in enumerate(products['product_name'].tolist()):
+                self._product_pos.setdefault(name, pos)
+
+        self.inventory_view = self._build_inventory_view()
+
+        # Secondary index: positions into inventory_view
+        self.status_index = {}
+        if not self.inventory_view.empty:
+            status = self.inventory_view['status'].to_numpy()
+            self.status_index = {s: np.flatnonzero(status == s) for s in ("Healthy", "Warning")}
+
+        # Rank indexes: product positions best first, ties in position order (as a stable sort)
+        self.growth_order = self._ranking('growth_rate')
+        self.revenue_order = self._ranking('revenue')
+
+    def _ranking(self, column: str):
+        if self.products.empty or column not in self.products.columns:
+            return np.array([], dtype=np.int64)
+        return np.argsort(-self.products[column].to_numpy(dtype=float), kind='stable')
+
+    def _build_inventory_view(self):
+        inventory, products = self.inventory, self.products
+        if inventory.empty:
+            return pd.DataFrame()
+        # Merge with sales data to get revenue/units for pricing
+        # If sales data is missing, we'll default to some estimates
+        if not products.empty:
+            merged = pd.merge(inventory, products, on='product_name', how='left')
+        else:
+            merged = inventory.copy()
+            merged['revenue'] = 0
+            merged['units_sold'] = 1
+
+        # Unit price = revenue / units_sold; 0 when units_sold is 0 or missing
+        units_sold = merged['units_sold'].to_numpy(dtype=float)
+        revenue = merged['revenue'].to_numpy(dtype=float)
+        stock = merged['stock'].to_numpy(dtype=np.int64)
+        priced = units_sold > 0
+        unit_price = np.zeros(len(merged))
+        unit_price[priced] = np.round(revenue[priced] / units_sold[priced], 2)
+
+        merged['unit_price'] = unit_price
+        merged['total_value'] = np.round(stock * unit_price, 2)
+        merged['status'] = np.where(stock > merged['reorder_threshold'].to_numpy(), "Healthy", "Warning")
+        return merged
+
+    def product(self, name: str):
+        """Product row as a Series, or None."""
+        pos = self._product_pos.get(name)
+        return None if pos is None else self.products.iloc[pos]
+
+    @property
+    def nbytes(self):
+        """Memory held beyond the source tables: the merged view, its index and the name lookup."""
+        view = int(self.inventory_view.memory_usage(deep=True).sum()) if not self.inventory_view.empty else 0
+        # ~100 bytes per dict entry, key string shared with the products frame
+        indexes = sum(p.nbytes for p in self.status_index.values()) + self.growth_order.nbytes + self.revenue_order.nbytes
+        return view + indexes + 100 * len(self._product_pos)
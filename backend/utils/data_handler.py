@@ -1,67 +1,86 @@
 import pandas as pd
+import codecs
+import hashlib
+import io
 import os
 import traceback
+from utils.storage import get_storage
+from utils.profiling import timed
 
-def load_and_preprocess_data(csv_path: str):
+# Source export column -> analytics column
+RENAME_MAP = {
+    'ORDERDATE': 'date',
+    'QUANTITYORDERED': 'units_sold',
+    'PRICEEACH': 'price',
+    'SALES': 'sales',
+    'PRODUCTLINE': 'product_line',
+    'STATUS': 'status',
+    'YEAR_ID': 'year',
+    'MONTH_ID': 'month'
+}
+
+# Columns the analytics actually use, after renaming
+ANALYTICS_COLUMNS = ['date', 'units_sold', 'price', 'sales', 'product_line', 'status', 'year', 'month']
+
+@timed("load.orders")
+def load_and_preprocess_data(csv_path: str, columns: list = None):
     """
     Loads sales data with robust error handling and fallbacks.
+    With a columnar storage backend the cleaned frame is converted once and
+    later loads skip CSV parsing; pass `columns` to read only what's needed.
     """
     try:
         if not os.path.exists(csv_path):
             print(f"File not found: {csv_path}. Using empty fallback.")
             return create_fallback_df()
 
-        # Try various encodings if default fails
-        df = None
-        for enc in ['utf-8', 'ISO-8859-1', 'cp1252']:
-            try:
-                df = pd.read_csv(csv_path, encoding=enc)
-                break
-            except:
-                continue
-        
-        if df is None:
-            raise ValueError(f"Could not read CSV {csv_path} with any common encoding.")
-
-        # Standardize matching
-        rename_map = {
-            'ORDERDATE': 'date',
-            'QUANTITYORDERED': 'units_sold',
-            'PRICEEACH': 'price',
-            'SALES': 'sales',
-            'PRODUCTLINE': 'product_line',
-            'STATUS': 'status',
-            'YEAR_ID': 'year',
-            'MONTH_ID': 'month'
-        }
-        df = df.rename(columns=rename_map)
-
-        # Basic Cleanup
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        df = df.dropna(subset=['date'])
-        df = df.sort_values('date')
-        
-        # Ensure fallback for missing columns
-        required = ['sales', 'units_sold', 'product_line']
-        for col in required:
-            if col not in df.columns:
-                df[col] = 0 if col != 'product_line' else 'Unknown'
-
-        return df
+        return get_storage().read(csv_path, _read_sales_csv, columns)
     except Exception as e:
         print(f"Error in data_handler: {e}")
         traceback.print_exc()
         return create_fallback_df()
 
+def _read_sales_csv(csv_path: str):
+    # Try various encodings if default fails
+    df = None
+    for enc in ['utf-8', 'ISO-8859-1', 'cp1252']:
+        try:
+            df = pd.read_csv(csv_path, encoding=enc)
+            break
+        except:
+            continue
+    
+    if df is None:
+        raise ValueError(f"Could not read CSV {csv_path} with any common encoding.")
+    return _clean_sales_frame(df)
+
+def _clean_sales_frame(df: pd.DataFrame):
+    # Standardize matching
+    df = df.rename(columns=RENAME_MAP)
+
+    # Basic Cleanup
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df.dropna(subset=['date'])
+    df = df.sort_values('date')
+    
+    # Ensure fallback for missing columns
+    required = ['sales', 'units_sold', 'product_line']
+    for col in required:
+        if col not in df.columns:
+            df[col] = 0 if col != 'product_line' else 'Unknown'
+
+    return df
+
 def create_fallback_df():
     """Returns a minimal empty DataFrame with correct columns"""
-    return pd.DataFrame(columns=['date', 'units_sold', 'price', 'sales', 'product_line', 'status', 'year', 'month'])
+    return pd.DataFrame(columns=ANALYTICS_COLUMNS)
 
 def get_product_insights(df: pd.DataFrame, product_line: str):
     if product_line and product_line != "All Products":
         return df[df['product_line'] == product_line].copy()
     return df.copy()
 
+@timed("compute.aggregate_by_period")
 def aggregate_by_period(df: pd.DataFrame, period: str = 'ME'):
     if df.empty:
         return pd.DataFrame(columns=['sales', 'units_sold'])
@@ -73,3 +92,150 @@ def aggregate_by_period(df: pd.DataFrame, period: str = 'ME'):
         return pd.DataFrame(columns=['sales', 'units_sold'])
 
     return df_indexed[numeric_cols].resample(period).sum().fillna(0)
+
+# --- APPEND DETECTION ---
+
+def file_marker(csv_path: str, probe: int = 4096):
+    """(size, digest of the last `probe` bytes): identifies what a reader has seen of the file."""
+    with open(csv_path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - probe)
+        f.seek(start)
+        return size, hashlib.blake2b(f.read(size - start), digest_size=16).hexdigest()
+
+def read_appended_rows(csv_path: str, marker, probe: int = 4096):
+    """
+    Order rows added to the end of `csv_path` since `marker` (from file_marker), cleaned like
+    load_and_preprocess_data. Returns (rows, new_marker), or None when the file was rewritten
+    rather than appended to (the caller then reloads it). A trailing partial line is left
+    for the next read.
+    """
+    size, digest = marker
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        end = f.seek(0, os.SEEK_END)
+        start = max(0, size - probe)
+        f.seek(start)
+        seen = f.read(size - start)
+        if end < size or hashlib.blake2b(seen, digest_size=16).hexdigest() != digest or (size and not seen.endswith(b"\n")):
+            return None
+        tail = f.read(end - size)
+
+    tail = tail[:tail.rfind(b"\n") + 1]
+    if not tail.strip():
+        return create_fallback_df(), marker
+    new_size = size + len(tail)
+    new_marker = (new_size, hashlib.blake2b((seen + tail)[-probe:], digest_size=16).hexdigest())
+    for enc in ['utf-8', 'ISO-8859-1', 'cp1252']:
+        try:
+            df = pd.read_csv(io.BytesIO(header + tail), encoding=enc)
+            break
+        except UnicodeDecodeError:
+            continue
+    return _clean_sales_frame(df), new_marker
+
+# --- STREAMING INGESTION ---
+
+def _detect_encoding(csv_path: str, block_size: int = 1 << 20):
+    """
+    Picks the encoding load_and_preprocess_data would end up with, reading the file
+    in fixed-size blocks: utf-8 if the whole file decodes, else ISO-8859-1 (which never fails).
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(csv_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    decoder.decode(b'', final=True)
+                    return 'utf-8'
+                decoder.decode(block)
+    except UnicodeDecodeError:
+        return 'ISO-8859-1'
+
+def _finalize_periods(acc: pd.DataFrame, period: str):
+    """Fills empty periods with zeros and restores the dtypes resample() would produce."""
+    full = pd.date_range(acc.index.min(), acc.index.max(), freq=period, name='date')
+    out = acc.reindex(full, fill_value=0)
+    out['units_sold'] = out['units_sold'].astype('int64')
+    return out[['sales', 'units_sold']]
+
+def read_order_chunks(csv_path: str, columns: list, chunksize: int = 100_000, encoding: str = None):
+    """
+    Yields an order export `chunksize` rows at a time, cleaned like load_and_preprocess_data
+    (renamed columns, parsed dates, rows without a date dropped, fallbacks for missing
+    sales/units_sold/product_line) and limited to `columns`, without materializing the full
+    frame. Chunks are in file order rather than sorted by date.
+    Args:
+        csv_path: Order export in the sales_data_sample.csv layout.
+        columns: Analytics column names to read (see RENAME_MAP); others are read as named.
+        chunksize: Rows per chunk.
+        encoding: Source encoding; detected the same way as load_and_preprocess_data if omitted.
+    """
+    if not os.path.exists(csv_path):
+        print(f"File not found: {csv_path}. Using empty fallback.")
+        return
+
+    encoding = encoding or _detect_encoding(csv_path)
+    header = pd.read_csv(csv_path, nrows=0, encoding=encoding).columns
+    source_of = {dst: src for src, dst in RENAME_MAP.items()}
+    usecols = [c for c in dict.fromkeys(['ORDERDATE'] + [source_of.get(c, c) for c in columns]) if c in header]
+    if 'ORDERDATE' not in usecols:
+        return
+    dtypes = {'QUANTITYORDERED': 'int64', 'SALES': 'float64', 'PRODUCTLINE': 'str'}
+
+    reader = pd.read_csv(
+        csv_path, usecols=usecols, encoding=encoding, chunksize=chunksize,
+        dtype={c: t for c, t in dtypes.items() if c in usecols}
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns=RENAME_MAP)
+        chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce')
+        chunk = chunk.dropna(subset=['date'])
+        if chunk.empty:
+            continue
+        # Same fallbacks as load_and_preprocess_data for missing columns
+        for col in ('sales', 'units_sold'):
+            if col not in chunk.columns:
+                chunk[col] = 0
+        if 'product_line' not in chunk.columns:
+            chunk['product_line'] = 'Unknown'
+        yield chunk[[c for c in columns if c in chunk.columns]]
+
+def stream_aggregate(csv_path: str, period: str = 'ME', chunksize: int = 100_000, encoding: str = None):
+    """
+    Aggregates an order export by period without materializing the full frame.
+    Reads `chunksize` rows at a time with only the needed columns and folds each chunk
+    into running per-period and per-(product_line, period) sums, so peak memory is bounded
+    by the chunk size plus the number of distinct periods.
+    Args:
+        csv_path: Order export in the sales_data_sample.csv layout.
+        period: Resample alias, as for aggregate_by_period.
+        chunksize: Rows per chunk.
+        encoding: Source encoding; detected the same way as load_and_preprocess_data if omitted.
+    Returns:
+        (totals, by_product): `totals` matches aggregate_by_period(load_and_preprocess_data(csv_path), period)
+        in index, columns and dtypes, with identical units_sold; sales sums can differ in the last
+        bit because chunks are summed in a different order. `by_product` maps each product_line
+        to the same aggregate over that line's orders.
+    """
+    empty = pd.DataFrame(columns=['sales', 'units_sold'])
+    totals = None
+    by_product = None
+    for chunk in read_order_chunks(csv_path, ['date', 'units_sold', 'sales', 'product_line'], chunksize, encoding):
+        grouper = pd.Grouper(key='date', freq=period)
+        part = chunk.groupby(grouper)[['sales', 'units_sold']].sum()
+        part_by_product = chunk.groupby(['product_line', grouper])[['sales', 'units_sold']].sum()
+
+        totals = part if totals is None else totals.add(part, fill_value=0)
+        by_product = part_by_product if by_product is None else by_product.add(part_by_product, fill_value=0)
+
+    if totals is None:
+        return empty, {}
+
+    totals = _finalize_periods(totals, period)
+    products = {
+        line: _finalize_periods(frame.droplevel('product_line'), period)
+        for line, frame in by_product.groupby(level='product_line')
+    }
+    return totals, products
@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def frame_nbytes(df):
+    """
+    Approximate resident size of a DataFrame, object columns included, of any object with
+    `nbytes`, or of a dict of those.
+    """
+    if isinstance(df, dict):
+        return sum(frame_nbytes(v) for v in df.values())
+    if hasattr(df, "nbytes") and not isinstance(df, (pd.DataFrame, pd.Series)):
+        return int(df.nbytes)
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+class _Derived:
+    """A derived value together with the objects it was computed from."""
+    __slots__ = ("sources", "value")
+
+    def __init__(self, sources: tuple, value):
+        self.sources = sources
+        self.value = value
+
+    @property
+    def nbytes(self):
+        # The sources are charged under their own entries
+        return frame_nbytes(self.value)
+
+
+class DatasetCache:
+    """
+    Keeps parsed DataFrames in memory, keyed by file path.
+    A file is re-parsed only when its mtime/size changes on disk or
+    when a write path explicitly invalidates it.
+
+    Entries are charged to an owner (the tenant) and kept in LRU order. When the cache
+    exceeds `max_bytes`, or an owner exceeds `owner_max_bytes`, least recently used frames
+    are evicted (the owner's own first) and simply reload on their next use.
+    """
+
+    def __init__(self, max_bytes: int = None, owner_max_bytes: int = None):
+        self.max_bytes = max_bytes
+        self.owner_max_bytes = owner_max_bytes
+        self._entries = OrderedDict()  # path -> (signature, df, nbytes, owner)
+        self._owner_bytes = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str, loader, signature=None, owner: str = None):
+        """
+        Returns the cached frame for `path`, calling `loader(path)` on a miss.
+        `signature` overrides the file mtime/size check for sources that aren't plain files.
+        `owner` is the tenant the frame's memory is charged to.
+        Callers must treat the returned frame as read-only and `.copy()` it before mutating.
+        """
+        if signature is None:
+            signature = self._signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and signature is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        df = loader(path)
+
+        with self._lock:
+            self._remove(path)
+            if signature is not None:
+                nbytes = frame_nbytes(df)
+                self._entries[path] = (signature, df, nbytes, owner)
+                self.bytes += nbytes
+                self._owner_bytes[owner] = self._owner_bytes.get(owner, 0) + nbytes
+                self._evict(path, owner)
+        return df
+
+    def derived(self, key: str, sources: tuple, build, owner: str = None):
+        """
+        Returns build(), computed from the in-memory `sources` (frames, stores), cached under `key`
+        for as long as the same source objects are passed, and charged to `owner` like a loaded file.
+        The entry keeps its sources alive, so their ids can't be reused while it is cached.
+        """
+        signature = tuple(id(source) for source in sources)
+        entry = self.get(key, lambda _: _Derived(sources, build()), signature=signature, owner=owner)
+        return entry.value
+
+    def peek(self, path: str):
+        """The cached value for `path` whatever its signature (None when absent), for loaders that update incrementally."""
+        with self._lock:
+            entry = self._entries.get(path)
+            return None if entry is None else entry[1]
+
+    def _remove(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        nbytes, owner = entry[2], entry[3]
+        self.bytes -= nbytes
+        remaining = self._owner_bytes.get(owner, 0) - nbytes
+        if remaining > 0:
+            self._owner_bytes[owner] = remaining
+        else:
+            self._owner_bytes.pop(owner, None)
+
+    def _evict(self, keep: str, owner: str):
+        # Owner over its own budget: drop its coldest frames first
+        if self.owner_max_bytes is not None:
+            for path in [p for p, e in self._entries.items() if e[3] == owner and p != keep]:
+                if self._owner_bytes.get(owner, 0) <= self.owner_max_bytes:
+                    break
+                self._remove(path)
+                self.evictions += 1
+        # Whole cache over budget: drop the coldest frames of any owner
+        if self.max_bytes is not None:
+            for path in [p for p in self._entries if p != keep]:
+                if self.bytes <= self.max_bytes:
+                    break
+                self._remove(path)
+                self.evictions += 1
+
+    def version(self, paths):
+        """Hashable data version for a set of files: changes whenever any of them is rewritten."""
+        return tuple(self._signature(path) for path in paths)
+
+    def invalidate(self, path: str = None):
+        """Drops one cached file, or everything when no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._owner_bytes.clear()
+                self.bytes = 0
+            else:
+                self._remove(path)
+
+    def owner_stats(self, owner: str):
+        with self._lock:
+            return {
+                "entries": sum(1 for e in self._entries.values() if e[3] == owner),
+                "bytes": self._owner_bytes.get(owner, 0),
+                "max_bytes": self.owner_max_bytes
+            }
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "owners": len(self._owner_bytes),
+                "evictions": self.evictions
+            }
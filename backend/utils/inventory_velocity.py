@@ -0,0 +1,184 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Window the reported velocity (units/day) comes from
+VELOCITY_WINDOW = int(os.environ.get("INVENTORY_VELOCITY_DAYS", 90))
+# Rolling windows (days) kept per product, ending at the latest order date
+WINDOWS = tuple(sorted({30, 90, 365, VELOCITY_WINDOW}))
+# Supplier lead time and service-level z-score (1.65 ~ 95%) for reorder points
+LEAD_TIME_DAYS = float(os.environ.get("INVENTORY_LEAD_TIME_DAYS", 14))
+SERVICE_LEVEL_Z = float(os.environ.get("INVENTORY_SERVICE_Z", 1.65))
+# Days of cover reported for products without sales in the window
+MAX_DAYS_OF_COVER = 999
+# Columns read from the order file
+SOURCE_COLUMNS = ['date', 'product_line', 'units_sold']
+
+_DAY_SHIFT = 32
+
+
+class VelocityStore:
+    """
+    Order-driven sales rates per product line. Daily unit totals are kept per (day, product)
+    in one sorted key array, and for each rolling window in WINDOWS the per-product sum of
+    units and of squared daily units over the days ending at the latest order date.
+
+    append() folds new order lines in: it touches only the new (day, product) cells and the
+    days that fall out of the windows as the latest date moves forward, and returns a new
+    store (readers of the old one are unaffected). metrics() turns the window sums into
+    velocity, days of cover and reorder points for every SKU in one vectorized pass.
+    """
+
+    def __init__(self):
+        self.products = pd.Index([], dtype=object)
+        self.keys = np.array([], dtype=np.int64)      # day << 32 | product position, sorted
+        self.units = np.array([], dtype=np.float64)   # units per key
+        self.as_of = None                              # latest order day (days since epoch)
+        self.sums = {w: np.zeros(0) for w in WINDOWS}
+        self.squares = {w: np.zeros(0) for w in WINDOWS}
+        self.rows = 0
+        self.source = None  # file_marker of the order file this store reflects
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source=None):
+        return cls().append(df, source)
+
+    @classmethod
+    def from_chunks(cls, chunks, source=None):
+        """Builds the store one frame of order rows at a time (e.g. data_handler.read_order_chunks)."""
+        store = cls()
+        for chunk in chunks:
+            store = store.append(chunk)
+        store.source = source
+        return store
+
+    def append(self, df: pd.DataFrame, source=None):
+        """New store with the order rows in `df` (load_and_preprocess_data layout) folded in."""
+        store = VelocityStore()
+        store.source = source
+        df = df.dropna(subset=['date']) if not df.empty else df
+        if df.empty:
+            # Nothing new: share this store's arrays
+            store.products, store.keys, store.units, store.as_of = self.products, self.keys, self.units, self.as_of
+            store.sums, store.squares, store.rows = self.sums, self.squares, self.rows
+            return store
+
+        # Hash the names once per distinct line, not per order row
+        codes, lines = pd.factorize(df['product_line'].fillna('Unknown').astype(str))
+        lines = pd.Index(np.asarray(lines, dtype=object))
+        products = self._extend_products(lines)
+        position = products.get_indexer(lines).astype(np.int64)[codes]
+        day = df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        units = pd.to_numeric(df['units_sold'], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+        # Batch daily totals per (day, product)
+        batch_keys, inverse = np.unique((day << _DAY_SHIFT) | position, return_inverse=True)
+        added = np.bincount(inverse.ravel(), weights=units, minlength=len(batch_keys))
+
+        # Merge into the sorted key array
+        at = np.searchsorted(self.keys, batch_keys)
+        exists = at < len(self.keys)
+        exists[exists] = self.keys[at[exists]] == batch_keys[exists]
+        before = np.zeros(len(batch_keys))
+        before[exists] = self.units[at[exists]]
+        after = before + added
+        units_all = self.units.copy()
+        units_all[at[exists]] = after[exists]
+        store.keys = np.insert(self.keys, at[~exists], batch_keys[~exists])
+        store.units = np.insert(units_all, at[~exists], after[~exists])
+
+        batch_day = batch_keys >> _DAY_SHIFT
+        batch_pos = batch_keys & ((1 << _DAY_SHIFT) - 1)
+        as_of = int(batch_day.max()) if self.as_of is None else max(self.as_of, int(batch_day.max()))
+        n = len(products)
+        for w in WINDOWS:
+            sums = np.zeros(n)
+            squares = np.zeros(n)
+            sums[:len(self.sums[w])] = self.sums[w]
+            squares[:len(self.squares[w])] = self.squares[w]
+            if self.as_of is not None and as_of > self.as_of:
+                # Days leaving the window as the latest date moves from self.as_of to as_of
+                lo, hi = self.as_of - w, min(as_of - w, self.as_of)
+                start, stop = np.searchsorted(self.keys, [(lo + 1) << _DAY_SHIFT, (hi + 1) << _DAY_SHIFT])
+                if stop > start:
+                    pos = self.keys[start:stop] & ((1 << _DAY_SHIFT) - 1)
+                    old = self.units[start:stop]
+                    sums -= np.bincount(pos, weights=old, minlength=n)
+                    squares -= np.bincount(pos, weights=old * old, minlength=n)
+            # Changed cells inside the new window
+            inside = batch_day > as_of - w
+            sums += np.bincount(batch_pos[inside], weights=(after - before)[inside], minlength=n)
+            squares += np.bincount(batch_pos[inside], weights=(after * after - before * before)[inside], minlength=n)
+            store.sums[w] = sums
+            store.squares[w] = squares
+
+        store.products = products
+        store.as_of = as_of
+        store.rows = self.rows + len(df)
+        return store
+
+    def _extend_products(self, lines: pd.Index):
+        new = lines[self.products.get_indexer(lines) < 0]
+        return self.products.append(new) if len(new) else self.products
+
+    def metrics(self, names, stock, window: int = VELOCITY_WINDOW, lead_time: float = LEAD_TIME_DAYS,
+                z: float = SERVICE_LEVEL_Z):
+        """
+        Vectorized inventory metrics for `names` with on-hand `stock`:
+        velocity (units/day over `window`), days of cover (stock / velocity, MAX_DAYS_OF_COVER
+        without sales), reorder point (lead-time demand + z * daily std * sqrt(lead time)) and
+        whether stock is at or below that point. Products without orders have velocity 0 and
+        are never due.
+        """
+        stock = np.asarray(stock, dtype=float)
+        position = self.products.get_indexer(pd.Index(names, dtype=object))
+        known = position >= 0
+        total = np.where(known, self.sums[window][position], 0.0) if len(self.products) else np.zeros(len(stock))
+        square = np.where(known, self.squares[window][position], 0.0) if len(self.products) else np.zeros(len(stock))
+        # Running sums can drift a hair below zero after many subtractions
+        velocity = np.maximum(total, 0.0) / window
+        variance = np.maximum(square / window - velocity * velocity, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cover = np.where(velocity > 0, np.floor(stock / velocity), MAX_DAYS_OF_COVER)
+        reorder = np.ceil(velocity * lead_time + z * np.sqrt(variance) * np.sqrt(lead_time))
+        return {
+            "velocity": np.round(velocity, 2),
+            "days_remaining": np.clip(cover, 0, MAX_DAYS_OF_COVER).astype(np.int64),
+            "reorder_point": reorder.astype(np.int64),
+            "reorder_due": (reorder > 0) & (stock <= reorder)
+        }
+
+    def for_inventory(self, inventory: pd.DataFrame):
+        """metrics() for every row of an inventory frame."""
+        if inventory.empty:
+            return self.metrics([], [])
+        return self.metrics(inventory['product_name'].tolist(), inventory['stock'].to_numpy())
+
+    def to_shared(self):
+        """(arrays, JSON metadata) for SharedSnapshots.publish_state."""
+        arrays = {"keys": self.keys, "units": self.units}
+        for w in WINDOWS:
+            arrays[f"sums.{w}"], arrays[f"squares.{w}"] = self.sums[w], self.squares[w]
+        meta = {"products": self.products.tolist(), "as_of": self.as_of, "rows": self.rows, "source": self.source}
+        return arrays, meta
+
+    @classmethod
+    def from_shared(cls, arrays: dict, meta: dict):
+        """Store over arrays published by another process (read-only; append() never writes to them)."""
+        store = cls()
+        store.products = pd.Index(meta["products"], dtype=object)
+        store.keys, store.units = arrays["keys"], arrays["units"]
+        store.sums = {w: arrays[f"sums.{w}"] for w in WINDOWS}
+        store.squares = {w: arrays[f"squares.{w}"] for w in WINDOWS}
+        store.as_of, store.rows, store.source = meta["as_of"], meta["rows"], meta["source"]
+        return store
+
+    @property
+    def nbytes(self):
+        windows = sum(a.nbytes for a in self.sums.values()) + sum(a.nbytes for a in self.squares.values())
+        return self.keys.nbytes + self.units.nbytes + windows + int(self.products.memory_usage(deep=True))
+
+    def stats(self):
+        as_of = None if self.as_of is None else str(np.datetime64(self.as_of, 'D'))
+        return {"rows": self.rows, "products": len(self.products), "cells": len(self.keys), "as_of": as_of}
@@ -0,0 +1,161 @@
+import asyncio
+from collections import deque
+
+from utils.responses import dumps
+
+
+class Subscriber:
+    def __init__(self, max_pending: int):
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = False
+
+
+class Channel:
+    def __init__(self, history: int):
+        self.seq = 0
+        self.history = deque(maxlen=history)  # (seq, event, body)
+        self.subscribers = set()
+
+
+class ChangeFeed:
+    """
+    Fans change events out to server-sent-event subscribers, one channel per tenant.
+    Every event gets a per-channel sequence number and the last `history` events are kept,
+    so a client reconnecting with Last-Event-ID replays what it missed instead of
+    refetching the dashboard. A subscriber that falls `max_pending` events behind is
+    dropped and told to refetch.
+    All state is touched from the event loop thread only; worker threads use notify().
+    """
+
+    def __init__(self, history: int = 256, max_pending: int = 64):
+        self.history = history
+        self.max_pending = max_pending
+        self._channels = {}
+        self._loop = None
+        self._wake = None
+        self.published = 0
+        self.dropped = 0
+
+    def start(self, loop):
+        self._loop = loop
+        self._wake = asyncio.Event()
+
+    def notify(self):
+        """Asks the change watcher to check for new data now; safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def wait(self, timeout: float):
+        """Sleeps up to `timeout` seconds, returning early after notify()."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def _channel(self, name: str):
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = Channel(self.history)
+        return channel
+
+    def active_channels(self):
+        """Channels with at least one subscriber."""
+        return [name for name, channel in self._channels.items() if channel.subscribers]
+
+    def publish(self, channel_name: str, event: str, data):
+        channel = self._channel(channel_name)
+        channel.seq += 1
+        message = (channel.seq, event, dumps(data))
+        channel.history.append(message)
+        self.published += 1
+        for sub in list(channel.subscribers):
+            try:
+                sub.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                sub.dropped = True
+                channel.subscribers.discard(sub)
+                self.dropped += 1
+
+    @staticmethod
+    def _backlog(channel: Channel, last_event_id: str = None):
+        """Events after `last_event_id`, or None when they are no longer in the history."""
+        if not last_event_id:
+            return []
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return None
+        if last >= channel.seq:
+            return []
+        if not channel.history or channel.history[0][0] > last + 1:
+            return None
+        return [m for m in channel.history if m[0] > last]
+
+    @staticmethod
+    def _format(seq: int, event: str, body: bytes):
+        return f"id: {seq}\nevent: {event}\n".encode() + b"data: " + body + b"\n\n"
+
+    async def stream(self, request, channel_name: str, last_event_id: str = None, heartbeat: float = 15.0):
+        """SSE byte stream for one client: a ready/reset event, any missed events, then live ones."""
+        channel = self._channel(channel_name)
+        sub = Subscriber(self.max_pending)
+        channel.subscribers.add(sub)
+        try:
+            yield b"retry: 3000\n\n"
+            backlog = self._backlog(channel, last_event_id)
+            if backlog is None:
+                yield self._format(channel.seq, "reset", b"{}")
+            else:
+                # The ready id is the last event the client has, so a drop mid-replay resumes correctly
+                ready_id = backlog[0][0] - 1 if backlog else channel.seq
+                yield self._format(ready_id, "ready", dumps({"seq": ready_id}))
+                for message in backlog:
+                    yield self._format(*message)
+            while not sub.dropped:
+                if await request.is_disconnected():
+                    return
+                try:
+                    message = await asyncio.wait_for(sub.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield self._format(*message)
+            # Fell too far behind: the client should refetch and resubscribe
+            yield self._format(channel.seq, "reset", b"{}")
+        finally:
+            channel.subscribers.discard(sub)
+
+    def stats(self):
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+
+def diff_rows(old, new, key: str, ignore=()):
+    """
+    Row-level diff of two record lists keyed by `key`.
+    Returns {"changed": rows new or different in `new`, "removed": keys missing from `new`}.
+    """
+    def comparable(row):
+        return {k: v for k, v in row.items() if k not in ignore}
+    before = {row[key]: comparable(row) for row in old}
+    changed = [row for row in new if before.get(row[key]) != comparable(row)]
+    current = {row[key] for row in new}
+    removed = [k for k in before if k not in current]
+    return {"changed": changed, "removed": removed}
+
+
+def diff_items(old, new):
+    """Set-style diff of two lists of flat dicts: {"added": [...], "removed": [...]}, order kept."""
+    def identity(item):
+        return tuple(sorted(item.items()))
+    old_ids = {identity(item) for item in old}
+    new_ids = {identity(item) for item in new}
+    return {
+        "added": [item for item in new if identity(item) not in old_ids],
+        "removed": [item for item in old if identity(item) not in new_ids]
+    }
@@ -0,0 +1,91 @@
+import base64
+import json
+import numpy as np
+import pandas as pd
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidQuery(ValueError):
+    """Raised for a malformed cursor, field list or filter; the API answers 400."""
+
+
+def encode_cursor(offset: int):
+    """Opaque cursor for the row after `offset` rows of a filtered listing."""
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str = None):
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode()))["o"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidQuery("Invalid cursor")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidQuery("Invalid cursor")
+    return offset
+
+
+def parse_fields(fields: str, allowed):
+    """Comma-separated field list -> list of names (None means all fields)."""
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in allowed]
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}")
+    return names
+
+
+def parse_date(value: str, name: str):
+    if not value:
+        return None
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise InvalidQuery(f"Invalid {name} date: {value}")
+
+
+def prefix_mask(names, prefix: str = None):
+    """Case-insensitive product-name prefix filter over an array of names."""
+    names = pd.Series(names, dtype=object)
+    if not prefix:
+        return np.ones(len(names), dtype=bool)
+    return names.str.lower().str.startswith(prefix.lower()).to_numpy(dtype=bool)
+
+
+class Page:
+    """
+    One page of a filtered listing: `start:stop` into the `total` matching rows.
+    With neither cursor nor limit it covers every match, as the unpaged endpoints did.
+    A cursor, when given, takes precedence over a plain `offset`.
+    """
+
+    def __init__(self, total: int, cursor: str = None, limit: int = None, offset: int = 0):
+        self.total = total
+        self.start = min(decode_cursor(cursor) if cursor else offset, total)
+        self.stop = total if limit is None else min(self.start + limit, total)
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.stop) if self.stop < self.total else None
+
+    def headers(self):
+        headers = {"X-Total-Count": str(self.total)}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        return headers
+
+
+def records(columns: dict, fields=None):
+    """
+    Column dict (already cut to the page) -> list of row dicts with only `fields`.
+    Each column is converted to Python values in one tolist() call instead of per cell.
+    """
+    if fields is not None:
+        columns = {name: columns[name] for name in fields}
+    names = list(columns)
+    values = [np.asarray(col).tolist() for col in columns.values()]
+    return [dict(zip(names, row)) for row in zip(*values)]
@@ -0,0 +1,315 @@
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Stage totals (name -> seconds) of the request being served, for its Server-Timing header
+_request_stages = ContextVar("request_stages", default=None)
+# cProfile session of the request being served, when it asked for ?profile=
+_profile_session = ContextVar("profile_session", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus exposes it."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q-quantile (None when empty or past the last bucket)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe_stage(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class Metrics:
+    """
+    Per-endpoint request latency and per-stage timings (load/compute/serialize), rendered in
+    the Prometheus text format. Stages nest: an endpoint's compute stage includes the loads it
+    triggers. With `enabled` off, stage timers and the middleware pass straight through.
+    Counters are per process; with several workers each one reports its own.
+    """
+
+    def __init__(self, enabled: bool = True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._requests = {}  # (method, route, status) -> Histogram
+        self._stages = {}    # stage name -> Histogram
+        self._lock = threading.Lock()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, status)
+        with self._lock:
+            hist = self._requests.get(key)
+            if hist is None:
+                hist = self._requests[key] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def observe_stage(self, name: str, seconds: float):
+        with self._lock:
+            hist = self._stages.get(name)
+            if hist is None:
+                hist = self._stages[name] = Histogram(self.buckets)
+            hist.observe(seconds)
+        totals = _request_stages.get()
+        if totals is not None:
+            totals[name] = totals.get(name, 0.0) + seconds
+
+    def stage(self, name: str):
+        """Context manager timing one named stage."""
+        return _Stage(self, name) if self.enabled else _NO_STAGE
+
+    def timed(self, name: str):
+        """Decorator timing every call of a function as stage `name`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe_stage(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._stages.clear()
+
+    def summary(self):
+        """Request and stage counts with approximate p50/p95 (bucket upper bounds), in ms."""
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        with self._lock:
+            requests = {f"{m} {r} {s}": h for (m, r, s), h in self._requests.items()}
+            stages = dict(self._stages)
+        return {
+            group: {name: {"count": h.count, "mean_ms": ms(h.sum / h.count), "p50_ms": ms(h.quantile(0.5)),
+                           "p95_ms": ms(h.quantile(0.95))} for name, h in sorted(hists.items())}
+            for group, hists in (("requests", requests), ("stages", stages))
+        }
+
+    def render(self, gauges: dict = None):
+        """
+        Prometheus text exposition of the request and stage histograms.
+        `gauges` adds point-in-time values: name -> (help, value).
+        """
+        lines = []
+
+        def histogram(name: str, help_text: str, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, n in zip((*hist.buckets, "+Inf"), hist.counts):
+                    cumulative += n
+                    le = bound if bound == "+Inf" else repr(float(bound))
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            requests = [(f'method="{_escape(m)}",route="{_escape(r)}",status="{s}"', h)
+                        for (m, r, s), h in sorted(self._requests.items())]
+            stages = [(f'stage="{_escape(name)}"', h) for name, h in sorted(self._stages.items())]
+            histogram("api_request_duration_seconds", "HTTP request latency by route and status.", requests)
+            histogram("api_stage_duration_seconds", "Time spent in named load/compute/serialize stages.", stages)
+
+        for name, (help_text, value) in (gauges or {}).items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {float(value or 0)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ProfileSession:
+    """
+    cProfile profiles of one request. The event loop thread and every work pool call the
+    request makes get their own profiler (cProfile is per thread), merged at the end.
+    """
+
+    def __init__(self):
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def new_profile(self):
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profile)
+        return profile
+
+    def stats(self):
+        with self._lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def text(self, sort: str = "cumulative", limit: int = 40):
+        out = io.StringIO()
+        stats = self.stats()
+        stats.stream = out
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self):
+        """Binary pstats dump, loadable with pstats.Stats(path) or snakeviz."""
+        return marshal.dumps(self.stats().stats)
+
+
+def call(fn, *args):
+    """Runs fn(*args), profiled when the current request is being profiled."""
+    session = _profile_session.get()
+    if session is None:
+        return fn(*args)
+    profile = session.new_profile()
+    profile.enable()
+    try:
+        return fn(*args)
+    finally:
+        profile.disable()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware recording each request's latency by route template and status, and
+    adding a Server-Timing header with the request's stage totals.
+
+    When `allow_profile` is set, a request with ?profile=1 (or profile=text) is run under
+    cProfile and answered with the top of the pstats report instead of its normal body;
+    ?profile=pstats returns the binary pstats dump. The profile also catches other requests
+    the event loop serves meanwhile, so profile on an otherwise idle server.
+    """
+
+    def __init__(self, app, metrics: Metrics, allow_profile: bool = False):
+        self.app = app
+        self.metrics = metrics
+        self.allow_profile = allow_profile
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.enabled:
+            return await self.app(scope, receive, send)
+
+        if self.allow_profile and b"profile=" in scope.get("query_string", b""):
+            mode = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[0]
+            if mode in ("1", "text", "pstats"):
+                return await self._profile(scope, receive, send, mode)
+
+        start = time.perf_counter()
+        stages = {}
+        token = _request_stages.set(stages)
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages.items())
+                timing += f"{', ' if timing else ''}total;dur={(time.perf_counter() - start) * 1000:.2f}"
+                message = dict(message, headers=[*message.get("headers", []), (b"server-timing", timing.encode())])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _request_stages.reset(token)
+            route = scope.get("route")
+            self.metrics.observe_request(scope["method"], getattr(route, "path", "unmatched"), status,
+                                         time.perf_counter() - start)
+
+    async def _profile(self, scope, receive, send, mode: str):
+        session = ProfileSession()
+        token = _profile_session.set(session)
+        status = None
+
+        async def capture(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profile = session.new_profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profile.disable()
+            _profile_session.reset(token)
+        elapsed = time.perf_counter() - start
+
+        if mode == "pstats":
+            body, content_type = session.dump(), b"application/octet-stream"
+        else:
+            header = f"{scope['method']} {scope['path']} -> {status} in {elapsed * 1000:.2f} ms\n\n"
+            body, content_type = (header + session.text()).encode(), b"text/plain; charset=utf-8"
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()),
+                                (b"cache-control", b"no-store")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+# Process-wide registry: stage timers in models/ and utils/ report here
+metrics = Metrics(enabled=os.environ.get("METRICS", "1") != "0")
+stage = metrics.stage
+timed = metrics.timed
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from fastapi.responses import JSONResponse, Response
+
+from utils.profiling import stage
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content):
+    """JSON bytes for API payloads. NumPy arrays and scalars serialize directly."""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, allow_nan=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() (orjson when installed)."""
+
+    def render(self, content):
+        with stage("serialize"):
+            return dumps(content)
+
+
+class EncodedBody:
+    """A serialized response body with its ETag; compressed variants are built on first use."""
+
+    def __init__(self, body: bytes, headers=None):
+        self.body = body
+        self.headers = headers or {}
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self._encoded = {}
+
+    def encoded(self, encoding: str):
+        if encoding not in self._encoded:
+            with stage("compress"):
+                if encoding == "br":
+                    self._encoded[encoding] = brotli.compress(self.body, quality=5)
+                else:
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+        return self._encoded[encoding]
+
+
+def _accepted_encoding(accept_encoding: str):
+    accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+    if HAS_BROTLI and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _etag_matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def encoded_response(request, entry: EncodedBody):
+    """
+    Response for a cached body: 304 when the client's If-None-Match already has it,
+    otherwise the body, gzip/brotli-compressed when the client accepts it.
+    """
+    headers = {"ETag": entry.etag, "Vary": "Accept-Encoding", **entry.headers}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    encoding = _accepted_encoding(request.headers.get("accept-encoding", ""))
+    if encoding and len(entry.body) >= MIN_COMPRESS_SIZE:
+        headers["Content-Encoding"] = encoding
+        return Response(entry.encoded(encoding), media_type="application/json", headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    LRU of encoded response bodies keyed by request and tagged with the data version they
+    were built from. A hit skips building, casting and serializing the payload entirely;
+    any version change makes the entry miss and it is rebuilt on the next request.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (version, EncodedBody)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, compute):
+        """
+        Returns the EncodedBody for `key` at `version`, calling `compute()` on a miss.
+        `compute` returns the payload, or a (payload, headers) pair.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = compute()
+        content, headers = result if isinstance(result, tuple) else (result, None)
+        with stage("serialize"):
+            encoded = EncodedBody(dumps(content), headers)
+        with self._lock:
+            self._entries[key] = (version, encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return encoded
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,318 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.paging import InvalidQuery
+from utils.profiling import timed
+
+# Cube dimension -> column in the load_and_preprocess_data frame
+DIMENSIONS = {
+    "product_line": "product_line",
+    "country": "COUNTRY",
+    "territory": "TERRITORY",
+    "deal_size": "DEALSIZE",
+    "customer": "CUSTOMERNAME",
+    "status": "status",
+    "year": "year",
+    "quarter": "QTR_ID",
+    "month": "month",
+}
+MEASURES = ("sales", "units", "order_lines")
+# Columns to read from the order file
+SOURCE_COLUMNS = list(DIMENSIONS.values()) + ["sales", "units_sold"]
+
+
+def _code_dtype(n_labels: int):
+    """Smallest unsigned integer type that can hold codes 0..n_labels-1."""
+    return np.min_scalar_type(max(n_labels - 1, 0))
+
+
+def _group(codes, sizes, weights: dict, mask=None):
+    """
+    Groups rows by the code columns in `codes` and sums each weight array per group.
+    Returns (group codes per column, summed weights), groups in lexicographic code order.
+    """
+    if mask is not None:
+        codes = [c[mask] for c in codes]
+        weights = {name: w[mask] for name, w in weights.items()}
+    n = len(next(iter(weights.values())))
+    if not codes:
+        return [], {name: np.array([w.sum()]) for name, w in weights.items()}
+    if n == 0:
+        return [np.array([], dtype=c.dtype) for c in codes], {name: w[:0] for name, w in weights.items()}
+
+    if np.prod([float(s) for s in sizes]) < 2 ** 62:
+        # One int64 key per row: the mixed-radix number formed by the codes
+        key = np.ravel_multi_index([c.astype(np.int64) for c in codes], sizes)
+        cells, inverse = np.unique(key, return_inverse=True)
+        cell_codes = [u.astype(c.dtype) for u, c in zip(np.unravel_index(cells, sizes), codes)]
+    else:
+        stacked = np.stack([c.astype(np.int64) for c in codes], axis=1)
+        cells, inverse = np.unique(stacked, axis=0, return_inverse=True)
+        cell_codes = [cells[:, i].astype(c.dtype) for i, c in enumerate(codes)]
+    inverse = inverse.ravel()
+
+    sums = {}
+    for name, w in weights.items():
+        total = np.bincount(inverse, weights=w, minlength=len(cell_codes[0]))
+        sums[name] = total.astype(w.dtype) if np.issubdtype(w.dtype, np.integer) else total
+    return cell_codes, sums
+
+
+def _cells(df: pd.DataFrame):
+    """Order rows -> one row per order line with the dimension labels and the measures."""
+    cells = {}
+    for dim, column in DIMENSIONS.items():
+        if column in df.columns:
+            values = df[column]
+            if dim == "territory":
+                # pandas reads the export's "NA" (North America) territory as missing
+                values = values.fillna("NA")
+            cells[dim] = values.fillna("Unknown")
+        else:
+            cells[dim] = pd.Series("Unknown", index=df.index)
+
+    def measure(column, dtype):
+        if column not in df.columns:
+            return np.zeros(len(df), dtype=dtype)
+        return pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=dtype)
+
+    cells["sales"] = measure("sales", np.float64)
+    cells["units"] = measure("units_sold", np.int64)
+    cells["order_lines"] = np.ones(len(df), dtype=np.int64)
+    return pd.DataFrame(cells, index=df.index)
+
+
+class Cuboid:
+    """Measures grouped by one set of dimensions: one entry per non-empty cell."""
+
+    def __init__(self, dims, codes: dict, measures: dict):
+        self.dims = tuple(dims)
+        self.codes = codes        # dim -> code array (n_cells,)
+        self.measures = measures  # measure -> array (n_cells,)
+
+    @property
+    def n_cells(self):
+        return len(self.measures["order_lines"])
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.codes.values()) + sum(a.nbytes for a in self.measures.values())
+
+    def rollup(self, dims, sizes: dict, mask=None):
+        """Aggregates this cuboid up to `dims` (a subset of its own), over the cells in `mask`."""
+        cell_codes, sums = _group([self.codes[d] for d in dims], [sizes[d] for d in dims], self.measures, mask)
+        return Cuboid(dims, dict(zip(dims, cell_codes)), sums)
+
+
+class RollupCube:
+    """
+    Pre-aggregated sales cube over the order lines. Dimension values are integer-coded
+    (sorted labels, smallest unsigned dtype) and measures are summed per cell.
+
+    The base cuboid holds every dimension. At build time, every cuboid of one or two
+    dimensions is materialized. So is the cuboid without the highest-cardinality
+    dimension, which is usually far smaller than the base. A query is answered from the
+    smallest materialized cuboid that covers its group-by and filter dimensions. Cuboids
+    computed for queries are kept in a small LRU, so repeated drill-downs are also served
+    from pre-aggregates and never from the order lines.
+    """
+
+    def __init__(self, labels: dict, base: Cuboid, rows: int, max_cuboids: int = 64, materialized: list = None):
+        """`materialized`: the other precomputed cuboids, when already built (e.g. by another process)."""
+        self.labels = labels  # dim -> array of labels, code i -> labels[i]
+        self.sizes = {d: max(len(v), 1) for d, v in labels.items()}
+        self.rows = rows
+        self.max_cuboids = max_cuboids
+        self._lookup = {d: {str(v): i for i, v in enumerate(values)} for d, values in labels.items()}
+        self._materialized = {frozenset(base.dims): base}
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        if materialized is None:
+            self._precompute()
+        else:
+            self._materialized.update((frozenset(c.dims), c) for c in materialized)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, max_cuboids: int = 64):
+        """Builds the cube from order rows in the load_and_preprocess_data layout."""
+        return cls._from_cells(_cells(df), max_cuboids)
+
+    @classmethod
+    def from_chunks(cls, chunks, max_cuboids: int = 64, compact_cells: int = 1_000_000):
+        """
+        Builds the cube one frame of order rows at a time (e.g. data_handler.read_order_chunks).
+        Each chunk is reduced to its cells right away, and the pending cells are merged
+        whenever they exceed `compact_cells`, so peak memory follows the chunk size and the
+        number of base cells rather than the order count.
+        """
+        dims = list(DIMENSIONS)
+        pending, size = [], 0
+        for chunk in chunks:
+            part = _cells(chunk).groupby(dims, sort=False).sum().reset_index()
+            pending.append(part)
+            size += len(part)
+            if size > compact_cells and len(pending) > 1:
+                pending = [pd.concat(pending).groupby(dims, sort=False).sum().reset_index()]
+                size = len(pending[0])
+        if not pending:
+            return cls.from_frame(pd.DataFrame(columns=SOURCE_COLUMNS), max_cuboids)
+        return cls._from_cells(pd.concat(pending).groupby(dims, sort=False).sum().reset_index(), max_cuboids)
+
+    @classmethod
+    def _from_cells(cls, cells: pd.DataFrame, max_cuboids: int):
+        labels, codes = {}, {}
+        for dim in DIMENSIONS:
+            row_codes, uniques = pd.factorize(cells[dim], sort=True)
+            labels[dim] = np.asarray(uniques)
+            codes[dim] = row_codes.astype(_code_dtype(len(uniques)))
+        weights = {m: cells[m].to_numpy() for m in MEASURES}
+        dims = list(DIMENSIONS)
+        sizes = {d: max(len(labels[d]), 1) for d in dims}
+        cell_codes, sums = _group([codes[d] for d in dims], [sizes[d] for d in dims], weights)
+        return cls(labels, Cuboid(dims, dict(zip(dims, cell_codes)), sums), int(weights["order_lines"].sum()), max_cuboids)
+
+    def _precompute(self):
+        dims = list(DIMENSIONS)
+        widest = max(dims, key=lambda d: self.sizes[d])
+        plan = [tuple(d for d in dims if d != widest)]
+        plan += list(itertools.combinations(dims, 2)) + [(d,) for d in dims]
+        for group in plan:
+            self._materialized[frozenset(group)] = self._source(frozenset(group)).rollup(group, self.sizes)
+
+    def _source(self, needed: frozenset):
+        """Smallest materialized (or memoized) cuboid containing all `needed` dimensions."""
+        candidates = [c for key, c in self._materialized.items() if needed <= key]
+        with self._lock:
+            candidates += [c for key, c in self._memo.items() if needed <= key]
+        return min(candidates, key=lambda c: c.n_cells)
+
+    def cuboid(self, dims):
+        """Cuboid grouped by `dims`, from the materialized set or computed once and memoized."""
+        key = frozenset(dims)
+        cuboid = self._materialized.get(key)
+        if cuboid is not None:
+            return cuboid
+        with self._lock:
+            cuboid = self._memo.get(key)
+            if cuboid is not None:
+                self._memo.move_to_end(key)
+                return cuboid
+        cuboid = self._source(key).rollup(tuple(d for d in DIMENSIONS if d in key), self.sizes)
+        with self._lock:
+            self._memo[key] = cuboid
+            while len(self._memo) > self.max_cuboids:
+                self._memo.popitem(last=False)
+        return cuboid
+
+    def to_shared(self):
+        """(arrays, JSON metadata) for SharedSnapshots.publish_state: the labels and materialized cuboids."""
+        arrays, cuboids = {}, []
+        for i, cuboid in enumerate(self._materialized.values()):
+            cuboids.append(list(cuboid.dims))
+            arrays.update((f"{i}.code.{d}", codes) for d, codes in cuboid.codes.items())
+            arrays.update((f"{i}.measure.{m}", values) for m, values in cuboid.measures.items())
+        meta = {"labels": {d: values.tolist() for d, values in self.labels.items()}, "rows": self.rows,
+                "max_cuboids": self.max_cuboids, "cuboids": cuboids}
+        return arrays, meta
+
+    @classmethod
+    def from_shared(cls, arrays: dict, meta: dict):
+        """Cube over cuboid arrays published by another process; the base cuboid comes first."""
+        labels = {d: np.array(values, dtype=object if any(isinstance(v, str) for v in values) else None)
+                  for d, values in meta["labels"].items()}
+        cuboids = [
+            Cuboid(dims, {d: arrays[f"{i}.code.{d}"] for d in dims}, {m: arrays[f"{i}.measure.{m}"] for m in MEASURES})
+            for i, dims in enumerate(meta["cuboids"])
+        ]
+        return cls(labels, cuboids[0], meta["rows"], meta["max_cuboids"], materialized=cuboids[1:])
+
+    def dimensions(self):
+        """Dimension -> list of member labels."""
+        return {d: values.tolist() for d, values in self.labels.items()}
+
+    @timed("compute.cube")
+    def query(self, group_by=(), filters=None, measures=MEASURES, sort: str = None, limit: int = None):
+        """
+        Slice/dice/drill-down over the cube.
+        Args:
+            group_by: Dimensions to group by, in output order (empty for the grand total).
+            filters: dim -> list of member labels to keep (compared as strings).
+            measures: Subset of MEASURES to return.
+            sort: Measure or dimension to order by, "-" prefix for descending
+                (default: group-by dimensions ascending).
+            limit: Maximum rows returned.
+        Returns:
+            dict with the rows and the cuboid they were computed from.
+        """
+        filters = filters or {}
+        unknown = [d for d in [*group_by, *filters] if d not in DIMENSIONS]
+        if unknown:
+            raise InvalidQuery(f"Unknown dimensions: {', '.join(unknown)}. Available: {', '.join(DIMENSIONS)}")
+        bad = [m for m in measures if m not in MEASURES]
+        if bad:
+            raise InvalidQuery(f"Unknown measures: {', '.join(bad)}. Available: {', '.join(MEASURES)}")
+        if len(set(group_by)) != len(group_by):
+            raise InvalidQuery("Duplicate group_by dimensions")
+
+        source = self.cuboid(set(group_by) | set(filters))
+        mask = None
+        for dim, members in filters.items():
+            allowed = [self._lookup[dim][m] for m in members if m in self._lookup[dim]]
+            keep = np.isin(source.codes[dim], np.array(allowed, dtype=np.int64))
+            mask = keep if mask is None else mask & keep
+        result = source.rollup(tuple(group_by), self.sizes, mask)
+
+        order = np.arange(len(result.measures["order_lines"]))
+        if sort:
+            name = sort.lstrip("-")
+            if name in MEASURES:
+                values = result.measures[name]
+            elif name in group_by:
+                # Codes are unsigned: widen before negating for a descending sort
+                values = result.codes[name].astype(np.int64)
+            else:
+                raise InvalidQuery(f"Cannot sort by {name}: not a measure or group_by dimension")
+            order = np.argsort(-values if sort.startswith("-") else values, kind="stable")
+        total_cells = len(order)
+        if limit is not None:
+            order = order[:limit]
+
+        columns = {d: self.labels[d][result.codes[d][order]].tolist() for d in group_by}
+        for m in measures:
+            values = result.measures[m][order]
+            columns[m] = np.round(values, 2).tolist() if m == "sales" else values.tolist()
+        names = list(columns)
+        return {
+            "group_by": list(group_by),
+            "filters": filters,
+            "source_cuboid": list(source.dims),
+            "total_cells": total_cells,
+            "rows": [dict(zip(names, row)) for row in zip(*columns.values())]
+        }
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            memo = sum(c.nbytes for c in self._memo.values())
+        return memo + sum(c.nbytes for c in self._materialized.values()) + sum(v.nbytes for v in self.labels.values())
+
+    def stats(self):
+        with self._lock:
+            memoized = len(self._memo)
+        return {"rows": self.rows, "base_cells": self._materialized[frozenset(DIMENSIONS)].n_cells,
+                "materialized": len(self._materialized), "memoized": memoized, "bytes": self.nbytes}
+
+
+def parse_filters(values):
+    """["dim:a,b", ...] query values -> {dim: [a, b]}."""
+    filters = {}
+    for value in values or []:
+        dim, sep, members = value.partition(":")
+        if not sep or not dim.strip():
+            raise InvalidQuery(f"Invalid filter '{value}', expected dimension:value1,value2")
+        filters.setdefault(dim.strip(), []).extend(m.strip() for m in members.split(",") if m.strip())
+    return filters
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.storage import HAS_ARROW
+
+if HAS_ARROW:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+
+def default_shared_dir(base_dir: str):
+    """
+    /dev/shm when available (RAM-backed, shared by every process on the host), else the
+    temp dir. The directory name includes a hash of `base_dir`, so two deployments on
+    one host don't collide.
+    """
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    tag = hashlib.blake2b(os.path.abspath(base_dir).encode(), digest_size=6).hexdigest()
+    return os.path.join(root, f"business-manager-{tag}")
+
+
+# State snapshot layout: magic, header length (8 bytes, little endian), JSON header, then each
+# array's raw bytes at a 64-byte aligned offset after the header
+STATE_MAGIC = b"BMSTATE1"
+_ALIGN = 64
+
+
+def _aligned(n: int):
+    return -(-n // _ALIGN) * _ALIGN
+
+
+class SharedSnapshots:
+    """
+    Publishes DataFrames as uncompressed Arrow IPC files, one per dataset version, and
+    reads them back memory-mapped as Arrow-backed frames, without copying the columns.
+    Order-derived state (VelocityStore, AggregateStore, RollupCube) is published the same way
+    as a file of raw numpy arrays, through the state's to_shared()/from_shared().
+    Every worker process maps the same file, so the page cache holds a single copy of the
+    data however many workers attach. A file is written under a temporary name and renamed into place, so a worker sees
+    either the complete snapshot of a version or none. The version itself comes from
+    the source (e.g. the table store's transactional version counter): a counter, or a
+    tuple ending in one whose other items name the counter's lineage (store, epoch).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.published = 0
+        self.attached = 0
+
+    def _dir(self, key: str):
+        return os.path.join(self.root, *[part for part in key.split("/") if part not in ("", ".", "..")])
+
+    def path(self, key: str, version, suffix: str = ".arrow"):
+        digest = hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+        return os.path.join(self._dir(key), f"{digest}{suffix}")
+
+    def publish(self, key: str, version, df):
+        """Writes `df` as the snapshot of `key` at `version` and drops the snapshots it supersedes."""
+        table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"version": json.dumps(version).encode()})
+        return self._write(self.path(key, version), version,
+                           lambda tmp_path: feather.write_feather(table, tmp_path, compression="uncompressed"))
+
+    def publish_state(self, key: str, version, state):
+        """Writes the arrays of `state` (see to_shared) as the snapshot of `key` at `version`."""
+        arrays, meta = state.to_shared()
+        arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+        layout, size = {}, 0
+        for name, a in arrays.items():
+            if a.dtype.hasobject:
+                raise TypeError(f"Cannot share object array {name}")
+            layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": size}
+            size += _aligned(a.nbytes)
+        header = json.dumps({"version": version, "meta": meta, "arrays": layout}).encode()
+        start = _aligned(len(STATE_MAGIC) + 8 + len(header))
+
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(STATE_MAGIC + len(header).to_bytes(8, "little") + header)
+                for name, a in arrays.items():
+                    if a.nbytes:
+                        f.seek(start + layout[name]["offset"])
+                        f.write(a.data)
+                f.truncate(start + size)
+
+        return self._write(self.path(key, version, ".state"), version, write)
+
+    def _write(self, path: str, version, write):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Unique per writer: concurrent publishers (threads or processes) never share a temp file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.published += 1
+        self._drop_superseded(directory, path, json.loads(json.dumps(version)))
+        return path
+
+    def _drop_superseded(self, directory: str, path: str, version):
+        # Workers that still map an old version keep their view; unlinking only frees the name
+        written = os.stat(path).st_mtime_ns
+        suffix = os.path.splitext(path)[1]
+        for name in os.listdir(directory):
+            old = os.path.join(directory, name)
+            if old == path or not name.endswith(suffix):
+                continue
+            try:
+                if _supersedes(version, written, self._version_of(old), os.stat(old).st_mtime_ns):
+                    os.remove(old)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _version_of(path: str):
+        """Version recorded in a snapshot file, or None for files without one."""
+        try:
+            if path.endswith(".state"):
+                return _read_state_header(path)[0]["version"]
+            with pa.memory_map(path) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+            return json.loads(metadata[b"version"])
+        except (KeyError, ValueError):
+            return None
+
+    def attach(self, key: str, version):
+        """Memory-maps the snapshot of `key` at `version`; raises OSError when it isn't published."""
+        table = feather.read_table(self.path(key, version), memory_map=True)
+        self.attached += 1
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def attach_state(self, key: str, version, cls):
+        """
+        cls.from_shared() over the memory-mapped arrays of `key` at `version`. The arrays are
+        read-only views of the file; raises OSError when it isn't published.
+        """
+        header, start, buffer = _read_state_header(self.path(key, version, ".state"), mapped=True)
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            count = int(np.prod(shape))
+            arrays[name] = (np.frombuffer(buffer, dtype, count, start + spec["offset"]).reshape(shape)
+                            if count else np.empty(shape, dtype))
+        self.attached += 1
+        return cls.from_shared(arrays, header["meta"])
+
+    def get(self, key: str, version, loader):
+        """
+        Returns the shared frame for `key` at `version`. The first process to need a version
+        calls `loader()` and publishes it; everyone else attaches to the published file.
+        """
+        return self._get(key, version, loader, lambda df: self.publish(key, version, df),
+                         lambda: self.attach(key, version))
+
+    def get_state(self, key: str, version, loader, cls):
+        """get() for order-derived state: `loader()` returns an instance of `cls`."""
+        return self._get(key, version, loader, lambda state: self.publish_state(key, version, state),
+                         lambda: self.attach_state(key, version, cls))
+
+    def _get(self, key: str, version, loader, publish, attach):
+        try:
+            return attach()
+        except OSError:
+            pass
+        value = loader()
+        try:
+            publish(value)
+            return attach()
+        except OSError as e:
+            # Superseded by a newer version mid-read, or the directory isn't writable
+            print(f"Could not share snapshot {key}: {e}. Using a private copy.")
+            return value
+
+    def stats(self):
+        return {"root": self.root, "published": self.published, "attached": self.attached}
+
+
+def _read_state_header(path: str, mapped: bool = False):
+    """(header, data start, mmap of the file when `mapped`) of a state snapshot."""
+    with open(path, "rb") as f:
+        if f.read(len(STATE_MAGIC)) != STATE_MAGIC:
+            raise OSError(f"{path} is not a state snapshot")
+        length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(length))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if mapped else None
+    return header, _aligned(len(STATE_MAGIC) + 8 + length), buffer
+
+
+def _supersedes(new, new_written: int, old, old_written: int):
+    """
+    Whether the snapshot at `new` makes the one at `old` obsolete: an earlier counter of the same
+    lineage, or a file without a version. Across lineages (e.g. a recreated database) counters
+    don't compare, so the file written last wins.
+    """
+    if old is None:
+        return True
+    if isinstance(new, list) and isinstance(old, list):
+        if len(new) != len(old) or new[:-1] != old[:-1]:
+            return old_written < new_written
+        new, old = new[-1], old[-1]
+    try:
+        return old < new
+    except TypeError:
+        return old_written < new_written
+
+
+def get_shared_snapshots(base_dir: str, enabled: bool = None):
+    """
+    SharedSnapshots under SHARED_DATA_DIR, or None when sharing is off. Sharing is on when
+    SHARED_DATASETS=1, or by default when the API runs with API_WORKERS > 1. It needs pyarrow.
+    """
+    if enabled is None:
+        setting = os.environ.get("SHARED_DATASETS")
+        enabled = setting == "1" if setting is not None else int(os.environ.get("API_WORKERS", 1)) > 1
+    if not enabled:
+        return None
+    if not HAS_ARROW:
+        print("pyarrow is not installed; shared datasets unavailable.")
+        return None
+    return SharedSnapshots(os.environ.get("SHARED_DATA_DIR", default_shared_dir(base_dir)))
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Sidecar schema metadata key holding the source CSV's "mtime_ns:size" at import
+SOURCE_KEY = b"source_csv"
+
+
+class CsvStorage:
+    """Reads every dataset straight from its source CSV."""
+    name = "csv"
+
+    def read(self, csv_path: str, reader=pd.read_csv, columns=None):
+        """
+        Args:
+            csv_path: Source CSV file.
+            reader: Callable turning the CSV path into a prepared DataFrame
+                (renames, parsed dates, sorting).
+            columns: Optional subset of columns to return.
+        """
+        df = reader(csv_path)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+
+class ColumnarStorage(CsvStorage):
+    """
+    Converts each source CSV once into a typed columnar sidecar next to it
+    (Arrow IPC/Feather or Parquet) and reads from the sidecar afterwards.
+    The CSV stays the source of truth: the sidecar records the CSV's mtime and size
+    when it was imported and is rebuilt whenever either differs (including a CSV
+    replaced by an older copy), and reads fall back to the CSV if the sidecar can't
+    be written.
+    """
+
+    def __init__(self, fmt: str = "feather"):
+        if fmt not in ("feather", "parquet"):
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+        self.name = fmt
+        self.suffix = ".feather" if fmt == "feather" else ".parquet"
+
+    def sidecar_path(self, csv_path: str):
+        return os.path.splitext(csv_path)[0] + self.suffix
+
+    @staticmethod
+    def _source_marker(csv_path: str):
+        st = os.stat(csv_path)
+        return f"{st.st_mtime_ns}:{st.st_size}".encode()
+
+    def is_stale(self, csv_path: str):
+        sidecar = self.sidecar_path(csv_path)
+        if not os.path.exists(sidecar):
+            return True
+        try:
+            metadata = self._schema(sidecar).metadata or {}
+        except (OSError, pa.ArrowException):
+            return True
+        return metadata.get(SOURCE_KEY) != self._source_marker(csv_path)
+
+    def import_csv(self, csv_path: str, reader=pd.read_csv):
+        """Parses the CSV with `reader` and writes the typed result as a sidecar file."""
+        # Taken before parsing: a CSV written meanwhile no longer matches and is re-imported
+        marker = self._source_marker(csv_path)
+        df = reader(csv_path).reset_index(drop=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_KEY: marker})
+        sidecar = self.sidecar_path(csv_path)
+        # Unique per writer: concurrent cold-start imports (threads or processes) never share a temp file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar) or ".", prefix=os.path.basename(sidecar) + ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            if self.name == "feather":
+                # Uncompressed IPC files can be memory-mapped without a decode step
+                feather.write_feather(table, tmp_path, compression="uncompressed")
+            else:
+                pq.write_table(table, tmp_path)
+            os.replace(tmp_path, sidecar)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return df
+
+    def _schema(self, path: str):
+        if self.name == "feather":
+            with pa.memory_map(path) as source:
+                return pa.ipc.open_file(source).schema
+        return pq.read_schema(path)
+
+    def read(self, csv_path: str, reader=pd.read_csv, columns=None):
+        if self.is_stale(csv_path):
+            try:
+                df = self.import_csv(csv_path, reader)
+            except OSError as e:
+                print(f"Could not write {self.name} sidecar for {csv_path}: {e}. Reading CSV.")
+                return super().read(csv_path, reader, columns)
+            if columns is not None:
+                df = df[[c for c in columns if c in df.columns]]
+            return df
+
+        path = self.sidecar_path(csv_path)
+        if columns is not None:
+            available = self._schema(path).names
+            columns = [c for c in columns if c in available]
+        if self.name == "feather":
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas()
+
+
+def get_storage(backend: str = None):
+    """
+    Returns the storage backend named by `backend` or the DATA_STORAGE env var
+    ("csv", "feather", "parquet" or "auto"). "auto" uses Feather when pyarrow
+    is installed and CSV otherwise.
+    """
+    backend = (backend or os.environ.get("DATA_STORAGE", "auto")).lower()
+    if backend == "auto":
+        backend = "feather" if HAS_ARROW else "csv"
+    if backend == "csv":
+        return CsvStorage()
+    if not HAS_ARROW:
+        print(f"pyarrow is not installed; '{backend}' storage unavailable. Using CSV.")
+        return CsvStorage()
+    return ColumnarStorage(backend)
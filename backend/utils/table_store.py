@@ -0,0 +1,249 @@
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+import pandas as pd
+
+# Mutable tables: name -> source CSV file. Every table is keyed by product_name.
+TABLES = {
+    "products": "product_sales.csv",
+    "inventory": "inventory.csv",
+}
+KEY_COLUMN = "product_name"
+# SQLite connections a store keeps open between operations
+IDLE_CONNECTIONS = int(os.environ.get("TABLE_STORE_IDLE_CONNECTIONS", 2))
+
+
+class CsvTableStore:
+    """
+    Mutable tables kept in their source CSVs. Writes are serialized by a process-local
+    lock and rewrite the whole file, as the API originally did.
+    """
+    name = "csv"
+    # Versions are file mtimes, unique on their own
+    epoch = None
+
+    def __init__(self, base_dir: str, storage):
+        self.base_dir = base_dir
+        self.storage = storage
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Nothing to release: files are only open during an operation."""
+
+    def csv_path(self, table: str):
+        return os.path.join(self.base_dir, TABLES[table])
+
+    def version(self, table: str):
+        try:
+            st = os.stat(self.csv_path(table))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self, table: str):
+        path = self.csv_path(table)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return self.storage.read(path)
+
+    def add_to_column(self, table: str, column: str, ops, ndigits: int = None):
+        """
+        Adds each delta to `column` of the row whose product_name matches, all in one
+        read-modify-write.
+        Args:
+            ops: list of (product_name, delta) pairs.
+            ndigits: Round new values to this many digits.
+        Returns:
+            list aligned with `ops` of (old, new) value pairs, or None for unknown products.
+        """
+        with self._lock:
+            df = self.read(table).copy()
+            if df.empty:
+                return [None] * len(ops)
+            positions = {name: i for i, name in enumerate(df[KEY_COLUMN].tolist())}
+            col = df.columns.get_loc(column)
+            results = []
+            for key, delta in ops:
+                i = positions.get(key)
+                if i is None:
+                    results.append(None)
+                    continue
+                old = df.iat[i, col].item()
+                new = old + delta if ndigits is None else round(old + delta, ndigits)
+                df.iat[i, col] = new
+                results.append((old, new))
+            if any(r is not None for r in results):
+                df.to_csv(self.csv_path(table), index=False)
+            return results
+
+
+class SqliteTableStore:
+    """
+    Mutable tables in an embedded SQLite database (WAL mode), seeded once from the CSVs.
+    Each batch of updates is one IMMEDIATE transaction that reads, updates and bumps the
+    table version atomically, so concurrent writers (threads or processes) never lose
+    updates and a write costs O(rows touched) instead of a full file rewrite.
+
+    After seeding the database is the source of truth: API writes never reach the CSVs.
+    A CSV edited after it was imported is reported when the store opens, and re-imported
+    (replacing the table, API writes included) only with `reseed` (TABLE_STORE_RESEED=1).
+
+    Operations borrow a connection from a small pool; at most `idle_connections` stay open
+    between operations however many threads use the store, and close() releases them.
+    """
+    name = "sqlite"
+
+    def __init__(self, db_path: str, base_dir: str, reseed: bool = False, idle_connections: int = IDLE_CONNECTIONS):
+        self.db_path = db_path
+        self.base_dir = base_dir
+        self.reseed = reseed
+        self.idle_connections = idle_connections
+        self._idle = []
+        self._closed = False
+        self._pool_lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+        self._seed()
+        # Identifies this database file: versions restart at 1 if it is recreated
+        with self._connection() as conn:
+            self.epoch = conn.execute("SELECT value FROM _meta WHERE key='epoch'").fetchone()[0]
+
+    def _open(self):
+        # Used by one thread at a time, but not always the one that opened it
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commits don't fsync; durable at checkpoints, never corrupt
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrows a pooled connection, returning it to the pool (or closing it) afterwards."""
+        with self._pool_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                if not self._closed and len(self._idle) < self.idle_connections:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        """
+        Closes the pooled connections. Operations still in flight close theirs when they
+        finish; later ones still work, opening a connection each.
+        """
+        with self._pool_lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _seed(self):
+        with self._seed_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("CREATE TABLE IF NOT EXISTS _versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                conn.execute("INSERT OR IGNORE INTO _meta VALUES ('epoch', ?)", (uuid.uuid4().hex,))
+                for table, filename in TABLES.items():
+                    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+                    csv_path = os.path.join(self.base_dir, filename)
+                    if not os.path.exists(csv_path):
+                        continue
+                    st = os.stat(csv_path)
+                    marker = f"{st.st_mtime_ns}:{st.st_size}"
+                    row = conn.execute("SELECT value FROM _meta WHERE key=?", (f"source:{table}",)).fetchone()
+                    if exists and (row is None or row[0] == marker):
+                        # Unchanged, or seeded before source markers were recorded
+                        conn.execute("INSERT OR IGNORE INTO _meta VALUES (?, ?)", (f"source:{table}", marker))
+                        continue
+                    if exists and not self.reseed:
+                        print(f"{csv_path} changed after it was imported into {self.db_path}; the database is the "
+                              f"source of truth. Set TABLE_STORE_RESEED=1 to re-import it.")
+                        continue
+                    if exists:
+                        conn.execute(f'DROP TABLE "{table}"')
+                    self._create_from_frame(conn, table, pd.read_csv(csv_path))
+                    # Versions only move forward, so caches never mistake a re-import for an older version
+                    conn.execute("INSERT INTO _versions VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET version = version + 1", (table,))
+                    conn.execute("INSERT OR REPLACE INTO _meta VALUES (?, ?)", (f"source:{table}", marker))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _create_from_frame(conn, table: str, df: pd.DataFrame):
+        # Built by hand: DataFrame.to_sql would commit our open transaction
+        def sql_type(dtype):
+            if pd.api.types.is_integer_dtype(dtype):
+                return "INTEGER"
+            if pd.api.types.is_float_dtype(dtype):
+                return "REAL"
+            return "TEXT"
+        columns = ", ".join(f'"{c}" {sql_type(t)}' for c, t in df.dtypes.items())
+        conn.execute(f'CREATE TABLE "{table}" ({columns})')
+        placeholders = ", ".join("?" * len(df.columns))
+        conn.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', df.to_dict('split')['data'])
+        conn.execute(f'CREATE UNIQUE INDEX "{table}_key" ON "{table}" ({KEY_COLUMN})')
+
+    def version(self, table: str):
+        with self._connection() as conn:
+            row = conn.execute("SELECT version FROM _versions WHERE name=?", (table,)).fetchone()
+        return row[0] if row else None
+
+    def read(self, table: str):
+        if self.version(table) is None:
+            return pd.DataFrame()
+        with self._connection() as conn:
+            return pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+
+    def add_to_column(self, table: str, column: str, ops, ndigits: int = None):
+        """Same contract as CsvTableStore.add_to_column, as a single transaction."""
+        if self.version(table) is None:
+            return [None] * len(ops)
+        select = f'SELECT "{column}" FROM "{table}" WHERE {KEY_COLUMN}=?'
+        update = f'UPDATE "{table}" SET "{column}"=? WHERE {KEY_COLUMN}=?'
+        results = []
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, delta in ops:
+                    row = conn.execute(select, (key,)).fetchone()
+                    if row is None:
+                        results.append(None)
+                        continue
+                    old = row[0]
+                    new = old + delta if ndigits is None else round(old + delta, ndigits)
+                    conn.execute(update, (new, key))
+                    results.append((old, new))
+                if any(r is not None for r in results):
+                    conn.execute("UPDATE _versions SET version = version + 1 WHERE name=?", (table,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return results
+
+
+def get_table_store(base_dir: str, storage, backend: str = None, db_path: str = None):
+    """
+    Returns the store named by `backend` or the TABLE_STORE env var ("sqlite" or "csv").
+    The SQLite database lives at `db_path` (default: business.db in `base_dir`); every
+    tenant needs its own, so callers only pass a path for a single tenant.
+    """
+    backend = (backend or os.environ.get("TABLE_STORE", "sqlite")).lower()
+    if backend == "sqlite":
+        db_path = db_path or os.path.join(base_dir, "business.db")
+        try:
+            return SqliteTableStore(db_path, base_dir, reseed=os.environ.get("TABLE_STORE_RESEED", "0") == "1")
+        except sqlite3.Error as e:
+            print(f"Could not open SQLite store at {db_path}: {e}. Using CSV tables.")
+    return CsvTableStore(base_dir, storage)
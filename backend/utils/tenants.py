@@ -0,0 +1,154 @@
+import contextvars
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from utils.table_store import get_table_store
+
+DEFAULT_TENANT = "default"
+TENANT_HEADER = b"x-tenant"
+# Path-prefix form: /t/<tenant>/api/...
+TENANT_PREFIX = "/t/"
+_TENANT_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+# Tenants (besides the default) whose table store stays open; the least recently used is closed
+MAX_OPEN_TABLE_STORES = int(os.environ.get("MAX_OPEN_TABLE_STORES", 64))
+
+# Tenant serving the current request; WorkPool copies it into worker threads
+current_tenant = contextvars.ContextVar("current_tenant", default=None)
+
+
+class UnknownTenant(LookupError):
+    """Raised for a malformed tenant id or one with no data directory; the API answers 404."""
+
+
+class Tenant:
+    """One business's data: a directory of CSVs plus its mutable table store, opened on first use."""
+
+    def __init__(self, name: str, base_dir: str, storage, on_use=None):
+        self.name = name
+        self.base_dir = base_dir
+        self.storage = storage
+        self._table_store = None
+        self._lock = threading.Lock()
+        self._on_use = on_use  # called with the tenant on every table_store access
+
+    def path(self, filename: str):
+        return os.path.join(self.base_dir, filename)
+
+    @property
+    def table_store(self):
+        store = self._table_store
+        if store is None:
+            with self._lock:
+                if self._table_store is None:
+                    # TABLE_STORE_DB relocates the default tenant's database only; sharing one file
+                    # would mix tenants' tables, so the others keep business.db in their own directory
+                    db_path = os.environ.get("TABLE_STORE_DB") if self.name == DEFAULT_TENANT else None
+                    self._table_store = get_table_store(self.base_dir, self.storage, db_path=db_path)
+                store = self._table_store
+        if self._on_use is not None:
+            self._on_use(self)
+        return store
+
+    def close_table_store(self):
+        """Releases the table store's connections; the next access reopens it."""
+        with self._lock:
+            store, self._table_store = self._table_store, None
+        if store is not None:
+            store.close()
+
+
+class TenantRegistry:
+    """
+    Maps tenant ids to their data directories. The default tenant uses `default_dir`
+    (the files next to the API); every other tenant is a sub-directory of `tenants_dir`.
+    Tenants are registered lazily on first request and hold no frames themselves; their
+    datasets live in the shared, memory-bounded DatasetCache. Only the `max_open_stores`
+    most recently used tenants keep their table store (and its connections) open.
+    """
+
+    def __init__(self, default_dir: str, tenants_dir: str, storage, max_open_stores: int = MAX_OPEN_TABLE_STORES):
+        self.tenants_dir = tenants_dir
+        self.storage = storage
+        self.max_open_stores = max_open_stores
+        self.default = Tenant(DEFAULT_TENANT, default_dir, storage)
+        self._tenants = {DEFAULT_TENANT: self.default}
+        self._open = OrderedDict()  # tenant name -> Tenant, least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, name: str = None):
+        if not name:
+            return self.default
+        tenant = self._tenants.get(name)
+        if tenant is not None:
+            return tenant
+        if not _TENANT_ID.match(name):
+            raise UnknownTenant(f"Invalid tenant id: {name}")
+        base_dir = os.path.join(self.tenants_dir, name)
+        if not os.path.isdir(base_dir):
+            raise UnknownTenant(f"Unknown tenant: {name}")
+        with self._lock:
+            return self._tenants.setdefault(name, Tenant(name, base_dir, self.storage, on_use=self._used))
+
+    def _used(self, tenant: Tenant):
+        cold = []
+        with self._lock:
+            self._open[tenant.name] = tenant
+            self._open.move_to_end(tenant.name)
+            while len(self._open) > self.max_open_stores:
+                cold.append(self._open.popitem(last=False)[1])
+        for other in cold:
+            other.close_table_store()
+
+    def open_stores(self):
+        """Names of the tenants (besides the default) whose table store is open, least recent first."""
+        with self._lock:
+            return list(self._open)
+
+    def names(self):
+        return list(self._tenants)
+
+
+class TenantMiddleware:
+    """
+    ASGI middleware that resolves the tenant from a /t/<tenant>/ path prefix (stripped
+    before routing) or the X-Tenant header, and binds it to current_tenant for the request.
+    """
+
+    def __init__(self, app, registry: TenantRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        name = None
+        path = scope["path"]
+        if path.startswith(TENANT_PREFIX):
+            name, _, rest = path[len(TENANT_PREFIX):].partition("/")
+            scope = dict(scope, path="/" + rest, raw_path=("/" + rest).encode())
+        else:
+            for key, value in scope.get("headers", []):
+                if key == TENANT_HEADER:
+                    name = value.decode("latin-1").strip()
+                    break
+
+        try:
+            tenant = self.registry.get(name)
+        except UnknownTenant as e:
+            if scope["type"] != "http":
+                return
+            body = json.dumps({"message": str(e)}).encode()
+            await send({"type": "http.response.start", "status": 404,
+                        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        token = current_tenant.set(tenant)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
@@ -0,0 +1,103 @@
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class VersionedLRUCache:
+    """
+    LRU cache whose entries are tagged with the data version they were computed from.
+    A hit on an older version is served immediately (stale-while-revalidate) while the
+    value is recomputed once in the background; only a cold miss computes inline.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (version, value)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        # Bumped on every put, so dependents can tell when any cached value changed
+        self.generation = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def put(self, key, version, value, touch: bool = True):
+        """
+        Stores `value` for `key`. With touch=False (background warming) the entry keeps its
+        place in the LRU order, and a new one goes in as least recently used, so warming
+        never evicts entries that requests are using.
+        """
+        with self._lock:
+            new = key not in self._entries
+            self._entries[key] = (version, value)
+            self.generation += 1
+            if touch:
+                self._entries.move_to_end(key)
+            elif new:
+                self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key, version, compute, touch: bool):
+        try:
+            self.put(key, version, compute(), touch)
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def refresh_async(self, key, version, compute, touch: bool = True):
+        """Schedules a background recompute of `key` unless one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        # compute() runs under the caller's context, e.g. the tenant it was scheduled for
+        self._executor.submit(contextvars.copy_context().run, self._refresh, key, version, compute, touch)
+
+    def get(self, key, version, compute):
+        """
+        Returns the cached value for `key`, calling `compute()` inline only when nothing is cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == version:
+                    self.hits += 1
+                    return entry[1]
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+
+        if entry is not None:
+            self.refresh_async(key, version, compute)
+            return entry[1]
+
+        value = compute()
+        self.put(key, version, value)
+        return value
+
+    def warm(self, items, version):
+        """
+        Fills or refreshes entries in the background without changing their recency;
+        `items` yields (key, compute) pairs.
+        """
+        for key, compute in items:
+            self.refresh_async(key, version, compute, touch=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses
+            }
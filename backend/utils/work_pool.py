@@ -0,0 +1,57 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import profiling
+
+
+class PoolSaturated(Exception):
+    """Raised when the work pool's queue is full; the API answers 503."""
+
+
+class WorkPool:
+    """
+    Runs blocking pandas/numpy/file work on a sized thread pool so async handlers never
+    stall the event loop. At most `max_workers` calls run at once and up to `max_queue`
+    more may wait; anything beyond that is rejected with PoolSaturated instead of piling up.
+    Counters are only touched from the event loop thread, so they need no lock.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-work")
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def queued(self):
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn, *args):
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.in_flight} requests in progress")
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # Run under a copy of the caller's context so request-scoped state (the tenant, stage
+            # timings, a ?profile= session) follows the work
+            ctx = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, ctx.run, profiling.call, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self):
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
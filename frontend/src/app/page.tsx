@@ -1,6 +1,6 @@
 "use client";
 
-import React, { useEffect, useState, useCallback } from 'react';
+import React, { useEffect, useState, useCallback, useRef } from 'react';
 import Sidebar from '@/components/Sidebar';
 import Header from '@/components/Header';
 import SalesForecastChart from '@/components/SalesForecastChart';
@@ -96,6 +96,59 @@ interface DashboardData {
   summary: string;
 }
 
+// Incremental update pushed by /api/events when the underlying data changes
+interface RowDiff<T> {
+  changed: T[];
+  removed: string[];
+}
+
+interface ItemDiff<T> {
+  added: T[];
+  removed: T[];
+}
+
+interface LiveDiff {
+  inventory?: RowDiff<InventoryItem>;
+  products?: RowDiff<RevenueMixItem>;
+  forecast?: RowDiff<ForecastItem>;
+  recommendations?: ItemDiff<Recommendation>;
+  alerts?: ItemDiff<Alert>;
+  stats?: StatsData;
+  summary?: string;
+}
+
+// Replace changed rows in place, drop removed ones, append new ones
+function patchRows<T>(rows: T[], diff: RowDiff<T> | undefined, key: (row: T) => string): T[] {
+  if (!diff) return rows;
+  const changed = new Map(diff.changed.map(row => [key(row), row]));
+  const removed = new Set(diff.removed);
+  const next = rows.filter(row => !removed.has(key(row))).map(row => changed.get(key(row)) ?? row);
+  const present = new Set(next.map(key));
+  return [...next, ...diff.changed.filter(row => !present.has(key(row)))];
+}
+
+function patchItems<T>(items: T[], diff: ItemDiff<T> | undefined): T[] {
+  if (!diff) return items;
+  const removed = new Set(diff.removed.map(item => JSON.stringify(item)));
+  return [...items.filter(item => !removed.has(JSON.stringify(item))), ...diff.added];
+}
+
+function applyLiveDiff(data: DashboardData, diff: LiveDiff, selectedProduct: string): DashboardData {
+  return {
+    ...data,
+    inventory_health: patchRows(data.inventory_health, diff.inventory, row => row.product),
+    revenue_mix: patchRows(data.revenue_mix, diff.products, row => row.name).sort((a, b) => b.value - a.value),
+    // Diffs cover the All Products forecast table; a single-product view refetches instead
+    revenue_forecast: selectedProduct === 'All Products'
+      ? patchRows(data.revenue_forecast, diff.forecast, row => row.product)
+      : data.revenue_forecast,
+    recommendations: patchItems(data.recommendations, diff.recommendations),
+    alerts: patchItems(data.alerts, diff.alerts),
+    stats: diff.stats ?? data.stats,
+    summary: diff.summary ?? data.summary
+  };
+}
+
 // Rich demo fallback — ensures zero blank sections if API is unreachable
 const DEMO_DATA: DashboardData = {
   recommendations: [
@@ -165,6 +218,8 @@ export default function DashboardPage() {
   const [activeTab, setActiveTab] = useState('dashboard');
   const [timeframe, setTimeframe] = useState('1M');
   const [toasts, setToasts] = useState<ToastMessage[]>([]);
+  // True while the live update stream is connected; actions then skip the full refetch
+  const liveRef = useRef(false);
 
   const addToast = (message: string, type: ToastMessage['type'] = 'info') => {
     const id = Math.random().toString(36).substring(7);
@@ -201,7 +256,7 @@ export default function DashboardPage() {
         if (response.ok) {
           const result = await response.json();
           addToast(result.message || "Action processed successfully.", "success");
-          await fetchData();
+          if (!liveRef.current) await fetchData();
         } else {
           throw new Error("Action failed");
         }
@@ -224,7 +279,7 @@ export default function DashboardPage() {
       if (response.ok) {
         const result = await response.json();
         addToast(result.message || `${productName} restocked successfully.`, "success");
-        await fetchData();
+        if (!liveRef.current) await fetchData();
       } else {
         throw new Error("Restock failed");
       }
@@ -247,29 +302,23 @@ export default function DashboardPage() {
   const fetchData = useCallback(async () => {
     setLoading(true);
     try {
-      const productParam = selectedProduct === 'All Products' ? '' : `?product=${encodeURIComponent(selectedProduct)}`;
-
-      const [ovRes, trendRes, forecastRes, prodRes, invRes, dealRes, statsRes] = await Promise.all([
-        fetch(`${API_BASE_URL}/api/overview`),
-        fetch(`${API_BASE_URL}/api/financial-trends`),
-        fetch(`${API_BASE_URL}/api/forecast${productParam}`),
-        fetch(`${API_BASE_URL}/api/products`),
-        fetch(`${API_BASE_URL}/api/inventory`),
-        fetch(`${API_BASE_URL}/api/deal-sizes`),
-        fetch(`${API_BASE_URL}/api/stats`)
-      ]);
-
-      if (!ovRes.ok || !trendRes.ok || !forecastRes.ok || !prodRes.ok || !invRes.ok) {
+      const productParam = selectedProduct === 'All Products' ? '' : `&product=${encodeURIComponent(selectedProduct)}`;
+
+      // One batched request computes every section from the same data snapshot
+      const batchRes = await fetch(`${API_BASE_URL}/api/batch?sections=overview,financial-trends,forecast,products,inventory,deal-sizes,stats${productParam}`);
+
+      if (!batchRes.ok) {
         throw new Error("Engine Sync Requirement");
       }
 
-      const overview = await ovRes.json();
-      const trends = await trendRes.json();
-      const forecast = await forecastRes.json();
-      const products = await prodRes.json();
-      const inventory = await invRes.json();
-      const dealSizes = dealRes.ok ? await dealRes.json() : DEMO_DATA.deal_size_distribution;
-      const stats = statsRes.ok ? await statsRes.json() : DEMO_DATA.stats;
+      const batch = await batchRes.json();
+      const overview = batch['overview'];
+      const trends = batch['financial-trends'];
+      const forecast = batch['forecast'];
+      const products = batch['products'];
+      const inventory = batch['inventory'];
+      const dealSizes = batch['deal-sizes'] ?? DEMO_DATA.deal_size_distribution;
+      const stats = batch['stats'] ?? DEMO_DATA.stats;
 
       const newData: DashboardData = {
         recommendations: overview.recommendations || [],
@@ -302,6 +351,28 @@ export default function DashboardPage() {
     fetchData();
   }, [fetchData]);
 
+  // Live updates: apply server-pushed diffs instead of re-polling every section
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return;
+    const source = new EventSource(`${API_BASE_URL}/api/events`);
+    source.onopen = () => { liveRef.current = true; };
+    source.onerror = () => { liveRef.current = false; };
+    source.addEventListener('diff', (event) => {
+      const diff: LiveDiff = JSON.parse((event as MessageEvent).data);
+      if (diff.forecast && selectedProduct !== 'All Products') {
+        fetchData();
+        return;
+      }
+      setData(prev => (prev ? applyLiveDiff(prev, diff, selectedProduct) : prev));
+    });
+    // The server could not replay what we missed
+    source.addEventListener('reset', () => { fetchData(); });
+    return () => {
+      liveRef.current = false;
+      source.close();
+    };
+  }, [fetchData, selectedProduct]);
+
   const productLines = [
     'All Products',
     'Classic Cars',
@@ -464,7 +535,7 @@ export default function DashboardPage() {
               data={data?.revenue_forecast || []}
               onCampaignApply={(product) => {
                 addToast(`Campaign applied to ${product}. Refreshing projections...`, 'success');
-                fetchData();
+                if (!liveRef.current) fetchData();
               }}
             />
           )}
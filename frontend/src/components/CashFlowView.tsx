@@ -1,5 +1,5 @@
 'use client';
-import React, { useMemo } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import {
     ComposedChart, Line, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer,
     AreaChart, Area
@@ -19,6 +19,13 @@ interface CashFlowStats {
     projected_runway_months: number;
 }
 
+interface RunwaySimulation {
+    months: number;
+    probability_cash_out: number;
+    runway_months: Record<string, number | null>;
+    cash_bands: Record<string, number[]>;
+}
+
 interface CashFlowViewProps {
     data: CashFlowItem[];
     stats?: CashFlowStats;
@@ -36,6 +43,26 @@ const CashFlowView = ({ data, stats }: CashFlowViewProps) => {
         return { totalRev, totalExp, totalNet, avgBurn, currentRunway };
     }, [data, stats]);
 
+    // Monte Carlo runway (10k bootstrapped revenue/expense paths), refetched when the history changes
+    const [simulation, setSimulation] = useState<RunwaySimulation | null>(null);
+    useEffect(() => {
+        let cancelled = false;
+        fetch('/api/simulate/runway?months=36')
+            .then(res => (res.ok ? res.json() : null))
+            .then(result => { if (!cancelled) setSimulation(result); })
+            .catch(() => { if (!cancelled) setSimulation(null); });
+        return () => { cancelled = true; };
+    }, [data]);
+
+    const runwayLabel = (value: number | null | undefined) =>
+        value === null ? `${simulation?.months ?? 36}+` : value === undefined ? '-' : String(value);
+
+    const cashBands = useMemo(() => {
+        if (!simulation) return [];
+        const { p5, p50, p95 } = simulation.cash_bands;
+        return p50.map((median, i) => ({ month: `M${i + 1}`, band: [p5[i], p95[i]], p50: median }));
+    }, [simulation]);
+
     const chartData = useMemo(() => {
         return data.map(item => ({
             ...item,
@@ -80,7 +107,11 @@ const CashFlowView = ({ data, stats }: CashFlowViewProps) => {
                     <p className="text-3xl font-bold text-white">
                         {typeof metrics.currentRunway === 'number' ? metrics.currentRunway.toFixed(1) : metrics.currentRunway} <span className="text-lg text-slate-400">Mo</span>
                     </p>
-                    <p className="text-xs text-slate-500 mt-1">based on current burn</p>
+                    <p className="text-xs text-slate-500 mt-1">
+                        {simulation
+                            ? `simulated P10 ${runwayLabel(simulation.runway_months.p10)} / P50 ${runwayLabel(simulation.runway_months.p50)} mo · ${(simulation.probability_cash_out * 100).toFixed(1)}% cash-out risk`
+                            : 'based on current burn'}
+                    </p>
                 </div>
             </div>
 
@@ -149,6 +180,32 @@ const CashFlowView = ({ data, stats }: CashFlowViewProps) => {
                 </div>
             </div>
 
+            {/* Simulated cash fan chart */}
+            {cashBands.length > 0 && (
+                <div className="glass-panel p-6 rounded-2xl border border-white/5">
+                    <h3 className="text-lg font-bold text-white mb-1">Cash Outlook</h3>
+                    <p className="text-xs text-slate-500 mb-6">Simulated cash balance, 5th-95th percentile band and median</p>
+
+                    <div style={{ width: '100%', height: 280 }}>
+                        <ResponsiveContainer>
+                            <ComposedChart data={cashBands} margin={{ top: 10, right: 10, left: 0, bottom: 0 }}>
+                                <CartesianGrid strokeDasharray="3 3" stroke="rgba(255,255,255,0.05)" vertical={false} />
+                                <XAxis dataKey="month" tick={{ fill: '#94a3b8', fontSize: 10 }} axisLine={false} tickLine={false} interval={5} />
+                                <YAxis tick={{ fill: '#94a3b8', fontSize: 10 }} axisLine={false} tickLine={false} tickFormatter={(v) => `$${(v / 1000).toFixed(0)}k`} />
+                                <Tooltip
+                                    contentStyle={{ backgroundColor: '#1e293b', border: '1px solid rgba(255,255,255,0.1)', borderRadius: '12px' }}
+                                    formatter={(value: number | number[]) => Array.isArray(value)
+                                        ? value.map(v => `$${Math.round(v).toLocaleString()}`).join(' - ')
+                                        : `$${Math.round(value).toLocaleString()}`}
+                                />
+                                <Area type="monotone" dataKey="band" name="P5-P95" stroke="none" fill="#06b6d4" fillOpacity={0.15} />
+                                <Line type="monotone" dataKey="p50" name="Median" stroke="#06b6d4" strokeWidth={2} dot={false} />
+                            </ComposedChart>
+                        </ResponsiveContainer>
+                    </div>
+                </div>
+            )}
+
             {/* Detailed Table */}
             <div className="glass-panel rounded-2xl overflow-hidden border border-white/5">
                 <div className="px-6 py-4 border-b border-white/5 bg-white/[0.02]">
@@ -8,6 +8,7 @@ interface ForecastItem {
     historical: number[];
     velocity?: number;
     confidence?: number;
+    model?: string;
 }
 
 interface ForecastingViewProps {
@@ -11,6 +11,8 @@ interface InventoryItem {
     reorder_threshold: number;
     velocity: number;
     days_remaining: number;
+    reorder_point?: number;
+    reorder_due?: boolean;
     status: string;
     unit_price?: number;
     value?: number;
@@ -264,8 +266,11 @@ const InventoryView = ({ data, onRestock }: InventoryViewProps) => {
                                             </td>
                                             <td className="px-6 py-4 text-center">
                                                 <span className={`text-xs font-bold ${item.days_remaining < 14 ? 'text-rose-400' : 'text-slate-300'}`}>
-                                                    {item.days_remaining} items
+                                                    {item.days_remaining} days
                                                 </span>
+                                                {item.reorder_due && (
+                                                    <p className="text-[10px] text-amber-400 mt-1">Below reorder point ({item.reorder_point})</p>
+                                                )}
                                             </td>
                                             <td className="px-6 py-4 text-center">
                                                 <span className={`inline-flex items-center px-2 py-1 rounded text-[10px] font-bold uppercase shadow-sm border ${item.status === 'Healthy'